@@ -8,10 +8,13 @@ from src.Cloud_Storage.AWS_Storage import SimpleStorageService
 
 
 from typing import Optional
+from pandas import DataFrame
 
 # Importing Constants and pipeline modules from project 
 from src.Logger import configure_logger
-from src.Constants import APP_HOST, APP_PORT
+from src.Constants import APP_HOST, APP_PORT, SCHEMA_FILE_PATH
+from src.Entity.Schema_Validator import RequestValidator
+from src.Utils.Main_Utils import read_yaml
 from src.Pipeline.Prediction_Pipeline import VehicleData, VehicleDataClassifier
 from src.Pipeline.Training_Pipeline import TrainPipeline
 from src.Entity.Config_Entity import ModelPusherConfig
@@ -27,6 +30,14 @@ cats = s3.load_categories(local_file_path=ModelPusherConfig.local_categories_jso
 REGION_CODES    = cats["region_codes"]
 POLICY_CHANNELS = cats["policy_channels"]
 
+# Input validator compiled once from the training schema and the categories seen in training
+request_validator = RequestValidator(schema_config=read_yaml(SCHEMA_FILE_PATH, logger=logger), categories=cats, logger=logger)
+
+# Form option values -> raw values as stored in the training data
+FORM_GENDER = {"1": "Male", "0": "Female"}
+FORM_VEHICLE_AGE = {"lt1": "< 1 Year", "btw1and2": "1-2 Year", "gt2": "> 2 Years"}
+FORM_YES_NO = {"1": "Yes", "0": "No"}
+
 # Initialize FastAPI application
 app = FastAPI()
 
@@ -55,40 +66,59 @@ class DataForm:
     """
     def __init__(self,request: Request):
         self.request: Request = request
-        self.Gender: Optional[int] = None
+        self.Gender: Optional[str] = None
         self.Age: Optional[int] = None
         self.Driving_License: Optional[int] = None
         self.Region_Code: Optional[float] = None
         self.Previously_Insured: Optional[int] = None
+        self.Vehicle_Age: Optional[str] = None
+        self.Vehicle_Damage: Optional[str] = None
         self.Annual_Premium: Optional[float] = None
         self.Policy_Sales_Channel: Optional[float] = None
         self.Vintage: Optional[int] = None
-        self.Vehicle_Age_lt_1_Year: Optional[int] = None
-        self.Vehicle_Age_gt_2_Years: Optional[int] = None
-        self.Vehicle_Damage_Yes: Optional[int] = None
+        self.errors: dict = {}
 
-    async def get_vehicle_data(self):
+    async def get_vehicle_data(self) -> bool:
         """
-        Method to retrieve and assign form data to class attributes.
+        Method to retrieve, validate and assign form data to class attributes.
         This method is asynchronous to handle form data fetching without blocking.
+
+        The form is translated to a raw record in the training schema and checked by
+        `request_validator`; per-field messages are kept in `self.errors`.
+
+        Returns:
+            bool: True if the input is valid and the attributes were assigned.
         """
         form = await self.request.form()
-        self.Gender = int(form.get("Gender"))
-        self.Age = float(form.get("Age"))
-        self.Driving_License = int(form.get("Driving_License"))
-        self.Region_Code = float(form.get("Region_Code"))
-        self.Previously_Insured = int(form.get("Previously_Insured"))
-        self.Annual_Premium = float(form.get("Annual_Premium"))
-        self.Policy_Sales_Channel = float(form.get("Policy_Sales_Channel"))
-        self.Vintage = int(form.get("Vintage"))
-        self.Vehicle_Damage_Yes = int(form.get("Vehicle_Damage_Yes"))
-         # Now handle the new single-category field:
-        cat = form.get("Vehicle_Age_Category")
-        if cat is None:
-            raise ValueError("Missing Vehicle_Age_Category")
-        # Set the two booleans based on the selected category
-        self.Vehicle_Age_lt_1_Year  = 1 if cat == "lt1" else 0
-        self.Vehicle_Age_gt_2_Years = 1 if cat == "gt2" else 0
+        record = {
+            "Gender": FORM_GENDER.get(form.get("Gender"), form.get("Gender")),
+            "Age": form.get("Age"),
+            "Driving_License": form.get("Driving_License"),
+            "Region_Code": form.get("Region_Code"),
+            "Previously_Insured": form.get("Previously_Insured"),
+            "Vehicle_Age": FORM_VEHICLE_AGE.get(form.get("Vehicle_Age_Category"), form.get("Vehicle_Age_Category")),
+            "Vehicle_Damage": FORM_YES_NO.get(form.get("Vehicle_Damage_Yes"), form.get("Vehicle_Damage_Yes")),
+            "Annual_Premium": form.get("Annual_Premium"),
+            "Policy_Sales_Channel": form.get("Policy_Sales_Channel"),
+            "Vintage": form.get("Vintage"),
+        }
+        parsed, errors = request_validator.validate(DataFrame([record]))
+        self.errors = errors[0]
+        if self.errors:
+            return False
+
+        row = parsed.iloc[0]
+        self.Gender = row["Gender"]
+        self.Age = float(row["Age"])
+        self.Driving_License = int(row["Driving_License"])
+        self.Region_Code = float(row["Region_Code"])
+        self.Previously_Insured = int(row["Previously_Insured"])
+        self.Vehicle_Age = row["Vehicle_Age"]
+        self.Vehicle_Damage = row["Vehicle_Damage"]
+        self.Annual_Premium = float(row["Annual_Premium"])
+        self.Policy_Sales_Channel = float(row["Policy_Sales_Channel"])
+        self.Vintage = int(row["Vintage"])
+        return True
 
 # Route to render the main page with the form
 @app.get("/", tags=['authentication'])
@@ -114,6 +144,21 @@ async def trainRouteClient():
     except Exception as e:
         return Response(f"Error Occurred! {e}")
 
+# Route to update the production model with the documents added since it was trained
+@app.get("/train/incremental")
+async def incrementalTrainRouteClient():
+    """
+    Endpoint to update the production model with new MongoDB documents only,
+    falling back to the full training pipeline when a full retrain is due.
+    """
+    try:
+        train_pipeline = TrainPipeline()
+        incremental_trainer_artifact = train_pipeline.run_incremental_pipeline()
+        return Response(f"Incremental training finished: {incremental_trainer_artifact.message}")
+
+    except Exception as e:
+        return Response(f"Error Occurred! {e}")
+
 # Route to handle form submission and make predictions
 @app.post("/")
 async def predictRouteClient(request: Request):
@@ -122,20 +167,26 @@ async def predictRouteClient(request: Request):
     """
     try:
         form = DataForm(request)
-        await form.get_vehicle_data()
-        
+        if not await form.get_vehicle_data():
+            # Reject invalid input before loading the model
+            return templates.TemplateResponse(
+                "vehicledata.html",
+                {"request": request, "context": "Invalid-Input", "errors": form.errors,
+                 "region_codes": REGION_CODES, "policy_channels": POLICY_CHANNELS},
+                status_code=422,
+            )
+
         vehicle_data = VehicleData(
                                 Gender= form.Gender,
                                 Age = form.Age,
                                 Driving_License = form.Driving_License,
                                 Region_Code = form.Region_Code,
                                 Previously_Insured = form.Previously_Insured,
+                                Vehicle_Age = form.Vehicle_Age,
+                                Vehicle_Damage = form.Vehicle_Damage,
                                 Annual_Premium = form.Annual_Premium,
                                 Policy_Sales_Channel = form.Policy_Sales_Channel,
-                                Vintage = form.Vintage,
-                                Vehicle_Age_lt_1_Year = form.Vehicle_Age_lt_1_Year,
-                                Vehicle_Age_gt_2_Years = form.Vehicle_Age_gt_2_Years,
-                                Vehicle_Damage_Yes = form.Vehicle_Damage_Yes
+                                Vintage = form.Vintage
                                 )
 
         # Convert form data into a DataFrame for the model
@@ -145,7 +196,7 @@ async def predictRouteClient(request: Request):
         model_predictor = VehicleDataClassifier()
 
         # Make a prediction and retrieve the result
-        value = model_predictor.predict(dataframe=vehicle_df, do_scaling=True)
+        value = model_predictor.predict(dataframe=vehicle_df)
 
         # Interpret the prediction result as 'Response-Yes' or 'Response-No'
         status = "Response-Yes" if value == 1 else "Response-No"
@@ -0,0 +1,68 @@
+"""
+Benchmark: in-memory vs chunked (out-of-core) data transformation.
+
+Writes synthetic train/test splits as ingestion artifacts and runs
+`DataTransformation` in both modes on them, reporting wall time and peak
+traced memory. In chunked mode the peak follows `--chunk-size` rather than
+the number of rows (for the non-oversampling imbalance strategies).
+
+Usage:
+    python -m benchmarks.chunked_transformation --rows 381109 2000000 --chunk-size 100000
+"""
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+from sklearn.model_selection import train_test_split
+from benchmarks.synthetic_data import make_vehicle_insurance_frame
+from src.Components.S3_Data_Transformation import DataTransformation, TRANSFORMATION_MODES
+from src.Entity.Config_Entity import DataTransformationConfig
+from src.Entity.Artifact_Entity import DataIngestionArtifact
+from src.Utils.Main_Utils import save_dataframe
+from src.Utils.Resampling_Utils import IMBALANCE_STRATEGIES
+from src.Constants import RANDOM_STATE
+
+
+def _config(out_dir: str, mode: str, strategy: str, chunk_size: int) -> DataTransformationConfig:
+    path = lambda name: os.path.join(out_dir, mode, name)
+    return DataTransformationConfig(transformation_mode=mode, imbalance_strategy=strategy, chunk_size=chunk_size,
+                                    data_transformation_transformed_train_file_path=path("train.npy"),
+                                    data_transformation_transformed_test_file_path=path("test.npy"),
+                                    data_transformation_transformed_train_target_file_path=path("train_target.npy"),
+                                    data_transformation_transformed_test_target_file_path=path("test_target.npy"),
+                                    data_transformation_encoded_train_file_path=path("train_encoded.npy"),
+                                    data_transformation_encoded_train_target_file_path=path("train_encoded_target.npy"),
+                                    data_transformation_transformed_object_file_path=path("preprocessing.pkl"),
+                                    data_transformation_dump_categories_path=path("categories.json"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[381_109, 2_000_000], help="Dataset sizes before the train/test split.")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows per chunk in chunked mode.")
+    parser.add_argument("--strategy", default="none", choices=IMBALANCE_STRATEGIES, help="Class-imbalance strategy for both modes.")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'mode':>12}{'time (s)':>11}{'peak (MB)':>12}")
+    for n_rows in args.rows:
+        train_data, test_data = train_test_split(make_vehicle_insurance_frame(n_rows), test_size=0.25, random_state=RANDOM_STATE)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            artifact = DataIngestionArtifact(training_data_file_path=os.path.join(tmp_dir, "train.parquet"),
+                                             test_data_file_path=os.path.join(tmp_dir, "test.parquet"))
+            save_dataframe(artifact.training_data_file_path, train_data)
+            save_dataframe(artifact.test_data_file_path, test_data)
+            for mode in TRANSFORMATION_MODES:
+                transformation = DataTransformation(data_transformation_config=_config(tmp_dir, mode, args.strategy, args.chunk_size),
+                                                    data_ingestion_artifact=artifact, data_validation_artifact=None)
+                tracemalloc.start()
+                start = time.perf_counter()
+                transformation.initiate_data_transformation()
+                elapsed = time.perf_counter() - start
+                peak_mb = tracemalloc.get_traced_memory()[1] / 1024**2
+                tracemalloc.stop()
+                print(f"{n_rows:>10,}{mode:>12}{elapsed:>11.2f}{peak_mb:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: compacting duplicate training rows into sample weights.
+
+Encodes the same train/test split as the pipeline and reports how many encoded
+rows are exact (features, label) duplicates, what SMOTEENN costs on all rows vs.
+on the unique rows only, and what the final fit costs on the resampled training
+set vs. on its compacted unique rows with their multiplicity as sample weight
+(the `data_compaction` stage of the pipeline), with the test metrics of each.
+
+The synthetic numeric columns are drawn independently and much finer grained
+than in a binned feature space, so `--round COLUMN=STEP` coarsens a column to
+multiples of STEP to emulate a higher duplicate rate.
+
+Usage:
+    python -m benchmarks.duplicate_compaction --rows 381109 --round Annual_Premium=10000 Vintage=100 Age=10 Region_Code=10
+"""
+import time
+import argparse
+import numpy as np
+from sklearn.model_selection import train_test_split
+from benchmarks.synthetic_data import make_vehicle_insurance_frame
+from src.Components.S3_Data_Transformation import DataTransformation
+from src.Components.S4_Model_Trainer import ModelTrainer
+from src.Entity.Config_Entity import DataTransformationConfig, ModelTrainerConfig
+from src.Entity.Artifact_Entity import DataTransformationArtifact
+from src.Entity.Preprocessor import FusedPreprocessor
+from src.Utils.Compaction_Utils import compact_duplicate_rows
+from src.Constants import RANDOM_STATE, TARGET_COLUMN
+
+
+def _input_features(transformation: DataTransformation, dataframe):
+    features = transformation._drop_column(dataframe.drop(columns=TARGET_COLUMN), columns=transformation._schema_config["drop_columns"])
+    return features, dataframe[TARGET_COLUMN].to_numpy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=381_109, help="Number of synthetic rows before the train/test split.")
+    parser.add_argument("--round", nargs="*", default=[], metavar="COLUMN=STEP", help="Round numeric columns to multiples of STEP.")
+    args = parser.parse_args()
+
+    dataframe = make_vehicle_insurance_frame(args.rows)
+    for column, step in (rounding.split("=") for rounding in args.round):
+        dataframe[column] = (np.round(dataframe[column] / float(step)) * float(step)).astype(dataframe[column].dtype)
+    train_data, test_data = train_test_split(dataframe, test_size=0.25, random_state=RANDOM_STATE)
+    transformation = DataTransformation(data_transformation_config=DataTransformationConfig(imbalance_strategy="smoteenn"),
+                                        data_ingestion_artifact=None, data_validation_artifact=None)
+    x_train, y_train = _input_features(transformation, train_data)
+    x_test, y_test = _input_features(transformation, test_data)
+    encoder = transformation.get_categorical_encoder(x_train)
+    x_train = np.asarray(encoder.transform(x_train), dtype=np.float64)
+
+    start = time.perf_counter()
+    x_unique, y_unique, weights = compact_duplicate_rows(x_train, y_train)
+    compact_time = time.perf_counter() - start
+
+    resampled = {}
+    for name, (x, y) in {"all rows": (x_train, y_train), "unique rows": (x_unique, y_unique)}.items():
+        start = time.perf_counter()
+        resampled[name] = (*transformation.apply_resampling(x, y), time.perf_counter() - start)
+
+    artifact = DataTransformationArtifact(data_transformation_transformed_object_file_path=None,
+                                          data_transformation_transformed_train_file_path=None,
+                                          data_transformation_transformed_test_file_path=None,
+                                          data_transformation_transformed_train_target_file_path=None,
+                                          data_transformation_transformed_test_target_file_path=None,
+                                          data_transformation_categories_json_path=None,
+                                          imbalance_strategy="smoteenn")
+    trainer = ModelTrainer(data_transformation_artifact=artifact, model_trainer_config=ModelTrainerConfig())
+    results = []
+    for name, (x_resampled, y_resampled, resample_time) in resampled.items():
+        scaler = transformation.get_data_transformer_object(encoder=encoder).fit(x_resampled)
+        preprocessor = FusedPreprocessor(encoder=encoder, scaler=scaler).fit()
+        x_train_scaled, x_test_scaled = preprocessor.scale(x_resampled), preprocessor.transform(x_test)
+        start = time.perf_counter()
+        x_fit, y_fit, sample_weight = compact_duplicate_rows(x_train_scaled, y_resampled)
+        fit_compact_time = time.perf_counter() - start
+        for fit_name, (x, y, w) in {"full": (x_train_scaled, y_resampled, None), "compacted": (x_fit, y_fit, sample_weight)}.items():
+            start = time.perf_counter()
+            _, metrics = trainer.train_model(x_train=x, y_train=y, x_test=x_test_scaled, y_test=y_test, sample_weight=w)
+            train_time = time.perf_counter() - start + (fit_compact_time if w is not None else 0.0)
+            results.append((name, resample_time, fit_name, len(y), train_time, metrics))
+
+    print(f"\nRows: {args.rows:,}  Train rows: {len(y_train):,}  Test rows: {len(y_test):,}")
+    print(f"Encoded training rows: {len(y_train):,}  unique: {len(y_unique):,}  compression ratio: {len(y_train) / len(y_unique):.2f}x  "
+          f"max weight: {weights.max():.0f}  compaction: {compact_time:.2f}s\n")
+    print(f"{'smoteenn on':<14}{'resample (s)':>14}{'fit on':>11}{'fit rows':>11}{'fit (s)':>9}"
+          f"{'accuracy':>10}{'f1':>8}{'precision':>11}{'recall':>8}")
+    for name, resample_time, fit_name, n_rows, train_time, metrics in results:
+        print(f"{name:<14}{resample_time:>14.2f}{fit_name:>11}{n_rows:>11,}{train_time:>9.2f}"
+              f"{metrics.accuracy_score:>10.4f}{metrics.f1_score:>8.4f}{metrics.precision_score:>11.4f}{metrics.recall_score:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
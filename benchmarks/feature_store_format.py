@@ -0,0 +1,50 @@
+"""
+Benchmark: CSV vs parquet feature store artifacts.
+
+Measures write time, full read time, column-selective read time and on-disk
+size for the formats `DataIngestion` can produce.
+
+Usage:
+    python -m benchmarks.feature_store_format --rows 381109 --repeat 3
+"""
+import os
+import time
+import argparse
+import tempfile
+from benchmarks.synthetic_data import make_vehicle_insurance_frame
+from src.Utils.Main_Utils import save_dataframe, read_csv_data
+
+SELECTED_COLUMNS = ["Age", "Annual_Premium", "Response"]
+
+
+def _best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=381_109, help="Number of synthetic rows (default: size of the production collection).")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement, the best run is reported.")
+    args = parser.parse_args()
+
+    dataframe = make_vehicle_insurance_frame(args.rows)
+    print(f"Rows: {args.rows:,}  In-memory size: {dataframe.memory_usage(deep=True).sum()/1024**2:.1f} MB\n")
+    print(f"{'format':<10}{'write (s)':>12}{'read (s)':>12}{'read 3 cols (s)':>18}{'size (MB)':>12}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for extension in ("csv", "parquet"):
+            file_path = os.path.join(tmp_dir, f"data.{extension}")
+            write_time = _best_of(args.repeat, lambda: save_dataframe(file_path, dataframe))
+            read_time = _best_of(args.repeat, lambda: read_csv_data(file_path))
+            column_read_time = _best_of(args.repeat, lambda: read_csv_data(file_path, columns=SELECTED_COLUMNS))
+            size_mb = os.path.getsize(file_path) / 1024**2
+            print(f"{extension:<10}{write_time:>12.3f}{read_time:>12.3f}{column_read_time:>18.3f}{size_mb:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
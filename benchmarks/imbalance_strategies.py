@@ -0,0 +1,80 @@
+"""
+Benchmark: cost and benefit of the class-imbalance strategies.
+
+Runs every strategy in `IMBALANCE_STRATEGIES` on the same train/test split,
+using the same encoding, scaling and `ModelTrainer.train_model` as the
+pipeline, and reports resampling wall time and peak memory, resampled size,
+training time and the downstream test metrics.
+
+Usage:
+    python -m benchmarks.imbalance_strategies --rows 381109
+"""
+import time
+import argparse
+import tracemalloc
+from sklearn.model_selection import train_test_split
+from benchmarks.synthetic_data import make_vehicle_insurance_frame
+from src.Components.S3_Data_Transformation import DataTransformation
+from src.Components.S4_Model_Trainer import ModelTrainer
+from src.Entity.Config_Entity import DataTransformationConfig, ModelTrainerConfig
+from src.Entity.Artifact_Entity import DataTransformationArtifact
+from src.Entity.Preprocessor import FusedPreprocessor
+from src.Utils.Resampling_Utils import IMBALANCE_STRATEGIES
+from src.Constants import RANDOM_STATE, TARGET_COLUMN
+
+
+def _input_features(transformation: DataTransformation, dataframe):
+    features = transformation._drop_column(dataframe.drop(columns=TARGET_COLUMN), columns=transformation._schema_config["drop_columns"])
+    return features, dataframe[TARGET_COLUMN].to_numpy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=381_109, help="Number of synthetic rows before the train/test split.")
+    parser.add_argument("--strategies", nargs="+", default=list(IMBALANCE_STRATEGIES), choices=IMBALANCE_STRATEGIES)
+    args = parser.parse_args()
+
+    train_data, test_data = train_test_split(make_vehicle_insurance_frame(args.rows), test_size=0.25, random_state=RANDOM_STATE)
+    results = []
+    for strategy in args.strategies:
+        config = DataTransformationConfig(imbalance_strategy=strategy)
+        transformation = DataTransformation(data_transformation_config=config, data_ingestion_artifact=None, data_validation_artifact=None)
+        x_train, y_train = _input_features(transformation, train_data)
+        x_test, y_test = _input_features(transformation, test_data)
+        encoder = transformation.get_categorical_encoder(x_train)
+        x_train = encoder.transform(x_train)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        x_resampled, y_resampled = transformation.apply_resampling(x_train, y_train)
+        resample_time = time.perf_counter() - start
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024**2
+        tracemalloc.stop()
+
+        scaler = transformation.get_data_transformer_object(encoder=encoder).fit(x_resampled)
+        preprocessor = FusedPreprocessor(encoder=encoder, scaler=scaler).fit()
+        x_train_scaled = preprocessor.scale(x_resampled)
+        x_test_scaled = preprocessor.transform(x_test)
+        artifact = DataTransformationArtifact(data_transformation_transformed_object_file_path=None,
+                                              data_transformation_transformed_train_file_path=None,
+                                              data_transformation_transformed_test_file_path=None,
+                                              data_transformation_transformed_train_target_file_path=None,
+                                              data_transformation_transformed_test_target_file_path=None,
+                                              data_transformation_categories_json_path=None,
+                                              imbalance_strategy=strategy)
+        trainer = ModelTrainer(data_transformation_artifact=artifact, model_trainer_config=ModelTrainerConfig())
+        start = time.perf_counter()
+        _, metrics = trainer.train_model(x_train=x_train_scaled, y_train=y_resampled, x_test=x_test_scaled, y_test=y_test)
+        train_time = time.perf_counter() - start
+        results.append((strategy, resample_time, peak_mb, len(y_resampled), train_time, metrics))
+
+    print(f"\nRows: {args.rows:,}  Train rows: {len(train_data):,}  Test rows: {len(test_data):,}\n")
+    print(f"{'strategy':<20}{'resample (s)':>14}{'peak (MB)':>11}{'train rows':>12}{'train (s)':>11}"
+          f"{'accuracy':>10}{'f1':>8}{'precision':>11}{'recall':>8}")
+    for strategy, resample_time, peak_mb, n_rows, train_time, metrics in results:
+        print(f"{strategy:<20}{resample_time:>14.2f}{peak_mb:>11.1f}{n_rows:>12,}{train_time:>11.2f}"
+              f"{metrics.accuracy_score:>10.4f}{metrics.f1_score:>8.4f}{metrics.precision_score:>11.4f}{metrics.recall_score:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: incremental updates of the SGD logistic model vs. full retrains.
+
+Trains on the first `--initial-fraction` of the training rows, then feeds the
+rest in `--days` equal batches, like the daily trickle of new policies. After
+every batch the random forest and the SGD logistic model are retrained from
+scratch on all rows seen so far (`ModelTrainer.train_model`), and the SGD
+model is also updated with the new batch only (`partial_fit_model`, as
+`/train/incremental` does). Reports the update cost and the test metrics of
+each variant per batch. The imbalance is handled by balanced class weights in
+all variants so no resampling time is counted.
+
+Usage:
+    python -m benchmarks.incremental_learning --rows 381109 --days 5
+"""
+import os
+import time
+import argparse
+import tempfile
+import numpy as np
+from sklearn.model_selection import train_test_split
+from benchmarks.synthetic_data import make_vehicle_insurance_frame
+from src.Components.S3_Data_Transformation import DataTransformation
+from src.Components.S4_Model_Trainer import ModelTrainer
+from src.Components.Incremental_Model_Trainer import IncrementalModelTrainer
+from src.Entity.Config_Entity import DataTransformationConfig, ModelTrainerConfig
+from src.Entity.Artifact_Entity import DataTransformationArtifact
+from src.Entity.Preprocessor import FusedPreprocessor
+from src.Entity.Model_Families import partial_fit_model
+from src.Utils.Main_Utils import read_yaml, write_yaml
+from src.Constants import RANDOM_STATE, TARGET_COLUMN, MODEL_TRAINER_MODEL_CONFIG_FILE_PATH
+
+
+def _trainer(model_name: str, yaml_dir: str) -> ModelTrainer:
+    model_config = read_yaml(MODEL_TRAINER_MODEL_CONFIG_FILE_PATH)
+    model_config["model"]["name"] = model_name
+    model_config["search"]["enabled"] = False
+    yaml_file_path = os.path.join(yaml_dir, f"{model_name}.yaml")
+    write_yaml(yaml_file_path, model_config, replace=True)
+    artifact = DataTransformationArtifact(data_transformation_transformed_object_file_path=None,
+                                          data_transformation_transformed_train_file_path=None,
+                                          data_transformation_transformed_test_file_path=None,
+                                          data_transformation_transformed_train_target_file_path=None,
+                                          data_transformation_transformed_test_target_file_path=None,
+                                          data_transformation_categories_json_path=None,
+                                          imbalance_strategy="class_weight")
+    return ModelTrainer(data_transformation_artifact=artifact, model_trainer_config=ModelTrainerConfig(model_config_yaml_file_path=yaml_file_path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=381_109, help="Number of synthetic rows before the train/test split.")
+    parser.add_argument("--days", type=int, default=5, help="Batches of new rows after the initial training.")
+    parser.add_argument("--initial-fraction", type=float, default=0.7, help="Share of the training rows in the initial training.")
+    args = parser.parse_args()
+
+    train_data, test_data = train_test_split(make_vehicle_insurance_frame(args.rows), test_size=0.25, random_state=RANDOM_STATE)
+    n_initial = int(len(train_data) * args.initial_fraction)
+    initial_data = train_data.iloc[:n_initial]
+    transformation = DataTransformation(data_transformation_config=DataTransformationConfig(), data_ingestion_artifact=None, data_validation_artifact=None)
+    features = transformation._drop_column(initial_data.drop(columns=TARGET_COLUMN), columns=transformation._schema_config["drop_columns"])
+    encoder = transformation.get_categorical_encoder(features)
+    preprocessor = FusedPreprocessor(encoder=encoder, scaler=transformation.get_data_transformer_object(encoder=encoder).fit(encoder.transform(features))).fit()
+    x_train, y_train = preprocessor.transform(train_data), train_data[TARGET_COLUMN].to_numpy()
+    x_test, y_test = preprocessor.transform(test_data), test_data[TARGET_COLUMN].to_numpy()
+    batch_ends = np.linspace(n_initial, len(y_train), args.days + 1).astype(int)
+
+    results = []
+    with tempfile.TemporaryDirectory() as yaml_dir:
+        trainers = {model_name: _trainer(model_name, yaml_dir) for model_name in ("random_forest", "sgd_logistic")}
+        start = time.perf_counter()
+        incremental_model, metrics = trainers["sgd_logistic"].train_model(x_train=x_train[:n_initial], y_train=y_train[:n_initial],
+                                                                          x_test=x_test, y_test=y_test)
+        results.append((0, n_initial, "sgd_logistic", "full", time.perf_counter() - start, metrics))
+        for day, (batch_start, batch_end) in enumerate(zip(batch_ends[:-1], batch_ends[1:]), start=1):
+            for model_name, trainer in trainers.items():
+                start = time.perf_counter()
+                _, metrics = trainer.train_model(x_train=x_train[:batch_end], y_train=y_train[:batch_end], x_test=x_test, y_test=y_test)
+                results.append((day, batch_end, model_name, "full", time.perf_counter() - start, metrics))
+            start = time.perf_counter()
+            partial_fit_model(incremental_model, x_train[batch_start:batch_end], y_train[batch_start:batch_end], class_weight="balanced")
+            update_time = time.perf_counter() - start
+            results.append((day, batch_end - batch_start, "sgd_logistic", "incremental", update_time,
+                            IncrementalModelTrainer.evaluate_model(incremental_model, x_test, y_test)))
+
+    print(f"\nRows: {args.rows:,}  Initial rows: {n_initial:,}  New rows per day: ~{(len(y_train) - n_initial) // args.days:,}  Test rows: {len(y_test):,}\n")
+    print(f"{'day':>4}{'model':>16}{'update':>13}{'fit rows':>11}{'fit (s)':>9}{'accuracy':>10}{'f1':>8}{'precision':>11}{'recall':>8}")
+    for day, n_rows, model_name, update, fit_time, metrics in results:
+        print(f"{day:>4}{model_name:>16}{update:>13}{n_rows:>11,}{fit_time:>9.2f}"
+              f"{metrics.accuracy_score:>10.4f}{metrics.f1_score:>8.4f}{metrics.precision_score:>11.4f}{metrics.recall_score:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
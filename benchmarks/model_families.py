@@ -0,0 +1,93 @@
+"""
+Benchmark: model families side by side (random forest vs. histogram gradient boosting).
+
+Trains every family of `MODEL_FAMILIES` with its Config/Model.yaml parameters
+through `ModelTrainer.train_model` on the same transformed data and scores the
+resulting `MyModel` on raw test records, reporting fit time, serialized model
+size, single-row latency (p50/p99 over `--single-rows` calls of `predict`),
+batch throughput of `predict_batch` and the test metrics.
+
+Usage:
+    python -m benchmarks.model_families --rows 381109
+"""
+import os
+import time
+import argparse
+import tempfile
+import dill
+import numpy as np
+from sklearn.model_selection import train_test_split
+from benchmarks.synthetic_data import make_vehicle_insurance_frame
+from src.Components.S3_Data_Transformation import DataTransformation
+from src.Components.S4_Model_Trainer import ModelTrainer
+from src.Entity.Config_Entity import DataTransformationConfig, ModelTrainerConfig
+from src.Entity.Artifact_Entity import DataTransformationArtifact
+from src.Entity.Preprocessor import FusedPreprocessor
+from src.Entity.Estimator import MyModel
+from src.Entity.Model_Families import MODEL_FAMILIES, ensemble_size
+from src.Utils.Main_Utils import read_yaml, write_yaml
+from src.Constants import RANDOM_STATE, TARGET_COLUMN, MODEL_TRAINER_MODEL_CONFIG_FILE_PATH
+
+
+def _trainer(model_name: str, yaml_dir: str) -> ModelTrainer:
+    model_config = read_yaml(MODEL_TRAINER_MODEL_CONFIG_FILE_PATH)
+    model_config["model"]["name"] = model_name
+    model_config["search"]["enabled"] = False
+    yaml_file_path = os.path.join(yaml_dir, f"{model_name}.yaml")
+    write_yaml(yaml_file_path, model_config, replace=True)
+    artifact = DataTransformationArtifact(data_transformation_transformed_object_file_path=None,
+                                          data_transformation_transformed_train_file_path=None,
+                                          data_transformation_transformed_test_file_path=None,
+                                          data_transformation_transformed_train_target_file_path=None,
+                                          data_transformation_transformed_test_target_file_path=None,
+                                          data_transformation_categories_json_path=None,
+                                          imbalance_strategy="class_weight")
+    return ModelTrainer(data_transformation_artifact=artifact, model_trainer_config=ModelTrainerConfig(model_config_yaml_file_path=yaml_file_path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=381_109, help="Number of synthetic rows before the train/test split.")
+    parser.add_argument("--models", nargs="+", default=list(MODEL_FAMILIES), choices=list(MODEL_FAMILIES))
+    parser.add_argument("--single-rows", type=int, default=200, help="Single-record predictions timed per model.")
+    args = parser.parse_args()
+
+    train_data, test_data = train_test_split(make_vehicle_insurance_frame(args.rows), test_size=0.25, random_state=RANDOM_STATE)
+    transformation = DataTransformation(data_transformation_config=DataTransformationConfig(), data_ingestion_artifact=None, data_validation_artifact=None)
+    features = transformation._drop_column(train_data.drop(columns=TARGET_COLUMN), columns=transformation._schema_config["drop_columns"])
+    encoder = transformation.get_categorical_encoder(features)
+    preprocessor = FusedPreprocessor(encoder=encoder, scaler=transformation.get_data_transformer_object(encoder=encoder).fit(encoder.transform(features))).fit()
+    x_train, y_train = preprocessor.transform(features), train_data[TARGET_COLUMN].to_numpy()
+    x_test, y_test = preprocessor.transform(test_data), test_data[TARGET_COLUMN].to_numpy()
+    records = test_data.drop(columns=TARGET_COLUMN)
+
+    results = []
+    with tempfile.TemporaryDirectory() as yaml_dir:
+        for model_name in args.models:
+            trainer = _trainer(model_name, yaml_dir)
+            start = time.perf_counter()
+            model, metrics = trainer.train_model(x_train=x_train, y_train=y_train, x_test=x_test, y_test=y_test)
+            fit_time = time.perf_counter() - start
+            my_model = MyModel(preprocessing_object=preprocessor, trained_model_object=model)
+            size_mb = len(dill.dumps(my_model)) / 1024**2
+
+            latencies = []
+            for index in range(min(args.single_rows, len(records))):
+                start = time.perf_counter()
+                my_model.predict(records.iloc[index:index + 1])
+                latencies.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            my_model.predict_batch(records)
+            batch_time = time.perf_counter() - start
+            p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+            results.append((model_name, ensemble_size(model), fit_time, size_mb, p50, p99, len(records) / batch_time, metrics))
+
+    print(f"\nRows: {args.rows:,}  Train rows: {len(train_data):,}  Test rows: {len(test_data):,}\n")
+    print(f"{'model':<24}{'size':>6}{'fit (s)':>9}{'model (MB)':>12}{'p50 (ms)':>10}{'p99 (ms)':>10}{'batch (rows/s)':>16}{'accuracy':>10}{'f1':>8}")
+    for model_name, n_estimators, fit_time, size_mb, p50, p99, throughput, metrics in results:
+        print(f"{model_name:<24}{n_estimators:>6}{fit_time:>9.2f}{size_mb:>12.2f}{p50:>10.2f}{p99:>10.2f}{throughput:>16,.0f}"
+              f"{metrics.accuracy_score:>10.4f}{metrics.f1_score:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: RandomForest training wall time vs. cores, and warm start vs. full retrain.
+
+Part 1 trains the production forest configuration with `ModelTrainer.train_model`
+for every `--n-jobs` value. Part 2 simulates a retrain on a fresh, slightly
+drifted batch: a full retrain from scratch against adding
+`warm_start_n_estimators` trees to a forest trained on the previous batch.
+
+Usage:
+    python -m benchmarks.rf_training --rows 381109 --n-jobs 1 2 4 8 16 32
+"""
+import time
+import argparse
+from sklearn.model_selection import train_test_split
+from benchmarks.synthetic_data import make_vehicle_insurance_frame
+from src.Components.S3_Data_Transformation import DataTransformation
+from src.Components.S4_Model_Trainer import ModelTrainer
+from src.Entity.Config_Entity import DataTransformationConfig, ModelTrainerConfig
+from src.Entity.Artifact_Entity import DataTransformationArtifact
+from src.Entity.Preprocessor import FusedPreprocessor
+from src.Constants import RANDOM_STATE, TARGET_COLUMN
+
+
+def _model_matrices(preprocessor: FusedPreprocessor, dataframe):
+    train_data, test_data = train_test_split(dataframe, test_size=0.25, random_state=RANDOM_STATE)
+    return (preprocessor.transform(train_data), train_data[TARGET_COLUMN].to_numpy(),
+            preprocessor.transform(test_data), test_data[TARGET_COLUMN].to_numpy())
+
+
+def _trainer(n_jobs: int) -> ModelTrainer:
+    config = ModelTrainerConfig()
+    config._n_jobs = n_jobs
+    artifact = DataTransformationArtifact(data_transformation_transformed_object_file_path=None,
+                                          data_transformation_transformed_train_file_path=None,
+                                          data_transformation_transformed_test_file_path=None,
+                                          data_transformation_transformed_train_target_file_path=None,
+                                          data_transformation_transformed_test_target_file_path=None,
+                                          data_transformation_categories_json_path=None,
+                                          imbalance_strategy="class_weight")
+    return ModelTrainer(data_transformation_artifact=artifact, model_trainer_config=config)
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=381_109, help="Synthetic rows per batch.")
+    parser.add_argument("--n-jobs", type=int, nargs="+", default=[1, 2, 4, 8, -1], help="Core counts to benchmark.")
+    args = parser.parse_args()
+
+    previous_batch = make_vehicle_insurance_frame(args.rows, seed=RANDOM_STATE)
+    current_batch = make_vehicle_insurance_frame(args.rows, seed=RANDOM_STATE + 1)
+    transformation = DataTransformation(data_transformation_config=DataTransformationConfig(), data_ingestion_artifact=None, data_validation_artifact=None)
+    features = previous_batch.drop(columns=TARGET_COLUMN)
+    encoder = transformation.get_categorical_encoder(features)
+    preprocessor = FusedPreprocessor(encoder=encoder, scaler=transformation.get_data_transformer_object(encoder=encoder).fit(encoder.transform(features))).fit()
+    previous = _model_matrices(preprocessor, previous_batch)
+    x_train, y_train, x_test, y_test = _model_matrices(preprocessor, current_batch)
+
+    print(f"\nRows per batch: {args.rows:,}  Trees: {ModelTrainerConfig._n_estimators}\n")
+    print(f"{'n_jobs':>8}{'train (s)':>12}{'speedup':>10}{'accuracy':>10}")
+    baseline = None
+    for n_jobs in args.n_jobs:
+        (_, metrics), elapsed = _timed(lambda: _trainer(n_jobs).train_model(x_train=x_train, y_train=y_train, x_test=x_test, y_test=y_test))
+        baseline = baseline or elapsed
+        print(f"{n_jobs:>8}{elapsed:>12.2f}{baseline/elapsed:>9.2f}x{metrics.accuracy_score:>10.4f}")
+
+    trainer = _trainer(args.n_jobs[-1])
+    base_forest, _ = trainer.train_model(*previous)
+    (full_model, full_metrics), full_time = _timed(lambda: trainer.train_model(x_train=x_train, y_train=y_train, x_test=x_test, y_test=y_test))
+    (warm_model, warm_metrics), warm_time = _timed(lambda: trainer.train_model(x_train=x_train, y_train=y_train, x_test=x_test, y_test=y_test,
+                                                                               base_model=base_forest))
+    print(f"\n{'retrain (n_jobs=' + str(args.n_jobs[-1]) + ')':<26}{'trees':>7}{'train (s)':>12}{'accuracy':>10}{'f1':>8}")
+    for name, model, elapsed, metrics in (("full", full_model, full_time, full_metrics), ("warm start", warm_model, warm_time, warm_metrics)):
+        print(f"{name:<26}{len(model.estimators_):>7}{elapsed:>12.2f}{metrics.accuracy_score:>10.4f}{metrics.f1_score:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
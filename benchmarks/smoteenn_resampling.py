@@ -0,0 +1,58 @@
+"""
+Benchmark: imblearn SMOTEENN vs ParallelSMOTEENN.
+
+Resamples the one-hot-encoded synthetic training frame with both
+implementations and reports wall time, resampled size and whether the
+outputs are identical. The single-threaded imblearn baseline is only run up
+to `--baseline-max-rows`, as it gets very slow on millions of rows.
+
+Usage:
+    python -m benchmarks.smoteenn_resampling --rows 100000 1000000 5000000 --n-jobs -1
+"""
+import time
+import argparse
+import pandas as pd
+from imblearn.combine import SMOTEENN
+from benchmarks.synthetic_data import make_vehicle_insurance_frame
+from src.Utils.Resampling_Utils import ParallelSMOTEENN
+from src.Constants import RANDOM_STATE, TARGET_COLUMN
+
+CATEGORICAL_COLUMNS = ["Gender", "Vehicle_Age", "Vehicle_Damage"]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000], help="Training set sizes to benchmark.")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Workers for the parallel neighbour searches.")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows per ENN neighbour query.")
+    parser.add_argument("--max-synthetic-samples", type=int, default=None, help="Optional cap on synthetic rows per class.")
+    parser.add_argument("--baseline-max-rows", type=int, default=1_000_000, help="Largest size the imblearn baseline is run for.")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'imblearn (s)':>15}{'parallel (s)':>15}{'speedup':>10}{'resampled rows':>17}{'identical':>11}")
+    for n_rows in args.rows:
+        data = make_vehicle_insurance_frame(n_rows).drop(columns="id")
+        y = data.pop(TARGET_COLUMN)
+        X = pd.get_dummies(data, columns=CATEGORICAL_COLUMNS, dtype=int, drop_first=True)
+
+        sampler = ParallelSMOTEENN(random_state=RANDOM_STATE, n_jobs=args.n_jobs, chunk_size=args.chunk_size,
+                                   max_synthetic_samples=args.max_synthetic_samples)
+        (X_res, y_res), parallel_time = _timed(lambda: sampler.fit_resample(X, y))
+
+        if n_rows <= args.baseline_max_rows:
+            (X_base, y_base), baseline_time = _timed(lambda: SMOTEENN(random_state=RANDOM_STATE).fit_resample(X, y))
+            identical = str(X_base.equals(X_res) and y_base.equals(y_res))
+            baseline, speedup = f"{baseline_time:.2f}", f"{baseline_time/parallel_time:.2f}x"
+        else:
+            baseline = speedup = identical = "-"
+        print(f"{n_rows:>10,}{baseline:>15}{parallel_time:>15.2f}{speedup:>10}{len(y_res):>17,}{identical:>11}")
+
+
+if __name__ == "__main__":
+    main()
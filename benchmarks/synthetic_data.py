@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+
+def make_vehicle_insurance_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Generates a synthetic DataFrame shaped like the MongoDB vehicle insurance collection.
+
+    The columns, dtypes and value domains follow `Config/Schema.yaml` and the
+    target is roughly as imbalanced as the real data (~12% positives), so the
+    benchmarks exercise the same code paths as a real pipeline run.
+
+    Parameters
+    ----------
+    n_rows : int
+        Number of rows to generate.
+    seed : int, default=42
+        Seed for the random generator.
+
+    Returns
+    -------
+    pd.DataFrame
+        Raw, untransformed records including `id` and `Response`.
+    """
+    rng = np.random.default_rng(seed)
+    previously_insured = rng.integers(0, 2, n_rows)
+    vehicle_damage = np.where(rng.random(n_rows) < np.where(previously_insured == 1, 0.05, 0.95), "Yes", "No")
+    response_prob = np.where((previously_insured == 0) & (vehicle_damage == "Yes"), 0.25, 0.01)
+
+    return pd.DataFrame({
+        "id": np.arange(1, n_rows + 1),
+        "Gender": rng.choice(["Male", "Female"], n_rows, p=[0.54, 0.46]),
+        "Age": rng.integers(20, 86, n_rows),
+        "Driving_License": (rng.random(n_rows) < 0.998).astype(int),
+        "Region_Code": rng.integers(0, 53, n_rows).astype(float),
+        "Previously_Insured": previously_insured,
+        "Vehicle_Age": rng.choice(["< 1 Year", "1-2 Year", "> 2 Years"], n_rows, p=[0.43, 0.53, 0.04]),
+        "Vehicle_Damage": vehicle_damage,
+        "Annual_Premium": np.round(rng.gamma(4.0, 7600.0, n_rows) + 2630.0, 1),
+        "Policy_Sales_Channel": rng.choice([26.0, 124.0, 152.0, 160.0, 156.0, 122.0, 157.0, 154.0, 151.0, 163.0], n_rows),
+        "Vintage": rng.integers(10, 300, n_rows),
+        "Response": (rng.random(n_rows) < response_prob).astype(int),
+    })
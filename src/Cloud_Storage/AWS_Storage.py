@@ -382,6 +382,23 @@ class SimpleStorageService:
         except Exception as e:
             raise MyException(error_message=e, error_detail=traceback.format_exc(), logger=self.logger) from e
     
+    def read_json_from_s3(self, s3_file_key: str, bucket_name: str) -> Optional[dict]:
+        """
+        Reads a JSON object from S3 without caching it locally.
+
+        :param s3_file_key: Key of the JSON object in the S3 bucket.
+        :param bucket_name: Name of the S3 bucket.
+        :returns: The parsed JSON, or None if the key does not exist.
+        :raises MyException: if the object cannot be read or parsed.
+        """
+        try:
+            if not self.check_s3_key_path_available(bucket_name=bucket_name, s3_key=s3_file_key):
+                return None
+            s3_object = self.s3_resource.Object(bucket_name, s3_file_key)
+            return json.loads(self.read_s3_object(s3_object=s3_object, decode=True))
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
     def load_categories(self, local_file_path: str, s3_file_key: str, bucket_name: str,*,aws_profile: Optional[str] = None,) -> dict:
         """
         Load categories from a local JSON file if it exists; otherwise fetch from S3.
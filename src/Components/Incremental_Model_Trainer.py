@@ -0,0 +1,262 @@
+import sys
+import copy
+import time
+import dataclasses
+import numpy as np
+from typing import Tuple, Optional
+from pandas import DataFrame
+from sklearn.base import ClassifierMixin
+from src.Exception import MyException
+from src.Logger import configure_logger
+from src.Constants import TARGET_COLUMN
+from src.Entity.Config_Entity import IncrementalTrainerConfig, DataValidationConfig, ModelEvaluationConfig
+from src.Entity.Artifact_Entity import (IncrementalTrainerArtifact, ClassificationMetricArtifact, DataIngestionArtifact,
+                                        DataTransformationArtifact, ModelTrainerArtifact)
+from src.Components.S2_Data_Validation import DataValidation
+from src.Components.S5_Data_Evaluation import ModelEvaluation
+from src.Entity.Estimator import MyModel
+from src.Entity.Model_Families import partial_fit_model
+from src.Entity.S3_Estimator import Current_S3_Vehicle_Insurance_Estimator
+from src.Data_Access.Vehicle_Insurance_Data import Vehicle_Insurance_Data
+from src.Utils.Main_Utils import save_object, save_dataframe
+from src.Utils.Metric_Utils import evaluate_in_chunks
+
+logger = configure_logger(logger_name=__name__, level="DEBUG", to_console=True, to_file=True, log_file_name=__name__)
+
+
+class IncrementalModelTrainer:
+    def __init__(self, incremental_trainer_config: IncrementalTrainerConfig = IncrementalTrainerConfig(),
+                 data_validation_config: DataValidationConfig = DataValidationConfig(),
+                 model_evaluation_config: ModelEvaluationConfig = ModelEvaluationConfig()):
+        """
+        Updates the production model with the MongoDB documents inserted since it was last
+        trained, instead of retraining it on the whole collection.
+
+        Parameters
+        ----------
+        incremental_trainer_config : IncrementalTrainerConfig
+            Update thresholds, output paths and the S3 location of the model and its watermark
+        data_validation_config : DataValidationConfig
+            Schema and drift checks the new documents have to pass, as in the training pipeline
+        model_evaluation_config : ModelEvaluationConfig
+            Promotion gates the updated model has to pass, as in the training pipeline
+
+        Raises
+        ------
+        MyException
+            If initialization fails due to any reason
+        """
+        try:
+            self.incremental_trainer_config = incremental_trainer_config
+            self.data_validation_config = data_validation_config
+            self.model_evaluation_config = model_evaluation_config
+            self.estimator = Current_S3_Vehicle_Insurance_Estimator(bucket_name=incremental_trainer_config.bucket_name,
+                                                                    model_s3_key=incremental_trainer_config.s3_model_key_path,
+                                                                    logger=logger)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def get_new_documents(self, after_id: Optional[str]) -> Tuple[DataFrame, Optional[str]]:
+        """
+        Fetches the documents inserted after the watermark.
+
+        Parameters
+        ----------
+        after_id : Optional[str]
+            `_id` of the newest document the production model has seen
+
+        Returns
+        -------
+        Tuple[DataFrame, Optional[str]]
+            New documents and the `_id` of the newest one (the next watermark)
+        """
+        try:
+            data = Vehicle_Insurance_Data(logger=logger)
+            config = self.incremental_trainer_config
+            latest_id = data.get_latest_document_id(collection_name=config.collection_name, database_name=config.database_name)
+            if latest_id is None or latest_id == after_id:
+                return DataFrame(), after_id
+            documents = data.import_documents_after(collection_name=config.collection_name, after_id=after_id,
+                                                    up_to_id=latest_id, database_name=config.database_name)
+            return documents, latest_id
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    @staticmethod
+    def evaluate_model(model: ClassifierMixin, x: np.ndarray, y: np.ndarray) -> ClassificationMetricArtifact:
+        return evaluate_in_chunks(model.predict, x, y).metric_artifact()
+
+    def split_documents(self, documents: DataFrame) -> Tuple[DataIngestionArtifact, DataFrame, DataFrame]:
+        """
+        Holds out a random `validation_fraction` of the new documents and saves both parts like
+        an ingestion stage would save its train and test splits, so the validation and evaluation
+        stages of the training pipeline can check them unchanged.
+
+        Parameters
+        ----------
+        documents : DataFrame
+            Raw new documents, including the target
+
+        Returns
+        -------
+        Tuple[DataIngestionArtifact, DataFrame, DataFrame]
+            Saved split (documents the model is updated with as "train", held-out documents as "test"),
+            the update documents and the held-out documents
+        """
+        try:
+            config = self.incremental_trainer_config
+            validation = np.random.default_rng(config.random_state).random(len(documents)) < config.validation_fraction
+            save_dataframe(config.new_documents_train_file_path, documents[~validation], logger=logger)
+            save_dataframe(config.new_documents_test_file_path, documents[validation], logger=logger)
+            data_ingestion_artifact = DataIngestionArtifact(training_data_file_path=config.new_documents_train_file_path,
+                                                            test_data_file_path=config.new_documents_test_file_path)
+            return data_ingestion_artifact, documents[~validation], documents[validation]
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def update_model(self, production_model: MyModel, update_documents: DataFrame, holdout_documents: DataFrame
+                     ) -> Tuple[ClassifierMixin, ClassificationMetricArtifact, ClassificationMetricArtifact]:
+        """
+        Updates a copy of the production model with new documents and scores the production
+        model and the updated model on the held-out documents.
+
+        Parameters
+        ----------
+        production_model : MyModel
+            Current production model, its preprocessing object maps the documents to its features
+        update_documents : DataFrame
+            Raw new documents the model is updated with, including the target
+        holdout_documents : DataFrame
+            Raw new documents both models are scored on, including the target
+
+        Returns
+        -------
+        Tuple[ClassifierMixin, ClassificationMetricArtifact, ClassificationMetricArtifact]
+            Updated estimator, metrics of the production model and of the updated model on the held-out documents
+        """
+        try:
+            config = self.incremental_trainer_config
+            preprocessing_object = production_model.preprocessing_object
+            x_holdout, y_holdout = preprocessing_object.transform(holdout_documents), holdout_documents[TARGET_COLUMN].to_numpy()
+            metric_before = self.evaluate_model(production_model.trained_model_object, x_holdout, y_holdout)
+            model = partial_fit_model(copy.deepcopy(production_model.trained_model_object), preprocessing_object.transform(update_documents),
+                                      update_documents[TARGET_COLUMN].to_numpy(), class_weight=config.class_weight, chunk_size=config.chunk_size)
+            metric_after = self.evaluate_model(model, x_holdout, y_holdout)
+            return model, metric_before, metric_after
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def initiate_incremental_training(self) -> IncrementalTrainerArtifact:
+        """
+        Runs one incremental update of the production model.
+
+        The update needs a production model of a family that supports `partial_fit`
+        (`sgd_logistic`) and its watermark, which every full training run pushes. It is
+        skipped until `min_documents` new documents arrived. The new documents pass the
+        gates of a full training run: `DataValidation` (schema, and drift against the
+        production reference profile once there are `drift_min_rows` of them) before the
+        update, and `ModelEvaluation` (inference latency and size, and accuracy on the
+        held-out documents) before the updated model is pushed. Unlike a full retrain the
+        update is accepted on non-regression: it may lose at most `max_accuracy_drop`
+        accuracy against the production model it continues from. Only accepted updates
+        are pushed to S3, with the advanced watermark; otherwise the documents stay
+        behind the watermark. A full retrain is due when there is no watermark, after
+        `max_updates` incremental updates, when the new documents are invalid or
+        drifted, or when the update lost more than `max_accuracy_drop` accuracy.
+
+        Returns
+        -------
+        IncrementalTrainerArtifact
+            Outcome of the update, with the before/after metrics when an update was tried
+
+        Raises
+        ------
+        MyException
+            If fetching, updating or pushing fails
+        """
+        try:
+            logger.info("Entered initiate_incremental_training method of IncrementalModelTrainer class...")
+            start = time.perf_counter()
+            print("\n" + "-"*80)
+            print("🚀 Starting Incremental Model Trainer Component...")
+            config = self.incremental_trainer_config
+
+            if not self.estimator.is_model_present(model_path=config.s3_model_key_path):
+                return IncrementalTrainerArtifact(updated=False, message="No production model in S3, a full training is needed.", full_retrain_due=True)
+            production_model = self.estimator.load_model()
+            if not hasattr(production_model.trained_model_object, "partial_fit"):
+                return IncrementalTrainerArtifact(updated=False, message=f"Production model {production_model} cannot be updated incrementally, "
+                                                                         f"train an 'sgd_logistic' model with a full training first.")
+            watermark = self.estimator.load_watermark(watermark_s3_key=config.s3_watermark_key_path)
+            if watermark is None:
+                return IncrementalTrainerArtifact(updated=False, message="No data watermark for the production model, a full training is needed.",
+                                                  full_retrain_due=True)
+            if watermark["incremental_updates"] >= config.max_updates:
+                return IncrementalTrainerArtifact(updated=False, message=f"{watermark['incremental_updates']} incremental updates since the last "
+                                                                         f"full training, a full training is due.",
+                                                  last_document_id=watermark["last_document_id"], full_retrain_due=True)
+
+            documents, latest_id = self.get_new_documents(after_id=watermark["last_document_id"])
+            if len(documents) < config.min_documents:
+                logger.info(f"{len(documents)} new documents, waiting for {config.min_documents} before updating.")
+                return IncrementalTrainerArtifact(updated=False, message=f"{len(documents)} new documents, fewer than {config.min_documents}.",
+                                                  n_documents=len(documents), last_document_id=watermark["last_document_id"])
+
+            data_ingestion_artifact, update_documents, holdout_documents = self.split_documents(documents)
+            data_validation_artifact = DataValidation(data_ingestion_artifact=data_ingestion_artifact,
+                                                      data_validation_config=self.data_validation_config).initiate_data_validation()
+            if not data_validation_artifact.validation_status or data_validation_artifact.drift_detected:
+                # The watermark stays, the documents are left for the full retrain
+                reason = "drifted from the production reference profile" if data_validation_artifact.validation_status else "failed validation"
+                return IncrementalTrainerArtifact(updated=False, message=f"New documents {reason}; a full training is due.",
+                                                  n_documents=len(documents), last_document_id=watermark["last_document_id"],
+                                                  update_seconds=time.perf_counter() - start, full_retrain_due=True,
+                                                  data_validation_artifact=data_validation_artifact)
+
+            model, metric_before, metric_after = self.update_model(production_model, update_documents, holdout_documents)
+            logger.info(f"Incremental update on {len(documents)} documents: accuracy {metric_before.accuracy_score:.4f} -> "
+                        f"{metric_after.accuracy_score:.4f}, f1 {metric_before.f1_score:.4f} -> {metric_after.f1_score:.4f}")
+            save_object(config.trained_model_file_path, MyModel(preprocessing_object=production_model.preprocessing_object,
+                                                                trained_model_object=model, logger=logger), logger=logger)
+            # The update is not a transformation run, there is no transformed data of its own
+            data_transformation_artifact = DataTransformationArtifact(data_transformation_transformed_object_file_path=None,
+                                                                      data_transformation_transformed_train_file_path=None,
+                                                                      data_transformation_transformed_test_file_path=None,
+                                                                      data_transformation_transformed_train_target_file_path=None,
+                                                                      data_transformation_transformed_test_target_file_path=None,
+                                                                      data_transformation_categories_json_path=None)
+            # An update only has to not regress the model it continues from (by more than max_accuracy_drop, ties
+            # included), not to beat it by the improvement a full retrain needs; latency and size gates still apply
+            model_evaluation_config = dataclasses.replace(self.model_evaluation_config,
+                                                          model_evaluation_change_threshold_score=-config.max_accuracy_drop - 1e-9)
+            model_evaluation_artifact = ModelEvaluation(model_evaluation_config=model_evaluation_config,
+                                                        data_ingestion_artifact=data_ingestion_artifact,
+                                                        data_transformation_artifact=data_transformation_artifact,
+                                                        model_trainer_artifact=ModelTrainerArtifact(trained_model_file_path=config.trained_model_file_path,
+                                                                                                    metric_artifact=metric_after)
+                                                        ).initiate_model_evaluation()
+            if not model_evaluation_artifact.is_model_accepted:
+                accuracy_dropped = metric_after.accuracy_score < metric_before.accuracy_score - config.max_accuracy_drop
+                return IncrementalTrainerArtifact(updated=False, message=f"Update rejected: {'; '.join(model_evaluation_artifact.rejection_reasons)}"
+                                                                         f"{'; a full training is due' if accuracy_dropped else ''}.",
+                                                  n_documents=len(documents), last_document_id=watermark["last_document_id"],
+                                                  metric_before=metric_before, metric_after=metric_after,
+                                                  update_seconds=time.perf_counter() - start, full_retrain_due=accuracy_dropped,
+                                                  data_validation_artifact=data_validation_artifact,
+                                                  model_evaluation_artifact=model_evaluation_artifact)
+
+            self.estimator.save_model_to_s3(local_model_file_path=config.trained_model_file_path)
+            self.estimator.save_watermark(watermark={"last_document_id": latest_id, "incremental_updates": watermark["incremental_updates"] + 1,
+                                                     "trained_by": "incremental", "updated_at": time.strftime("%Y-%m-%d %H:%M:%S")},
+                                          local_file_path=config.watermark_file_path, watermark_s3_key=config.s3_watermark_key_path)
+            incremental_trainer_artifact = IncrementalTrainerArtifact(updated=True, message=f"Updated with {len(documents)} new documents.",
+                                                                      n_documents=len(documents), last_document_id=latest_id,
+                                                                      trained_model_file_path=config.trained_model_file_path,
+                                                                      metric_before=metric_before, metric_after=metric_after,
+                                                                      update_seconds=time.perf_counter() - start,
+                                                                      data_validation_artifact=data_validation_artifact,
+                                                                      model_evaluation_artifact=model_evaluation_artifact)
+            logger.info(f"Incremental trainer artifact: {incremental_trainer_artifact}")
+            return incremental_trainer_artifact
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
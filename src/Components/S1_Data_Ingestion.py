@@ -1,5 +1,7 @@
 import os
 import sys
+import numpy as np
+from contextlib import ExitStack
 from pandas import DataFrame
 from sklearn.model_selection import train_test_split
 from src.Entity.Config_Entity import DataIngestionConfig
@@ -7,7 +9,8 @@ from src.Entity.Artifact_Entity import DataIngestionArtifact
 from src.Exception import MyException
 from src.Logger import configure_logger
 from src.Data_Access.Vehicle_Insurance_Data import Vehicle_Insurance_Data
-from src.Constants import COLLECTION_NAME,DATABASE_NAME
+from src.Utils.Main_Utils import save_dataframe, read_yaml, compact_dataframe, hash_train_test_split_mask, StratifiedHashSplitter, DataFrameChunkWriter, save_split_indices
+from src.Constants import COLLECTION_NAME,DATABASE_NAME,SCHEMA_FILE_PATH
 
 
 logger = configure_logger(logger_name=__name__,level="DEBUG",log_file_name=__name__)
@@ -30,19 +33,21 @@ class DataIngestion:
         try:
             logger.debug("Configuring DataIngestion...")
             self.data_ingestion_config = data_ingestion_config
+            self._schema_config = read_yaml(SCHEMA_FILE_PATH,logger=logger)
             logger.info("Data Ingestion Configured.")
         except Exception as e:
             raise MyException(error_detail=e,error_message=sys,logger=logger) from e
         
     def import_data_to_feature_store(self)->DataFrame:
         """
-        Fetches raw data from the MongoDB collection and stores it in a local CSV file
-        defined by the feature store path.
+        Fetches raw data from the MongoDB collection, downcasts it to the compact
+        dtypes declared under `compact_dtypes` in Schema.yaml and stores it in the
+        local feature store file (parquet or CSV, depending on the configured file name).
 
         Returns
         -------
         DataFrame
-            The raw data fetched from MongoDB.
+            The compacted data fetched from MongoDB.
 
         Raises
         ------
@@ -52,6 +57,8 @@ class DataIngestion:
         try:
             data = Vehicle_Insurance_Data(logger=logger)
             dataframe = data.import_collection_as_dataframe(collection_name=os.getenv(COLLECTION_NAME),database_name=os.getenv(DATABASE_NAME))
+            logger.debug("Compacting DataFrame dtypes as per schema...")
+            dataframe = compact_dataframe(dataframe,dtype_map=self._schema_config.get("compact_dtypes",{}),logger=logger)
             
             feature_store_file_path = self.data_ingestion_config.feature_store_file_path
             dir_path = os.path.dirname(feature_store_file_path)
@@ -59,7 +66,7 @@ class DataIngestion:
             os.makedirs(dir_path,exist_ok=True)
             logger.info("Directory Created Successfully at: %s",feature_store_file_path)
             logger.debug("Saving Fethced Data...")
-            dataframe.to_csv(feature_store_file_path,index=False,header=True)
+            save_dataframe(feature_store_file_path,dataframe=dataframe,logger=logger)
             logger.info("Data Successfully Saved to: %s",feature_store_file_path)
             return dataframe
         except Exception as e:
@@ -68,7 +75,8 @@ class DataIngestion:
     def save_data_as_train_test_split(self,dataframe:DataFrame)->None:
         """
         Splits the input DataFrame into train and test sets based on the config ratio,
-        then saves both sets as CSV files.
+        then saves both sets in the configured feature store format. With
+        `persist_split_as_indices` only the row positions of both sets are saved.
 
         Parameters
         ----------
@@ -83,6 +91,11 @@ class DataIngestion:
         logger.info("Entered 'save_data_as_train_test_split' function of Data_Ingestion Component.")
         try:
             logger.debug("Performing train test split with test_data_size: %s",self.data_ingestion_config.test_data_size)
+            if self.data_ingestion_config.persist_split_as_indices:
+                train_indices,test_indices = train_test_split(np.arange(len(dataframe)),test_size=self.data_ingestion_config.test_data_size,random_state=self.data_ingestion_config.random_state)
+                save_split_indices(self.data_ingestion_config.split_indices_file_path,train_indices=np.sort(train_indices),test_indices=np.sort(test_indices),logger=logger)
+                logger.info("Train-Test-Split Completed and persisted as indices over the feature store.")
+                return
             train_data,test_data = train_test_split(dataframe,test_size=self.data_ingestion_config.test_data_size,random_state=self.data_ingestion_config.random_state)
             logger.info("Train-Test-Split Completed.")
             
@@ -94,27 +107,95 @@ class DataIngestion:
             logger.info(f"Directories Created Successfully at '{os.path.dirname(training_data_file_path)}'and {testing_data_file_path}")
 
             logger.debug(f"Saving training and testing data to '{training_data_file_path}' and '{testing_data_file_path} ...'")
-            train_data.to_csv(training_data_file_path,index=False,header=True)
-            test_data.to_csv(testing_data_file_path,index=False,header=True)
+            save_dataframe(training_data_file_path,dataframe=train_data,logger=logger)
+            save_dataframe(testing_data_file_path,dataframe=test_data,logger=logger)
             logger.info("Train,Test Data Saves Successfully.")
             logger.debug(f"Train rows: {len(train_data)}, Test rows: {len(test_data)}")
-            logger.debug(f"Train CSV size: {os.path.getsize(training_data_file_path)/1024:.2f} KB")
                                 
         except Exception as e:
             raise MyException(error_message=e,error_detail=sys,logger=logger) from e
         
+    def stream_data_as_hash_split(self)->None:
+        """
+        Streams the MongoDB collection chunk by chunk into the feature store and
+        the train/test files without ever holding the full dataset in memory.
+
+        Each row is assigned to train or test by `hash_train_test_split_mask` from
+        a stable hash of its id and the configured seed, so a row keeps its split
+        across incremental refreshes. With a stratify column the
+        `StratifiedHashSplitter` fills per-class test quotas chunk by chunk instead,
+        so every class gets `test_data_size` of its rows (within one row).
+        With `persist_split_as_indices` only the feature store is written and the
+        split is saved as row positions into it.
+
+        Raises
+        ------
+        MyException
+            If fetching, splitting or writing any chunk fails.
+        """
+        logger.info("Entered 'stream_data_as_hash_split' function of Data_Ingestion Component.")
+        try:
+            config = self.data_ingestion_config
+            data = Vehicle_Insurance_Data(logger=logger)
+            chunks = data.iterate_collection_in_chunks(collection_name=os.getenv(COLLECTION_NAME),
+                                                       database_name=os.getenv(DATABASE_NAME),
+                                                       chunk_size=config.chunk_size)
+            splitter = StratifiedHashSplitter(test_size=config.test_data_size, seed=config.random_state) if config.stratify_column else None
+            train_indices, test_indices = [], []
+            n_train_rows = n_test_rows = 0
+            with ExitStack() as stack:
+                feature_store_writer = stack.enter_context(DataFrameChunkWriter(config.feature_store_file_path, logger=logger))
+                if not config.persist_split_as_indices:
+                    train_writer = stack.enter_context(DataFrameChunkWriter(config.training_data_file_path, logger=logger))
+                    test_writer = stack.enter_context(DataFrameChunkWriter(config.test_data_file_path, logger=logger))
+                for chunk in chunks:
+                    chunk = compact_dataframe(chunk,dtype_map=self._schema_config.get("compact_dtypes",{}),logger=logger)
+                    if splitter is not None:
+                        is_test = splitter.split_mask(ids=chunk[config.split_id_column].to_numpy(),
+                                                      stratify=chunk[config.stratify_column].to_numpy())
+                    else:
+                        is_test = hash_train_test_split_mask(ids=chunk[config.split_id_column].to_numpy(),
+                                                             test_size=config.test_data_size,
+                                                             seed=config.random_state)
+                    if config.persist_split_as_indices:
+                        offset = feature_store_writer.n_rows
+                        train_indices.append(offset + np.flatnonzero(~is_test))
+                        test_indices.append(offset + np.flatnonzero(is_test))
+                    else:
+                        train_writer.write(chunk[~is_test])
+                        test_writer.write(chunk[is_test])
+                    feature_store_writer.write(chunk)
+                    n_test_rows += int(is_test.sum())
+                    n_train_rows += len(chunk) - int(is_test.sum())
+                    logger.debug(f"Chunk of {len(chunk)} rows split into Train: {int((~is_test).sum())}, Test: {int(is_test.sum())}")
+
+            if config.persist_split_as_indices:
+                save_split_indices(config.split_indices_file_path,
+                                   train_indices=np.concatenate(train_indices) if train_indices else np.empty(0, dtype=np.int64),
+                                   test_indices=np.concatenate(test_indices) if test_indices else np.empty(0, dtype=np.int64),
+                                   logger=logger)
+            logger.info(f"Hash split completed. Train rows: {n_train_rows}, Test rows: {n_test_rows}")
+            for label, total in (splitter.total_counts.items() if splitter is not None else []):
+                logger.info(f"Test ratio for {config.stratify_column}={label}: {splitter.test_counts[label]/total:.4f} ({total} rows)")
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
     def initiate_data_ingestion(self) ->DataIngestionArtifact:
         """
         Orchestrates the full data ingestion process:
         1. Loads data from MongoDB.
         2. Saves raw data to feature store.
-        3. Splits data into train and test CSV files.
+        3. Splits data into train and test files.
         4. Creates and returns the DataIngestionArtifact.
 
+        With the "hash" split strategy steps 1-3 run chunk by chunk as the data
+        arrives from MongoDB, the "random" strategy loads the whole collection.
+
         Returns
         -------
         DataIngestionArtifact
-            Contains file paths to train and test data.
+            Contains file paths to train and test data, or to the feature store
+            and the split indices when `persist_split_as_indices` is enabled.
 
         Raises
         ------
@@ -126,12 +207,26 @@ class DataIngestion:
             logger.info("Entered initiate_data_ingestion method of Data_Ingestion class")
             print("\n" + "-"*80)
             print("🚀 Starting Data Ingestion Component...")
-            dataframe = self.import_data_to_feature_store()
-
-            self.save_data_as_train_test_split(dataframe=dataframe)
-
-            data_ingestion_artifact = DataIngestionArtifact(training_data_file_path=self.data_ingestion_config.training_data_file_path,
-                                                            test_data_file_path=self.data_ingestion_config.test_data_file_path)
+            # Taken before reading, documents inserted meanwhile are seen again by the next incremental update rather than never
+            latest_document_id = Vehicle_Insurance_Data(logger=logger).get_latest_document_id(collection_name=os.getenv(COLLECTION_NAME),
+                                                                                              database_name=os.getenv(DATABASE_NAME))
+            if self.data_ingestion_config.split_strategy == "hash":
+                self.stream_data_as_hash_split()
+            else:
+                dataframe = self.import_data_to_feature_store()
+                self.save_data_as_train_test_split(dataframe=dataframe)
+
+            if self.data_ingestion_config.persist_split_as_indices:
+                data_ingestion_artifact = DataIngestionArtifact(training_data_file_path=None,
+                                                                test_data_file_path=None,
+                                                                feature_store_file_path=self.data_ingestion_config.feature_store_file_path,
+                                                                split_indices_file_path=self.data_ingestion_config.split_indices_file_path,
+                                                                latest_document_id=latest_document_id)
+            else:
+                data_ingestion_artifact = DataIngestionArtifact(training_data_file_path=self.data_ingestion_config.training_data_file_path,
+                                                                test_data_file_path=self.data_ingestion_config.test_data_file_path,
+                                                                feature_store_file_path=self.data_ingestion_config.feature_store_file_path,
+                                                                latest_document_id=latest_document_id)
 
             logger.info(f"Data Ingestion Artifact Created: {data_ingestion_artifact}")
             return data_ingestion_artifact
@@ -1,12 +1,16 @@
 import os
 import sys
 import json
-from pandas import DataFrame
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from src.Logger import configure_logger
 from src.Exception import MyException
 from src.Entity.Config_Entity import DataValidationConfig
 from src.Entity.Artifact_Entity import DataIngestionArtifact, DataValidationArtifact
-from src.Utils.Main_Utils import read_yaml, read_csv_data
+from src.Utils.Main_Utils import read_yaml, iter_ingested_split_chunks
+from src.Entity.Schema_Validator import SchemaValidator
+from src.Entity.Data_Profile import DataProfile
+from src.Cloud_Storage.AWS_Storage import SimpleStorageService
 from src.Constants import SCHEMA_FILE_PATH
 
 logger = configure_logger(logger_name=__name__,level="DEBUG",to_console=True,to_file=True,log_file_name=__name__)
@@ -27,134 +31,78 @@ class DataValidation:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config  = data_validation_config
             self._schema_config = read_yaml(SCHEMA_FILE_PATH,logger=logger)
+            self._schema_validator = SchemaValidator(self._schema_config, logger=logger)
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
     
-    def validate_number_of_columns(self, dataframe: DataFrame)->bool:
+    def load_reference_profile(self)->Optional[DataProfile]:
         """
-        Validates if the number of columns in the given dataframe matches the expected schema.
-
-        Parameters:
-        ------------
-        dataframe : pd.DataFrame
-            The dataset to be validated.
-
-        Returns:
-        ---------
-        bool
-            True if column count matches, False otherwise.
-        """
-        try:
-            logger.debug("Validating no. of columns in the provided Dataframe...")
-            status = len(dataframe.columns) == len(self._schema_config["columns"])
-            logger.info("Validation Status: %s",status)
-            return status
-        except Exception as e:
-            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
-    
-    def validate_column_data_types(self, dataframe: DataFrame) -> bool:
-        """
-        Validates if each column in the dataframe matches its expected data type in the schema.
-
-        Parameters:
-        ------------
-        dataframe : pd.DataFrame
-            The dataset to validate.
+        Loads the data profile stored next to the current production model in S3.
 
         Returns:
         ---------
-        bool
-            True if all columns have expected data types, False otherwise.
+        Optional[DataProfile]
+            The reference profile, or None if there is none yet or S3 is unreachable.
         """
         try:
-            logger.debug("Validating column data types...")
-            mismatched_types = []
-
-            # Convert list of dicts to a flat dict
-            expected_dtypes_list = self._schema_config.get("columns")
-            expected_dtypes = {list(d.keys())[0]: list(d.values())[0] for d in expected_dtypes_list}
-
-
-            for column, expected_dtype in expected_dtypes.items():
-                if column not in dataframe.columns:
-                    continue  # Already handled in column existence check
-
-                actual_dtype = dataframe[column].dtype
-
-                # Normalize types for comparison
-                if expected_dtype == "int":
-                    valid_types = ["int64", "int32"]
-                elif expected_dtype == "float":
-                    valid_types = ["float64", "float32"]
-                elif expected_dtype == "object":
-                    valid_types = ["object"]
-                elif expected_dtype == "bool":
-                    valid_types = ["bool"]
-                else:
-                    valid_types = [expected_dtype]
-
-                if str(actual_dtype) not in valid_types:
-                    mismatched_types.append((column, str(actual_dtype), expected_dtype))
-
-            if mismatched_types:
-                for col, actual, expected in mismatched_types:
-                    logger.warning(f"Data type mismatch in column '{col}': Expected '{expected}', Found '{actual}'")
-                return False
-            else:
-                logger.info("All column data types are valid.")
-                return True
-
+            payload = SimpleStorageService(logger=logger).read_json_from_s3(s3_file_key=self.data_validation_config.s3_reference_profile_key_path,
+                                                                            bucket_name=self.data_validation_config.bucket_name)
         except Exception as e:
-          raise MyException(error_message=e, error_detail=sys, logger=logger) from e
-
-    def does_all_column_exist(self, dataframe:DataFrame)->bool:
+            logger.warning(f"Could not load reference data profile from S3, skipping drift detection: {e}")
+            return None
+        if payload is None:
+            logger.warning("No reference data profile found in S3, skipping drift detection.")
+            return None
+        return DataProfile.from_dict(payload, logger=logger)
+
+    def validate_split(self, split:str, profile:Optional[DataProfile]=None)->dict:
         """
-        Validates that all expected numerical and categorical columns are present in the dataframe.
+        Streams one ingested split through the compiled schema validator.
 
         Parameters:
         ------------
-        dataframe : pd.DataFrame
-            The dataset to validate.
+        split : str
+            Either "train" or "test".
+        profile : Optional[DataProfile]
+            If given, the profile is updated from the same streaming pass.
 
         Returns:
         ---------
-        bool
-            True if all expected columns are found, False otherwise.
+        dict
+            Structured validation report with per-check results and timings.
         """
         try:
-            missing_numerical_columns = []
-            missing_categorical_columns = []
-            dataframe_coloumn = dataframe.columns
-            
-            for column in self._schema_config["numerical_columns"]:
-                if column not in dataframe_coloumn:
-                    missing_numerical_columns.append(column)
-            
-            for column in self._schema_config["categorical_columns"]:
-                if column not in dataframe_coloumn:
-                    missing_categorical_columns.append(column)
-            
-            if len(missing_numerical_columns)>0:
-                logger.info(f"Missing numerical column: {missing_numerical_columns}")
-
-            if len(missing_categorical_columns)>0:
-                logger.info(f"Missing catagorical column: {missing_categorical_columns}")
-            
-            return False if len(missing_categorical_columns)>0 or len(missing_numerical_columns)>0 else True
+            logger.debug(f"Validating '{split}' data in chunks of {self.data_validation_config.chunk_size} rows...")
+            chunks = iter_ingested_split_chunks(self.data_ingestion_artifact, split=split,
+                                                chunk_size=self.data_validation_config.chunk_size, logger=logger)
+            if profile is not None:
+                chunks = profile.observe(chunks)
+            report = self._schema_validator.validate_chunks(chunks)
+            logger.info(f"Validation of '{split}' data finished in {report['total_duration_ms']} ms: status={report['validation_status']}")
+            return report
         except Exception as e:
-            raise MyException(error_message=e,error_detail=sys,logger=logger) from e
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
 
-    def initiate_data_validation(self)->DataValidationArtifact:
+    def initiate_data_validation(self, reference_profile:Optional[DataProfile]=None, load_reference_profile:bool=True)->DataValidationArtifact:
         """
         Runs all validation steps on the train and test datasets.
 
         Steps:
         ------
-        - Load train/test CSV files
-        - Validate number of columns
-        - Validate data types of columns
-        - Validate existence of required numerical and categorical columns
-        - Log results and save validation report to JSON file
+        - Stream train/test data (CSV, parquet or split indices) chunk by chunk
+        - Check column presence, data types, null rates, value domains and numeric
+          ranges in a single vectorized pass per split, both splits in parallel
+        - Build a data profile of the training split in the same pass and compare
+          it with the profile of the current production model (PSI/KS drift)
+        - Log results and save the structured validation report to JSON file
+
+        Parameters:
+        ------------
+        reference_profile : Optional[DataProfile]
+            Profile of the current production model, if already loaded by the caller.
+        load_reference_profile : bool
+            Whether to load the reference profile from S3 when none is given. Callers
+            that already tried (and found none) pass False to skip a second request.
 
         Returns:
         ---------
@@ -170,46 +118,40 @@ class DataValidation:
             logger.info("Entered 'initiate_data_validation' method of DataValidation class...")
             print("\n" + "-"*80)
             print("🚀 Starting Data Validation Component...")
-            errors = []
             logger.info("Starting Data_Validation...")
-            logger.debug(f"Loading Train-Test Data from: '{self.data_ingestion_artifact.training_data_file_path}' and {self.data_ingestion_artifact.test_data_file_path} ...")
-            train_data, test_data = (read_csv_data(file_path=self.data_ingestion_artifact.training_data_file_path)),(read_csv_data(self.data_ingestion_artifact.test_data_file_path))
-            logger.info("Train-Test Data Successfully Loaded.")
-            
-            # Checking col len of dataframe for train/test df
-            status = self.validate_number_of_columns(train_data)
-            if not status:
-                errors.append("Columns are missing in training dataframe.")  
-            else:
-                logger.info(f"All required columns present in training dataframe: {status}")
-            # Validating Datatypes of all Columns
-            status = self.validate_number_of_columns(test_data)
-            if not status:
-                errors.append("Columns are missing in test dataframe.")
-            else:
-                logger.info(f"All required columns present in test dataframe: {status}")
-            
-            status = self.validate_column_data_types(train_data)
-            if not status:
-                errors.append("Data type mismatch in training dataframe.")
-
-            status = self.validate_column_data_types(test_data)
-            if not status:
-                errors.append("Data type mismatch in test dataframe.")
-
-            # Checking all Numerical and Categorical columns are present or not 
-            status = self.does_all_column_exist(train_data)
-            if not status:
-                errors.append("Columns are missing in training dataframe.")
-            else:
-                logger.info(f"All categorical/int columns present in training dataframe: {status}")
-
-            status = self.does_all_column_exist(test_data)
-            if not status:
-                errors.append("Columns are missing in test dataframe.")
-            else:
-                logger.info(f"All categorical/int columns present in test dataframe: {status}")
-            
+            logger.debug(f"Validating Train-Test Data from: {self.data_ingestion_artifact} ...")
+            profile = DataProfile.from_schema(self._schema_config, n_bins=self.data_validation_config.profile_sketch_bins, logger=logger)
+            load_reference = reference_profile is None and load_reference_profile
+            with ThreadPoolExecutor(max_workers=3 if load_reference else 2) as executor:
+                reference_future = executor.submit(self.load_reference_profile) if load_reference else None
+                train_future = executor.submit(self.validate_split, "train", profile)
+                test_future = executor.submit(self.validate_split, "test")
+                split_reports = {"train": train_future.result(), "test": test_future.result()}
+                if reference_future is not None:
+                    reference_profile = reference_future.result()
+
+            # Stored with bins at the training quantiles, it becomes the reference of the next runs once the model is pushed
+            profile.with_quantile_edges(self.data_validation_config.profile_bins).save(self.data_validation_config.data_profile_file_path)
+            drift_report = None
+            if reference_profile is not None:
+                drift_report = profile.compare(reference_profile,
+                                               psi_threshold=self.data_validation_config.drift_psi_threshold,
+                                               ks_threshold=self.data_validation_config.drift_ks_threshold,
+                                               min_rows=self.data_validation_config.drift_min_rows)
+                if profile.n_rows < self.data_validation_config.drift_min_rows:
+                    logger.info(f"Only {profile.n_rows} training rows, fewer than {self.data_validation_config.drift_min_rows}: "
+                                f"drift statistics are reported but cannot flag drift.")
+                elif drift_report["drift_detected"]:
+                    logger.warning(f"Data drift detected against the production reference profile in columns: {drift_report['drifted_columns']}")
+                else:
+                    logger.info("No data drift detected against the production reference profile.")
+
+            errors = []
+            for split, report in split_reports.items():
+                for message in report["messages"]:
+                    logger.warning(f"[{split}] {message}")
+                    errors.append(f"[{split}] {message}")
+
             validation_error_message = "\n".join(errors)
 
             validation_status = len(validation_error_message) == 0
@@ -217,16 +159,20 @@ class DataValidation:
             data_validation_artifact = DataValidationArtifact(
                 validation_status=validation_status,
                 message=validation_error_message,
-                validation_report_file_path=self.data_validation_config.data_validation_report_file_path
+                validation_report_file_path=self.data_validation_config.data_validation_report_file_path,
+                data_profile_file_path=self.data_validation_config.data_profile_file_path,
+                drift_detected=None if drift_report is None else drift_report["drift_detected"]
             )
              # Ensure the directory for validation_report_file_path exists
             report_dir = os.path.dirname(self.data_validation_config.data_validation_report_file_path)
             os.makedirs(report_dir, exist_ok=True)
 
-            # Save validation status and message to a JSON file
+            # Save validation status, message and the per-split reports to a JSON file
             validation_report = {
                 "validation_status": validation_status,
-                "message": validation_error_message.strip()
+                "message": validation_error_message.strip(),
+                **split_reports,
+                "drift": drift_report
             }
 
             with open(self.data_validation_config.data_validation_report_file_path, "w") as report_file:
@@ -236,4 +182,4 @@ class DataValidation:
             logger.info(f"Data validation artifact: {data_validation_artifact}")
             return data_validation_artifact
         except Exception as e:
-            raise MyException(error_message=e,error_detail=sys,logger=logger) from e
\ No newline at end of file
+            raise MyException(error_message=e,error_detail=sys,logger=logger) from e
@@ -1,21 +1,28 @@
 import os
 import sys
+import json
 import pandas as pd
 import numpy as np
-from typing import Optional, Tuple
-from sklearn.pipeline import Pipeline
+from typing import Optional, Tuple, Iterable, Iterator, Callable, Any
 from sklearn.preprocessing import StandardScaler,MinMaxScaler
 from sklearn.compose import ColumnTransformer
-from imblearn.combine import SMOTEENN
 from src.Logger import configure_logger
 from src.Exception import MyException
 from src.Entity.Config_Entity import DataTransformationConfig, DataValidationConfig
 from src.Entity.Artifact_Entity import DataTransformationArtifact, DataIngestionArtifact, DataValidationArtifact
-from src.Utils.Main_Utils import read_csv_data, read_yaml, save_object, save_numpy_array, _dump_categories
+from src.Utils.Main_Utils import (read_ingested_split, iter_ingested_split_chunks, read_yaml, save_object,
+                                  create_numpy_memmap, load_numpy_array, save_numpy_array, _dump_categories)
+from src.Utils.Resampling_Utils import resample_imbalanced
+from src.Utils.Learning_Curve import LearningCurve, stratified_sample_indices
+from src.Entity.Preprocessor import CategoricalEncoder, FusedPreprocessor
+from src.Entity.Model_Families import get_model_name, get_model_params
 from src.Constants import SCHEMA_FILE_PATH, RANDOM_STATE, TARGET_COLUMN
 
 logger = configure_logger(logger_name=__name__,level="DEBUG",to_console=True,to_file=True,log_file_name=__name__)
 
+# Supported values of `DataTransformationConfig.transformation_mode`
+TRANSFORMATION_MODES = ("in_memory", "chunked")
+
 class DataTransformation:
     def __init__(self, data_transformation_config:DataTransformationConfig,
                  data_ingestion_artifact:DataIngestionArtifact, 
@@ -33,15 +40,41 @@ class DataTransformation:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_artifact = data_validation_artifact
             self._schema_config = read_yaml(SCHEMA_FILE_PATH,logger=logger)
+            model_yaml = data_transformation_config.model_config_yaml_file_path
+            self._model_config = (read_yaml(model_yaml, logger=logger) or {}) if os.path.exists(model_yaml) else {}
+            self.training_fraction = 1.0
+            self.learning_curve_file_path = None
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
     
-    def get_data_transformer_object(self)->Pipeline:
+    def get_categorical_encoder(self, dataframe:pd.DataFrame)->CategoricalEncoder:
         """
-        Creates and returns a data transformer pipeline that standardizes and normalizes data.
+        Fits the categorical encoder on the training input features.
+
+        Parameters:
+        - dataframe: Training input features (raw categorical levels, `id` already dropped)
 
         Returns:
-        - A Pipeline object with ColumnTransformer to apply StandardScaler and MinMaxScaler.
+        - A fitted CategoricalEncoder for the schema `categorical_columns`
+        """
+        try:
+            logger.debug("Fitting categorical encoder on training data...")
+            encoder = CategoricalEncoder(columns=self._schema_config['categorical_columns']).fit(dataframe)
+            logger.info(f"Encoder fitted. Encoded feature names: {encoder.get_feature_names_out().tolist()}")
+            return encoder
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def get_data_transformer_object(self, encoder:CategoricalEncoder)->ColumnTransformer:
+        """
+        Creates and returns the (unfitted) scaling step that standardizes and normalizes encoded data.
+
+        Parameters:
+        - encoder: Fitted CategoricalEncoder, its output columns are what the scalers select from
+
+        Returns:
+        - A ColumnTransformer applying StandardScaler and MinMaxScaler. Once fitted it is folded
+          together with the encoder into the persisted FusedPreprocessor.
         """
         logger.info("Entered get_data_transformer_object method of DataTransformation class")
 
@@ -50,9 +83,10 @@ class DataTransformation:
             # Initialize Transformers
             standard_scaler = StandardScaler()
             min_max_scaler = MinMaxScaler()
-            # Load Schema Configuration from Schema.yaml
-            standard_feature = self._schema_config['num_features']
-            min_max_feature = self._schema_config['mm_features']
+            # Load Schema Configuration from Schema.yaml, the encoder outputs a plain matrix so columns are selected by position
+            feature_names = encoder.get_feature_names_out().tolist()
+            standard_feature = [feature_names.index(column) for column in self._schema_config['num_features']]
+            min_max_feature = [feature_names.index(column) for column in self._schema_config['mm_features']]
             logger.info("Transformers Initialized: StandardScaler-MinMaxScaler")
 
              # Creating preprocessor pipeline
@@ -60,68 +94,12 @@ class DataTransformation:
                                                ("MinMaxScaler",min_max_scaler,min_max_feature)],
                                                remainder="passthrough" # Leaves other columns as they are
                                                )
-            
-            final_pipeline = Pipeline(steps=[('Preprocessor',preprocessor)])
-            logger.info("Final Pipeline Ready!!")
             logger.info("Exited get_data_transformer_object method of DataTransformation class.")
 
-            return final_pipeline
+            return preprocessor
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
-        
-    def apply_one_hot_encoding(self, dataframe:pd.DataFrame, columns:list)->pd.DataFrame:
-        """
-        Applies one-hot encoding to the specified categorical columns.
 
-        Parameters:
-        - dataframe: Input DataFrame
-        - columns: List of columns to be one-hot encoded
-
-        Returns:
-        - Transformed DataFrame with new binary columns
-        """
-        try:
-            logger.debug("Performing 'one-hot-encoding' on categorical columns... ")
-            dataframe = pd.get_dummies(dataframe,columns=columns,dtype=int,drop_first=True)
-            logger.info("Encoding Completed.")
-            return dataframe
-        except Exception as e:
-            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
-    
-    # Note make this function schema driven
-    def _rename_columns(self, dataframe: pd.DataFrame) -> pd.DataFrame:
-        """
-        Renames encoded columns to clean and valid names (e.g., no spaces or special chars).
-
-        Parameters:
-        - dataframe: DataFrame with encoded columns
-
-        Returns:
-        - DataFrame with renamed columns
-        """
-        try:
-            logger.debug("Renaming column names changed due to creating dummy columns (one-hot encoding)")
-            rename_map = {
-                "Gender_1": "Gender_Male",
-                "Vehicle_Age_< 1 Year": "Vehicle_Age_lt_1_Year",
-                "Vehicle_Age_> 2 Years": "Vehicle_Age_gt_2_Years"
-            }
-
-            actual_rename_map = {k: v for k, v in rename_map.items() if k in dataframe.columns}
-
-            if not actual_rename_map:
-                logger.warning("No columns matched for renaming.")
-            else:
-                dataframe = dataframe.rename(columns=actual_rename_map)
-                logger.info(f"Renamed columns: {actual_rename_map}")
-
-            return dataframe
-
-        except Exception as e:
-            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
-
-    
-        
     def _drop_column(self, dataframe:pd.DataFrame, columns:Optional[list]=None)->pd.DataFrame:
         """
         Drops specified or schema-driven columns from the DataFrame.
@@ -146,22 +124,107 @@ class DataTransformation:
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
         
-    def apply_smoteenn_resampling(self, X:pd.DataFrame, Y:pd.Series)->Tuple[pd.DataFrame,pd.Series]:
+    def select_training_fraction(self, features:np.ndarray, target:np.ndarray,
+                                 features_file_path:Optional[str]=None, target_file_path:Optional[str]=None)->Tuple[np.ndarray, np.ndarray]:
+        """
+        Records the learning curve configured in the `learning_curve` section of the model YAML
+        on the encoded, not yet resampled training data (see `LearningCurve`) and saves it to
+        `data_transformation_learning_curve_file_path`. With `auto_select` the stratified
+        fraction recommended by the curve is returned, so resampling and training only pay for
+        the rows that still improve the score. Without a configured curve the data is returned as is.
+
+        Parameters
+        ----------
+        features : np.ndarray
+            Encoded training features, before resampling.
+
+        target : np.ndarray
+            Training labels.
+
+        features_file_path, target_file_path : Optional[str]
+            `.npy` files already holding `features` and `target` (chunked mode). Otherwise the arrays are
+            written to the encoded scratch files for the curve's worker processes and removed afterwards.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Training features and labels to resample.
+
+        Raises
+        ------
+        MyException
+            If the learning curve fails.
+        """
+        try:
+            curve_config = self._model_config.get("learning_curve") or {}
+            if not curve_config.get("enabled", False):
+                return features, target
+            config = self.data_transformation_config
+            write_scratch = features_file_path is None
+            if write_scratch:
+                features_file_path = config.data_transformation_encoded_train_file_path
+                target_file_path = config.data_transformation_encoded_train_target_file_path
+                save_numpy_array(features_file_path, features, logger=logger)
+                save_numpy_array(target_file_path, target, logger=logger)
+            try:
+                model_name = get_model_name(self._model_config)
+                learning_curve = LearningCurve(x_file_path=features_file_path, y_file_path=target_file_path,
+                                               curve_config=curve_config,
+                                               model_name=model_name,
+                                               model_params=get_model_params(self._model_config, model_name),
+                                               imbalance_strategy=config.imbalance_strategy,
+                                               resampling_params={"chunk_size": config.resampling_chunk_size,
+                                                                  "max_synthetic_samples": config.max_synthetic_samples},
+                                               random_state=RANDOM_STATE,
+                                               logger=logger)
+                recommended_fraction, curve = learning_curve.run()
+            finally:
+                if write_scratch:
+                    os.remove(features_file_path)
+                    os.remove(target_file_path)
+
+            selected_fraction = recommended_fraction if curve_config.get("auto_select", False) else 1.0
+            os.makedirs(os.path.dirname(config.data_transformation_learning_curve_file_path), exist_ok=True)
+            with open(config.data_transformation_learning_curve_file_path, "w") as curve_file:
+                json.dump({"model_name": model_name, "imbalance_strategy": config.imbalance_strategy,
+                           "scoring": learning_curve.scoring, "tolerance": learning_curve.tolerance,
+                           "recommended_fraction": recommended_fraction, "selected_fraction": selected_fraction,
+                           "points": curve}, curve_file, indent=2)
+            logger.info(f"Learning curve saved at: {config.data_transformation_learning_curve_file_path}")
+            self.learning_curve_file_path = config.data_transformation_learning_curve_file_path
+
+            if selected_fraction < 1.0:
+                indices = stratified_sample_indices(np.asarray(target), selected_fraction, random_state=RANDOM_STATE)
+                logger.info(f"Training on the recommended {selected_fraction:.0%} of the training data ({len(indices)} of {len(target)} rows).")
+                features, target = np.asarray(features[indices]), np.asarray(target[indices])
+                self.training_fraction = selected_fraction
+            return features, target
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def apply_resampling(self, X:pd.DataFrame | np.ndarray, Y:pd.Series | np.ndarray)->Tuple[pd.DataFrame | np.ndarray, pd.Series | np.ndarray]:
         """
-        Applies SMOTEENN resampling to the input features and target.
+        Applies the configured class-imbalance strategy to the input features and target.
+
+        The default "smoteenn" uses `ParallelSMOTEENN`, which gives the same result as
+        imblearn's `SMOTEENN` under the same seed but runs the neighbour searches on
+        `resampling_n_jobs` cores, cleans in chunks of `resampling_chunk_size` rows and
+        optionally caps the synthetic rows at `max_synthetic_samples`. "smote" and
+        "random_undersample" resample too, "class_weight" and "none" leave the data
+        as is (see `resample_imbalanced`).
 
         Parameters
         ----------
-        X : pd.DataFrame
-            The feature set before resampling.
+        X : pd.DataFrame or np.ndarray
+            The (encoded) feature set before resampling.
 
-        Y : pd.Series
+        Y : pd.Series or np.ndarray
             The target labels before resampling.
 
         Returns
         -------
-        Tuple[pd.DataFrame, pd.Series]
-            Resampled feature set and labels.
+        Tuple[pd.DataFrame | np.ndarray, pd.Series | np.ndarray]
+            Resampled feature set and labels, of the same types as the inputs.
 
         Raises
         ------
@@ -169,9 +232,14 @@ class DataTransformation:
             If resampling fails.
         """
         try:
-            logger.info("Applying SMOTEENN for resampling...")
-            smote_enn = SMOTEENN(random_state = RANDOM_STATE) 
-            X_resampled, Y_resampled = smote_enn.fit_resample(X, Y)
+            logger.info(f"Applying '{self.data_transformation_config.imbalance_strategy}' class-imbalance strategy...")
+            X_resampled, Y_resampled = resample_imbalanced(X, Y,
+                                                           strategy=self.data_transformation_config.imbalance_strategy,
+                                                           random_state=RANDOM_STATE,
+                                                           n_jobs=self.data_transformation_config.resampling_n_jobs,
+                                                           chunk_size=self.data_transformation_config.resampling_chunk_size,
+                                                           max_synthetic_samples=self.data_transformation_config.max_synthetic_samples,
+                                                           logger=logger)
             logger.info(f"Resampling completed. Resampled shape: X={X_resampled.shape}, Y={Y_resampled.shape}")
             return X_resampled, Y_resampled
 
@@ -214,40 +282,157 @@ class DataTransformation:
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
 
-        
-    def initiate_data_transformation(self)->DataTransformationArtifact:
+
+    def write_transformed_chunks(self, transform:Callable[[Any], np.ndarray],
+                                 chunks:Iterable[Tuple[pd.DataFrame | np.ndarray, pd.Series | np.ndarray]], n_rows:int,
+                                 features_file_path:str, target_file_path:str)->None:
         """
-        Executes the full data transformation process:
-        - Reads training and test data from ingestion artifacts.
-        - Splits data into input features and target column.
-        - Drops unnecessary columns as defined in schema.
-        - Applies one-hot encoding to categorical variables.
-        - Renames generated dummy columns for consistency.
-        - Applies SMOTEENN resampling on training data to handle class imbalance.
-        - Scales both train and test input features using a combined StandardScaler + MinMaxScaler pipeline.
-        - Validates shape consistency between features and target for both sets.
-        - Concatenates input and target arrays into a single NumPy array.
-        - Saves the transformer object and transformed data files.
+        Transforms a stream of (features, target) chunks straight into preallocated
+        float32 memory-mapped `.npy` files, one for the features and one for the labels.
+        Only one chunk is held in memory at a time.
 
-        Returns:
-        --------
-        DataTransformationArtifact
-            Contains paths to the preprocessor object, transformed train, and test NumPy files.
+        Parameters
+        ----------
+        transform : Callable
+            Fitted transform applied to the features of each chunk, e.g. `FusedPreprocessor.transform`.
+        chunks : Iterable[Tuple[pd.DataFrame | np.ndarray, pd.Series | np.ndarray]]
+            Consecutive (features, target) chunks.
+        n_rows : int
+            Total number of rows over all chunks, used to preallocate the files.
+        features_file_path : str
+            Destination `.npy` file of the transformed features.
+        target_file_path : str
+            Destination `.npy` file of the labels.
 
-        Raises:
+        Raises
+        ------
+        MyException
+            If a chunk has mismatched features/target, the row count is wrong or writing fails.
+        """
+        try:
+            feature_array, target_array, offset = None, None, 0
+            for features, target in chunks:
+                self._validate_feature_target_shape(features, target)
+                transformed = transform(features)
+                if feature_array is None:
+                    feature_array = create_numpy_memmap(features_file_path, shape=(n_rows, transformed.shape[1]), dtype=np.float32, logger=logger)
+                    target_array = create_numpy_memmap(target_file_path, shape=(n_rows,), dtype=np.float32, logger=logger)
+                if offset + len(transformed) > n_rows:
+                    raise ValueError(f"Received more than the expected {n_rows} rows.")
+                feature_array[offset:offset + len(transformed)] = transformed
+                target_array[offset:offset + len(transformed)] = np.asarray(target, dtype=np.float32)
+                offset += len(transformed)
+            if feature_array is None or offset != n_rows:
+                raise ValueError(f"Expected {n_rows} rows, received {offset}.")
+            feature_array.flush()
+            target_array.flush()
+            logger.info(f"Transformed features {feature_array.shape} and labels written to '{features_file_path}' and '{target_file_path}'")
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def write_transformed_arrays(self, transform:Callable[[Any], np.ndarray], features:pd.DataFrame | np.ndarray,
+                                 target:pd.Series | np.ndarray, features_file_path:str, target_file_path:str)->None:
+        """
+        Transforms in-memory (or memory-mapped) features in chunks of `chunk_size` rows
+        into float32 memory-mapped `.npy` files (see `write_transformed_chunks`), so no
+        combined (`np.c_`) or full float64 copy is ever built.
+
+        Parameters
+        ----------
+        transform : Callable
+            Fitted transform applied to each chunk of `features`.
+        features : pd.DataFrame or np.ndarray
+            Input features to transform.
+        target : pd.Series or np.ndarray
+            Corresponding target values.
+        features_file_path : str
+            Destination `.npy` file of the transformed features.
+        target_file_path : str
+            Destination `.npy` file of the labels.
+
+        Raises
+        ------
+        MyException
+            If the shapes mismatch or writing fails.
+        """
+        try:
+            logger.debug("Validating that 'input' and 'target' features have same no. of rows...")
+            self._validate_feature_target_shape(features, target)
+            n_rows, chunk_size = features.shape[0], self.data_transformation_config.chunk_size
+            chunks = ((features[start:start + chunk_size], target[start:start + chunk_size]) for start in range(0, n_rows, chunk_size))
+            self.write_transformed_chunks(transform=transform, chunks=chunks, n_rows=n_rows,
+                                          features_file_path=features_file_path, target_file_path=target_file_path)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def fit_preprocessor_incrementally(self, preprocessor:ColumnTransformer, chunks:Iterable[np.ndarray])->ColumnTransformer:
+        """
+        Fits the scaling ColumnTransformer over a stream of encoded chunks.
+
+        The transformer is fitted on the first chunk, which sets up its column selection,
+        and the StandardScaler/MinMaxScaler are then updated with `partial_fit` on every
+        following chunk. The resulting means, variances and ranges are the same as those
+        of a single `fit` on all rows.
+
+        Parameters
+        ----------
+        preprocessor : ColumnTransformer
+            Unfitted scaling step of the preprocessing pipeline.
+        chunks : Iterable[np.ndarray]
+            Consecutive chunks of the encoded training features.
+
+        Returns
         -------
+        ColumnTransformer
+            The fitted preprocessor.
+
+        Raises
+        ------
         MyException
-            If any step in the transformation process fails.
+            If there is no data or fitting fails.
         """
         try:
-            logger.info("Entered 'initiate_data_transformation' method of DataTransformation class...")
-            print("\n" + "-"*80)
-            print("🚀 Starting Data Transformation Component...")
+            chunks = iter(chunks)
+            first_chunk = next(chunks, None)
+            if first_chunk is None:
+                raise ValueError("Cannot fit the preprocessor on an empty training set.")
+            preprocessor.fit(first_chunk)
+            n_rows = len(first_chunk)
+            for chunk in chunks:
+                for _, transformer, columns in preprocessor.transformers_:
+                    if hasattr(transformer, "partial_fit"):
+                        transformer.partial_fit(chunk[:, columns])
+                n_rows += len(chunk)
+            logger.info(f"Scalers fitted incrementally on {n_rows} rows.")
+            return preprocessor
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
 
+    def _iter_feature_target_chunks(self, split:str, columns:Optional[list]=None)->Iterator[Tuple[pd.DataFrame, pd.Series]]:
+        """
+        Streams (input features, target) chunks of an ingested split, with the schema drop columns removed.
+        """
+        for chunk in iter_ingested_split_chunks(self.data_ingestion_artifact, split=split,
+                                                chunk_size=self.data_transformation_config.chunk_size,
+                                                logger=logger, columns=columns):
+            features = self._drop_column(chunk.drop(columns=self._schema_config['target_columns']), columns=self._schema_config['drop_columns'])
+            yield features, chunk[TARGET_COLUMN]
+
+    def _count_split_rows(self, split:str)->int:
+        return sum(len(chunk) for chunk in iter_ingested_split_chunks(self.data_ingestion_artifact, split=split,
+                                                                      chunk_size=self.data_transformation_config.chunk_size,
+                                                                      logger=logger, columns=[TARGET_COLUMN]))
+
+    def transform_in_memory(self)->FusedPreprocessor:
+        """
+        Transforms the train and test sets with both loaded fully into memory and writes
+        the transformed arrays. Returns the fitted preprocessing object.
+        """
+        try:
             logger.debug("Data transformation started...")
-            logger.debug(f"Loading training data from: {self.data_ingestion_artifact.training_data_file_path} \nLoading test data from: {self.data_ingestion_artifact.test_data_file_path}")
-            train_data = read_csv_data(self.data_ingestion_artifact.training_data_file_path,logger=logger)
-            test_data = read_csv_data(self.data_ingestion_artifact.test_data_file_path,logger=logger)
+            logger.debug(f"Loading training and test data from: {self.data_ingestion_artifact}")
+            train_data = read_ingested_split(self.data_ingestion_artifact,split="train",logger=logger)
+            test_data = read_ingested_split(self.data_ingestion_artifact,split="test",logger=logger)
             logger.info("Data Successfully Loaded.")
            
             _dump_categories(train_data, save_file_path=self.data_transformation_config.data_transformation_dump_categories_path,logger=logger) 
@@ -262,57 +447,159 @@ class DataTransformation:
             # Performing Transformation on train data
             logger.debug("Initiating Transformation of training data...")
             train_input_features = self._drop_column(train_input_features, columns=self._schema_config['drop_columns'])
-            train_input_features = self.apply_one_hot_encoding(train_input_features,columns=self._schema_config['categorical_columns'])
-            train_input_features = self._rename_columns(train_input_features)
+            encoder = self.get_categorical_encoder(train_input_features)
+            encoded_train_input_features = encoder.transform(train_input_features)
+            encoded_train_input_features, encoded_train_target_features = self.select_training_fraction(encoded_train_input_features,
+                                                                                                        train_target_features.to_numpy())
 
-       
-            
-            resampled_train_input_features, resampled_train_target_features = self.apply_smoteenn_resampling(train_input_features,train_target_features)
-            print("Columns before fit_transform:", resampled_train_input_features.columns.tolist())
+            resampled_train_input_features, resampled_train_target_features = self.apply_resampling(encoded_train_input_features,encoded_train_target_features)
             
-            preprocessor = self.get_data_transformer_object()
+            scaler = self.get_data_transformer_object(encoder=encoder)
             logger.info("Got the preprocessor object.")
-            scaled_input_features_train_data_arr = preprocessor.fit_transform(resampled_train_input_features)
-            
-            logger.debug("Validating that 'input' and 'target' features have same no. of rows...")
-            self._validate_feature_target_shape(scaled_input_features_train_data_arr,resampled_train_input_features)
-            
-            logger.debug("Concatinating Dependent-Independent training data Features...")
-            train_data_arr = np.c_[scaled_input_features_train_data_arr,np.array(resampled_train_target_features)]
-            logger.info("Concatination of Dependent-Independent training data Features Completed Successfully.")
+            # Encoder is already fitted, only the scalers are fitted on the resampled (encoded) data
+            scaler.fit(resampled_train_input_features)
+            preprocessor = FusedPreprocessor(encoder=encoder, scaler=scaler).fit()
+            self.write_transformed_arrays(transform=preprocessor.scale,
+                                          features=resampled_train_input_features,
+                                          target=resampled_train_target_features,
+                                          features_file_path=self.data_transformation_config.data_transformation_transformed_train_file_path,
+                                          target_file_path=self.data_transformation_config.data_transformation_transformed_train_target_file_path)
             logger.info("Training Data Transfornation Successfully Completed.")
 
            
            # Performing Transformation on test data
             logger.debug("Initiating Transformation of test data...")
-            test_input_features = self._drop_column(test_input_features, columns=self._schema_config['drop_columns'])
-            test_input_features = self.apply_one_hot_encoding(test_input_features,columns=self._schema_config['categorical_columns'])
-            test_input_features = self._rename_columns(test_input_features)
-            print("Columns before transform test_data:", test_input_features.columns.tolist())
+            self.write_transformed_arrays(transform=preprocessor.transform,
+                                          features=test_input_features,
+                                          target=test_target_features,
+                                          features_file_path=self.data_transformation_config.data_transformation_transformed_test_file_path,
+                                          target_file_path=self.data_transformation_config.data_transformation_transformed_test_target_file_path)
+            logger.info("Test Data Transfornation Successfully Completed.")
+            return preprocessor
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
 
-           
-            logger.info("Got the preprocessor object.")
-            scaled_input_features_test_data_arr = preprocessor.transform(test_input_features)
-         
-            logger.debug("Validating that 'input' and 'target' features have same no. of rows...")
-            self._validate_feature_target_shape(scaled_input_features_test_data_arr, test_target_features)
+    def transform_in_chunks(self)->FusedPreprocessor:
+        """
+        Out-of-core variant of `transform_in_memory`: the ingested splits are streamed in
+        chunks of `chunk_size` rows and never loaded as a whole.
+
+        - Pass 1 over the train split fits the categorical encoder (`partial_fit`), counts
+          the rows and collects the category dump.
+        - Pass 2 encodes the train split into a float32 memory-mapped scratch file.
+        - The resampler consumes the memory-mapped encoded data. With "none"/"class_weight"
+          nothing is materialized; the SMOTE based strategies still hold the resampled set.
+        - The scalers are fitted incrementally over chunks of the (resampled) data, which is
+          then transformed chunk by chunk into the final memory-mapped arrays.
+        - The test split is streamed through the full preprocessor.
+
+        Returns the fitted preprocessing object.
+        """
+        try:
+            config = self.data_transformation_config
+            logger.debug(f"Chunked data transformation started (chunk size: {config.chunk_size})...")
+            encoder = CategoricalEncoder(columns=self._schema_config['categorical_columns'])
+            n_train_rows, region_codes, policy_channels = 0, set(), set()
+            for features, _ in self._iter_feature_target_chunks(split="train"):
+                encoder.partial_fit(features)
+                n_train_rows += len(features)
+                region_codes.update(features["Region_Code"].dropna().unique().tolist())
+                policy_channels.update(features["Policy_Sales_Channel"].dropna().unique().tolist())
+            logger.info(f"Encoder fitted on {n_train_rows} streamed rows. Encoded feature names: {encoder.get_feature_names_out().tolist()}")
+            _dump_categories(pd.concat([pd.Series(sorted(region_codes), name="Region_Code"),
+                                        pd.Series(sorted(policy_channels), name="Policy_Sales_Channel")], axis=1),
+                             save_file_path=config.data_transformation_dump_categories_path, logger=logger)
+
+            logger.debug("Encoding training data in chunks...")
+            self.write_transformed_chunks(transform=encoder.transform, chunks=self._iter_feature_target_chunks(split="train"), n_rows=n_train_rows,
+                                          features_file_path=config.data_transformation_encoded_train_file_path,
+                                          target_file_path=config.data_transformation_encoded_train_target_file_path)
+            encoded_train_input_features = load_numpy_array(config.data_transformation_encoded_train_file_path, logger=logger, mmap_mode="r")
+            encoded_train_target_features = load_numpy_array(config.data_transformation_encoded_train_target_file_path, logger=logger, mmap_mode="r")
+            encoded_train_input_features, encoded_train_target_features = self.select_training_fraction(
+                encoded_train_input_features, encoded_train_target_features,
+                features_file_path=config.data_transformation_encoded_train_file_path,
+                target_file_path=config.data_transformation_encoded_train_target_file_path)
+            resampled_train_input_features, resampled_train_target_features = self.apply_resampling(encoded_train_input_features, encoded_train_target_features)
+
+            scaler = self.get_data_transformer_object(encoder=encoder)
+            n_rows = resampled_train_input_features.shape[0]
+            self.fit_preprocessor_incrementally(scaler, chunks=(resampled_train_input_features[start:start + config.chunk_size]
+                                                                for start in range(0, n_rows, config.chunk_size)))
+            preprocessor = FusedPreprocessor(encoder=encoder, scaler=scaler).fit()
+            self.write_transformed_arrays(transform=preprocessor.scale,
+                                          features=resampled_train_input_features,
+                                          target=resampled_train_target_features,
+                                          features_file_path=config.data_transformation_transformed_train_file_path,
+                                          target_file_path=config.data_transformation_transformed_train_target_file_path)
+            logger.info("Training Data Transfornation Successfully Completed.")
 
-            logger.debug("Concatinating Dependent-Independent test data Features...")
-            test_data_arr = np.c_[scaled_input_features_test_data_arr,np.array(test_target_features)]
-            logger.info("Concatination of Dependent-Independent test data Features Completed Successfully.")
+            # The encoded scratch files are only needed until the final training arrays are written
+            del encoded_train_input_features, encoded_train_target_features, resampled_train_input_features, resampled_train_target_features
+            os.remove(config.data_transformation_encoded_train_file_path)
+            os.remove(config.data_transformation_encoded_train_target_file_path)
+
+            logger.debug("Transforming test data in chunks...")
+            self.write_transformed_chunks(transform=preprocessor.transform, chunks=self._iter_feature_target_chunks(split="test"),
+                                          n_rows=self._count_split_rows(split="test"),
+                                          features_file_path=config.data_transformation_transformed_test_file_path,
+                                          target_file_path=config.data_transformation_transformed_test_target_file_path)
             logger.info("Test Data Transfornation Successfully Completed.")
+            return preprocessor
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def initiate_data_transformation(self)->DataTransformationArtifact:
+        """
+        Executes the full data transformation process:
+        - Reads training and test data from ingestion artifacts, either fully into memory or
+          streamed in chunks (`transformation_mode` "in_memory" or "chunked").
+        - Splits data into input features and target column.
+        - Drops unnecessary columns as defined in schema.
+        - Fits the categorical encoder on training data and one-hot encodes categorical variables.
+        - Optionally records a learning curve over stratified fractions of the encoded training data and
+          keeps only the recommended fraction (`learning_curve` section of the model YAML).
+        - Applies the configured class-imbalance strategy (SMOTEENN by default) on training data.
+        - Scales both train and test input features with StandardScaler + MinMaxScaler. The encoder and
+          the fitted scalers are saved as one FusedPreprocessor that maps raw records to the model matrix.
+        - Validates shape consistency between features and target for both sets.
+        - Writes features and labels of both sets to separate float32 memory-mapped `.npy` files.
+        - Saves the transformer object.
+
+        Returns:
+        --------
+        DataTransformationArtifact
+            Contains paths to the preprocessor object and the transformed train and test feature/label NumPy files.
+
+        Raises:
+        -------
+        MyException
+            If any step in the transformation process fails.
+        """
+        try:
+            logger.info("Entered 'initiate_data_transformation' method of DataTransformation class...")
+            print("\n" + "-"*80)
+            print("🚀 Starting Data Transformation Component...")
+
+            mode = self.data_transformation_config.transformation_mode
+            if mode not in TRANSFORMATION_MODES:
+                raise ValueError(f"Unknown transformation mode '{mode}', expected one of {TRANSFORMATION_MODES}")
+            preprocessor = self.transform_in_chunks() if mode == "chunked" else self.transform_in_memory()
             
-            logger.debug("Saving transformed data and objects...")
+            logger.debug("Saving preprocessing object...")
             save_object(self.data_transformation_config.data_transformation_transformed_object_file_path,obj=preprocessor,logger=logger)
-            save_numpy_array(self.data_transformation_config.data_transformation_transformed_train_file_path,array=train_data_arr,logger=logger)
-            save_numpy_array(self.data_transformation_config.data_transformation_transformed_test_file_path,array=test_data_arr,logger=logger)
             logger.info("Files Saved Successfully.")
 
             return DataTransformationArtifact(
                 data_transformation_transformed_object_file_path = self.data_transformation_config.data_transformation_transformed_object_file_path,
                 data_transformation_transformed_train_file_path = self.data_transformation_config.data_transformation_transformed_train_file_path,
                 data_transformation_transformed_test_file_path = self.data_transformation_config.data_transformation_transformed_test_file_path,
-                data_transformation_categories_json_path= self.data_transformation_config.data_transformation_dump_categories_path 
+                data_transformation_transformed_train_target_file_path = self.data_transformation_config.data_transformation_transformed_train_target_file_path,
+                data_transformation_transformed_test_target_file_path = self.data_transformation_config.data_transformation_transformed_test_target_file_path,
+                data_transformation_categories_json_path= self.data_transformation_config.data_transformation_dump_categories_path,
+                imbalance_strategy=self.data_transformation_config.imbalance_strategy,
+                training_fraction=self.training_fraction,
+                learning_curve_file_path=self.learning_curve_file_path
             )
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
\ No newline at end of file
@@ -1,21 +1,32 @@
+import os
 import sys
+import json
+import time
 import numpy as np
-from typing import Tuple
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, precision_score, f1_score, recall_score
+from typing import Tuple, Optional, Callable
+from sklearn.base import ClassifierMixin
 from src.Exception import MyException
 from src.Logger import configure_logger
 from src.Constants import __file__ as constant_file_path
 from src.Entity.Config_Entity import ModelTrainerConfig
-from src.Entity.Artifact_Entity import DataTransformationArtifact, ClassificationMetricArtifact, ModelTrainerArtifact
+from src.Entity.Artifact_Entity import DataTransformationArtifact, DataValidationArtifact, ClassificationMetricArtifact, ModelTrainerArtifact
 from src.Entity.Estimator import MyModel
-from src.Utils.Main_Utils import load_numpy_array, load_object, save_object, update_expected_accuracy_in_constants
+from src.Entity.Preprocessor import FusedPreprocessor
+from src.Entity.Model_Families import get_model_family, get_model_params, build_model, ensemble_size, fit_weights
+from src.Entity.Segmented_Model import SegmentedModel, segment_columns
+from src.Entity.S3_Estimator import Current_S3_Vehicle_Insurance_Estimator
+from src.Utils.Metric_Utils import evaluate_in_chunks
+from src.Utils.Main_Utils import load_numpy_array, load_object, save_object, read_yaml, update_expected_accuracy_in_constants
+from src.Utils.Hyperparameter_Search import HyperparameterSearch, SCORERS
+from src.Utils.Learning_Curve import stratified_sample_indices
+from src.Utils.Distributed_Training import DistributedForestTrainer
 
 logger = configure_logger(logger_name=__name__, level="DEBUG", to_console=True, to_file=True, log_file_name=__name__)
 
 
 class ModelTrainer:
-    def __init__(self,data_transformation_artifact:DataTransformationArtifact, model_trainer_config:ModelTrainerConfig):
+    def __init__(self,data_transformation_artifact:DataTransformationArtifact, model_trainer_config:ModelTrainerConfig,
+                 data_validation_artifact:Optional[DataValidationArtifact]=None):
         """
         Constructor to initialize ModelTrainer class
 
@@ -25,6 +36,8 @@ class ModelTrainer:
             Object containing paths to transformed training and testing data and preprocessor
         model_trainer_config : ModelTrainerConfig
             Configuration parameters for model training such as hyperparameters and output paths
+        data_validation_artifact : Optional[DataValidationArtifact]
+            Validation result of the training data, its drift flag decides whether warm start is allowed
 
         Raises
         ------
@@ -34,26 +47,174 @@ class ModelTrainer:
         try:
             self.data_transformation_artifact = data_transformation_artifact
             self.model_trainer_config = model_trainer_config
+            self.data_validation_artifact = data_validation_artifact
             self._model_yaml = model_trainer_config.model_config_yaml_file_path
+            self._model_config = (read_yaml(self._model_yaml, logger=logger) or {}) if os.path.exists(self._model_yaml) else {}
+            if not self._model_config:
+                logger.warning(f"No model config found at '{self._model_yaml}', using the default hyperparameters.")
+            self.model_name = (self._model_config.get("model") or {}).get("name") or model_trainer_config._model_name
+            self.model_family = get_model_family(self.model_name)
+            self._segment_config = self._model_config.get("segments") or {}
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e    
 
 
-    def train_model(self, train_data:np.array, test_data:np.array) ->Tuple[RandomForestClassifier, ClassificationMetricArtifact]:
+    def get_model_params(self) -> dict:
         """
-        Trains a RandomForestClassifier model and evaluates its performance.
+        Returns the hyperparameters of the configured model family: the `model.params.<name>`
+        section of the model YAML on top of the family defaults (the MODEL_TRAINER constants
+        for the random forest).
+        """
+        defaults = {"random_state": self.model_trainer_config._random_state}
+        if self.model_name == "random_forest":
+            defaults.update({"n_estimators": self.model_trainer_config._n_estimators,
+                             "criterion": self.model_trainer_config._criterion,
+                             "min_samples_split": self.model_trainer_config._min_samples_split,
+                             "min_samples_leaf": self.model_trainer_config._min_samples_leaf,
+                             "max_depth": self.model_trainer_config._max_depth})
+        return get_model_params(self._model_config, self.model_name, defaults=defaults)
+
+    def _sample_weight(self) -> Optional[np.ndarray]:
+        # Multiplicity of every training row when duplicate rows were compacted, see src/Utils/Compaction_Utils.py
+        sample_weight_file_path = self.data_transformation_artifact.data_transformation_sample_weight_file_path
+        return load_numpy_array(sample_weight_file_path, logger=logger, mmap_mode="r") if sample_weight_file_path else None
+
+    def _class_weight(self) -> Optional[str]:
+        # Imbalance left to the model instead of resampling the data
+        return "balanced" if self.data_transformation_artifact.imbalance_strategy == "class_weight" else None
+
+    def search_hyperparameters(self) -> Optional[dict]:
+        """
+        Runs the hyperparameter search configured in the `search` section of the model YAML
+        (successive halving or Hyperband over a process pool, see `HyperparameterSearch`) and
+        writes the leaderboard of all trials to `model_trainer_leaderboard_file_path`.
+
+        Returns
+        -------
+        Optional[dict]
+            Best hyperparameters, None if the search is disabled.
+        """
+        try:
+            search_config = self._model_config.get("search") or {}
+            if not search_config.get("enabled", False):
+                return None
+            logger.info(f"Running '{search_config.get('strategy', 'successive_halving')}' hyperparameter search for '{self.model_name}'...")
+            search = HyperparameterSearch(x_file_path=self.data_transformation_artifact.data_transformation_transformed_train_file_path,
+                                          y_file_path=self.data_transformation_artifact.data_transformation_transformed_train_target_file_path,
+                                          w_file_path=self.data_transformation_artifact.data_transformation_sample_weight_file_path,
+                                          search_config={**search_config, "space": (search_config.get("space") or {}).get(self.model_name) or {}},
+                                          base_params={**self.get_model_params(), "class_weight": self._class_weight()},
+                                          model_name=self.model_name,
+                                          random_state=self.model_trainer_config._random_state,
+                                          logger=logger)
+            best_params, leaderboard = search.run()
+            os.makedirs(os.path.dirname(self.model_trainer_config.model_trainer_leaderboard_file_path), exist_ok=True)
+            with open(self.model_trainer_config.model_trainer_leaderboard_file_path, "w") as leaderboard_file:
+                json.dump({"model_name": self.model_name, "strategy": search.strategy, "scoring": search.scoring,
+                           "budget_param": search.budget_param, "best_params": best_params, "trials": leaderboard},
+                          leaderboard_file, indent=2, default=str)
+            logger.info(f"Leaderboard of {len(leaderboard)} trials saved at: {self.model_trainer_config.model_trainer_leaderboard_file_path}")
+            best_params.pop("class_weight", None)
+            return {**best_params, search.budget_param: search.max_resource}
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def _warm_start_requested(self) -> bool:
+        # drift_detected is None when there was no reference profile to compare against, that is no evidence of stability
+        return (self.model_trainer_config.warm_start and self.model_family.supports_warm_start and self.data_validation_artifact is not None
+                and self.data_validation_artifact.drift_detected is False and not self._segment_config.get("enabled", False))
+
+    def _production_estimator(self) -> Current_S3_Vehicle_Insurance_Estimator:
+        return Current_S3_Vehicle_Insurance_Estimator(bucket_name=self.model_trainer_config.bucket_name,
+                                                      model_s3_key=self.model_trainer_config.s3_model_key_path,
+                                                      logger=logger)
+
+    def warm_start_base_version(self) -> Optional[str]:
+        """
+        Returns the version (S3 ETag) of the production model a warm start would build on,
+        or None when this run trains from scratch. Used to key cached training results.
+        """
+        if not self._warm_start_requested():
+            return None
+        try:
+            estimator = self._production_estimator()
+            if not estimator.is_model_present(model_path=self.model_trainer_config.s3_model_key_path):
+                return None
+            return estimator.get_model_version()
+        except Exception as e:
+            logger.warning(f"Could not look up the production model version: {e}")
+            return None
+
+    def get_warm_start_model(self, preprocessing_obj:FusedPreprocessor) -> Optional[MyModel]:
+        """
+        Loads the production model to warm start from, if warm start is enabled, the configured
+        model family supports it (random forest only), the validation stage detected no drift
+        and the production model is a compatible forest of the same family that has
+        not yet reached `warm_start_max_estimators` trees. Otherwise returns None (full retrain).
 
         Parameters
         ----------
-        train_data : np.ndarray
-            Combined array of training features and target (last column is target)
-        test_data : np.ndarray
-            Combined array of testing features and target (last column is target)
+        preprocessing_obj : FusedPreprocessor
+            Preprocessor of this run, the production model must produce the same features.
 
         Returns
         -------
-        Tuple[RandomForestClassifier, ClassificationMetricArtifact]
-            Trained RandomForestClassifier and evaluation metrics
+        Optional[MyModel]
+            The production model, or None.
+        """
+        if not self._warm_start_requested():
+            return None
+        try:
+            estimator = self._production_estimator()
+            if not estimator.is_model_present(model_path=self.model_trainer_config.s3_model_key_path):
+                logger.info("No production model to warm start from, training from scratch.")
+                return None
+            production_model = estimator.load_model()
+            forest, production_preprocessor = production_model.trained_model_object, production_model.preprocessing_object
+            if not isinstance(forest, self.model_family.estimator) or not isinstance(production_preprocessor, FusedPreprocessor) \
+                    or list(production_preprocessor.get_feature_names_out()) != list(preprocessing_obj.get_feature_names_out()):
+                logger.info("Production model is not compatible with this run's features, training from scratch.")
+                return None
+            if len(forest.estimators_) + self.model_trainer_config.warm_start_n_estimators > self.model_trainer_config.warm_start_max_estimators:
+                logger.info(f"Production forest has {len(forest.estimators_)} trees, retraining from scratch to keep it bounded.")
+                return None
+            logger.info(f"No drift detected, warm starting from the production forest ({len(forest.estimators_)} trees).")
+            return production_model
+        except Exception as e:
+            # Warm start is only a shortcut, a failure to load the base model falls back to a full retrain
+            logger.warning(f"Could not load the production model for warm start, training from scratch: {e}")
+            return None
+
+    def train_model(self, x_train:np.ndarray, y_train:np.ndarray, x_test:np.ndarray, y_test:np.ndarray,
+                    base_model:Optional[ClassifierMixin]=None, params:Optional[dict]=None,
+                    sample_weight:Optional[np.ndarray]=None) ->Tuple[ClassifierMixin, ClassificationMetricArtifact]:
+        """
+        Trains a model of the configured family (`model.name` in the model YAML) and evaluates its performance.
+
+        Random forest trees are built on `_n_jobs` cores. With a `base_model` (warm start) its trees are
+        kept and `warm_start_n_estimators` new trees are fitted on the given data.
+
+        Parameters
+        ----------
+        x_train : np.ndarray
+            Training features (may be a read-only memory-mapped float32 array)
+        y_train : np.ndarray
+            Training target
+        x_test : np.ndarray
+            Testing features
+        y_test : np.ndarray
+            Testing target
+        base_model : Optional[ClassifierMixin]
+            Fitted forest to add trees to, trained from scratch if None
+        params : Optional[dict]
+            Hyperparameters overriding `get_model_params()`, e.g. the result of the search
+        sample_weight : Optional[np.ndarray]
+            Weight of every training row, e.g. its multiplicity after duplicate compaction
+
+        Returns
+        -------
+        Tuple[ClassifierMixin, ClassificationMetricArtifact]
+            Trained model and evaluation metrics
 
         Raises
         ------
@@ -63,47 +224,242 @@ class ModelTrainer:
         try:
             logger.debug("Entered the train_model function of ModelTrainer Class...")
 
-            # Splitting data in independent and dependent features
-            x_train, y_train, x_test, y_test = train_data[:,:-1], train_data[:,-1], test_data[:,:-1], test_data[:,-1] 
-            
-            logger.debug("Initializig RandomForestClassifier with specified parameters...")
-            model = RandomForestClassifier(n_estimators=self.model_trainer_config._n_estimators,
-                                         criterion=self.model_trainer_config._criterion,
-                                         min_samples_split=self.model_trainer_config._min_samples_split,
-                                         min_samples_leaf=self.model_trainer_config._min_samples_leaf,
-                                         max_depth=self.model_trainer_config._max_depth,
-                                         random_state=self.model_trainer_config._random_state)
+            # With compaction weights "balanced" is applied to the weighted class counts
+            class_weight, sample_weight = fit_weights(self._class_weight(), y_train, sample_weight)
+            if base_model is not None:
+                logger.debug(f"Adding {self.model_trainer_config.warm_start_n_estimators} trees to the {len(base_model.estimators_)} of the base forest...")
+                model = base_model
+                model.set_params(warm_start=True,
+                                 n_estimators=len(base_model.estimators_) + self.model_trainer_config.warm_start_n_estimators,
+                                 n_jobs=self.model_trainer_config._n_jobs,
+                                 class_weight=class_weight)
+            else:
+                logger.debug(f"Initializig '{self.model_name}' model with specified parameters...")
+                model = build_model(self.model_name, {**self.get_model_params(), **(params or {})},
+                                    n_jobs=self.model_trainer_config._n_jobs,
+                                    class_weight=class_weight)
 
             # Fit the model
             logger.debug("Training the model on the given train data...")
-            model.fit(x_train, y_train)
-            logger.info("Model training completed.")
+            model.fit(x_train, y_train, sample_weight=sample_weight)
+            logger.info(f"Model training completed ({ensemble_size(model)} {self.model_family.budget_param}).")
+            return model, self.evaluate_model(model, x_test=x_test, y_test=y_test)
+    
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e    
 
-              # Predictions and evaluation metrics
+    def evaluate_model(self, model:ClassifierMixin, x_test:np.ndarray, y_test:np.ndarray) ->ClassificationMetricArtifact:
+        """
+        Computes accuracy, F1, precision and recall of a fitted model on the test data, predicting it in
+        chunks of `evaluation_chunk_size` rows into one confusion matrix (see `evaluate_in_chunks`).
+        """
+        try:
             logger.debug("Evaluating Model's Performance...")
-            y_pred = model.predict(x_test)
-            accuracy = accuracy_score(y_test, y_pred)
-            f1 = f1_score(y_test, y_pred)
-            precision = precision_score(y_test, y_pred)
-            recall = recall_score(y_test, y_pred)
-            logger.info("Model Performance Calculated.")
+            confusion_matrix = evaluate_in_chunks(model.predict, x_test, y_test, chunk_size=self.model_trainer_config.evaluation_chunk_size,
+                                                  n_jobs=self.model_trainer_config.evaluation_n_jobs)
+            logger.info(f"Model Performance Calculated, confusion matrix: {confusion_matrix.matrix.tolist()}")
 
             # Creating metric artifact
-            classification_metric_artifact = ClassificationMetricArtifact(accuracy_score=accuracy, 
-                                                                          f1_score=f1, 
-                                                                          precision_score=precision,
-                                                                          recall_score=recall)
-            return model, classification_metric_artifact
-    
+            return confusion_matrix.metric_artifact()
         except Exception as e:
-            raise MyException(error_message=e, error_detail=sys, logger=logger) from e    
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def train_model_segmented(self, x_train:np.ndarray, y_train:np.ndarray, x_test:np.ndarray, y_test:np.ndarray,
+                              preprocessing_obj:FusedPreprocessor, params:Optional[dict]=None,
+                              sample_weight:Optional[np.ndarray]=None) ->Tuple[SegmentedModel, ClassificationMetricArtifact]:
+        """
+        Trains one model of the configured family per segment of the `segments` keys in the model
+        YAML, concurrently in a process pool, and evaluates the routed bundle (see `SegmentedModel`).
+
+        Parameters
+        ----------
+        x_train, y_train : np.ndarray
+            Transformed training features and labels
+        x_test, y_test : np.ndarray
+            Transformed test features and labels
+        preprocessing_obj : FusedPreprocessor
+            Preprocessor of this run, locates the segment keys in the model matrix
+        params : Optional[dict]
+            Hyperparameters overriding `get_model_params()`, e.g. the result of the search
+        sample_weight : Optional[np.ndarray]
+            Weight of every training row, e.g. its multiplicity after duplicate compaction
+
+        Returns
+        -------
+        Tuple[SegmentedModel, ClassificationMetricArtifact]
+            Fitted bundle of segment models and its metrics on the test data
+        """
+        try:
+            config = self._segment_config
+            key_columns = segment_columns(preprocessing_obj.get_feature_names_out(), keys=config.get("keys") or [],
+                                          categorical_columns=preprocessing_obj.encoder.columns)
+            segment_params = ((config.get("params") or {}).get(self.model_name)) or {}
+            model = SegmentedModel(model_name=self.model_name, params={**self.get_model_params(), **(params or {}), **segment_params},
+                                   key_columns=key_columns, min_segment_rows=int(config.get("min_segment_rows", 1000)),
+                                   class_weight=self._class_weight(), n_jobs=int(config.get("n_jobs", -1)))
+            logger.debug(f"Training '{self.model_name}' per segment of {config.get('keys')}...")
+            model.fit(x_train, y_train, sample_weight=sample_weight)
+            logger.info(f"Trained {len(model.segment_models_)} segment models on {model.segment_rows_} rows.")
+            return model, self.evaluate_model(model, x_test=x_test, y_test=y_test)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def train_model_distributed(self, x_test:np.ndarray, y_test:np.ndarray, params:Optional[dict]=None) ->Tuple[ClassifierMixin, ClassificationMetricArtifact]:
+        """
+        Trains the random forest as `distributed_n_tasks` sub-forests through the shared work
+        directory `distributed_work_dir` (see `DistributedForestTrainer`): `distributed_n_workers`
+        local processes, and workers on other hosts that mount the directory, train the sub-forests
+        on the transformed training arrays (all rows or a stratified shard each) and the merged
+        forest is evaluated here. Seeds are derived from `random_state`, so the result is
+        reproducible whichever worker trains which sub-forest.
+
+        Parameters
+        ----------
+        x_test : np.ndarray
+            Testing features
+        y_test : np.ndarray
+            Testing target
+        params : Optional[dict]
+            Hyperparameters overriding `get_model_params()`, e.g. the result of the search
+
+        Returns
+        -------
+        Tuple[ClassifierMixin, ClassificationMetricArtifact]
+            Merged forest and evaluation metrics
+
+        Raises
+        ------
+        MyException
+            If a sub-forest fails or does not finish within `distributed_timeout_seconds`
+        """
+        try:
+            config = self.model_trainer_config
+            trainer = DistributedForestTrainer(x_file_path=self.data_transformation_artifact.data_transformation_transformed_train_file_path,
+                                               y_file_path=self.data_transformation_artifact.data_transformation_transformed_train_target_file_path,
+                                               w_file_path=self.data_transformation_artifact.data_transformation_sample_weight_file_path,
+                                               work_dir=config.distributed_work_dir,
+                                               params={**self.get_model_params(), **(params or {}), "class_weight": self._class_weight()},
+                                               n_tasks=config.distributed_n_tasks,
+                                               n_workers=config.distributed_n_workers,
+                                               data=config.distributed_data,
+                                               timeout_seconds=config.distributed_timeout_seconds,
+                                               lease_seconds=config.distributed_lease_seconds,
+                                               logger=logger)
+            model = trainer.run()
+            model.set_params(n_jobs=config._n_jobs)
+            return model, self.evaluate_model(model, x_test=x_test, y_test=y_test)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def train_model_within_budget(self, x_train:np.ndarray, y_train:np.ndarray, x_test:np.ndarray, y_test:np.ndarray,
+                                  time_budget_seconds:float, base_model:Optional[ClassifierMixin]=None, params:Optional[dict]=None,
+                                  checkpoint:Optional[Callable[[ClassifierMixin], None]]=None,
+                                  sample_weight:Optional[np.ndarray]=None) ->Tuple[ClassifierMixin, ClassificationMetricArtifact, str]:
+        """
+        Anytime variant of `train_model` for model families that support warm start (the random forest).
+
+        The forest grows by `anytime_increment` trees per step. A step is only started when the time
+        left in `time_budget_seconds` covers the duration of the previous step, so the budget is not
+        overrun. Growth also stops after `anytime_patience` steps without a gain of
+        `anytime_min_improvement` in the `anytime_scoring` validation score, or at `anytime_max_estimators`
+        trees. The validation rows are a stratified `anytime_validation_fraction` of the training data,
+        excluded from fitting through a zero sample weight, and are scored incrementally: only the
+        trees of the last step are evaluated. Every time the validation score improves, `checkpoint`
+        is called with the model, so the best model so far is always on disk. The returned model is
+        cut back to the trees of the best step.
+
+        Parameters
+        ----------
+        x_train, y_train, x_test, y_test : np.ndarray
+            Training and testing features and target, as in `train_model`
+        time_budget_seconds : float
+            Wall-clock seconds available for training
+        base_model : Optional[ClassifierMixin]
+            Fitted forest to add trees to (warm start), grown from scratch if None
+        params : Optional[dict]
+            Hyperparameters overriding `get_model_params()`, e.g. the result of the search
+        checkpoint : Optional[Callable[[ClassifierMixin], None]]
+            Called with the model whenever the validation score improves
+        sample_weight : Optional[np.ndarray]
+            Weight of every training row, also weighs the validation score
+
+        Returns
+        -------
+        Tuple[ClassifierMixin, ClassificationMetricArtifact, str]
+            Trained model, test metrics and the reason growth stopped ("time_budget", "plateau" or "max_estimators")
+
+        Raises
+        ------
+        MyException
+            If training or evaluation fails
+        """
+        try:
+            config = self.model_trainer_config
+            start = time.perf_counter()
+            scorer = SCORERS[config.anytime_scoring]
+            validation_indices = stratified_sample_indices(np.asarray(y_train), config.anytime_validation_fraction, random_state=config._random_state)
+            row_weight = np.ones(len(y_train), dtype=np.float64) if sample_weight is None else np.array(sample_weight, dtype=np.float64)
+            validation_weight = row_weight[validation_indices]
+            row_weight[validation_indices] = 0.0
+            class_weight, row_weight = fit_weights(self._class_weight(), y_train, row_weight)
+            x_validation, y_validation = np.asarray(x_train[validation_indices]), np.asarray(y_train[validation_indices])
+            validation_score = lambda proba_sum: scorer(y_validation, model.classes_[np.argmax(proba_sum, axis=1)], sample_weight=validation_weight)
+
+            if base_model is not None:
+                model = base_model
+                model.set_params(warm_start=True, n_jobs=config._n_jobs, class_weight=class_weight)
+                n_trees = len(model.estimators_)
+                proba_sum = model.predict_proba(x_validation) * n_trees
+                best_score = validation_score(proba_sum)
+            else:
+                model = build_model(self.model_name, {**self.get_model_params(), **(params or {})},
+                                    n_jobs=config._n_jobs, class_weight=class_weight)
+                model.set_params(warm_start=True)
+                n_trees, proba_sum, best_score = 0, None, -np.inf
+            best_n_trees, stale_steps, step_seconds, stop_reason = n_trees, 0, 0.0, "max_estimators"
+            logger.info(f"Anytime training with a budget of {time_budget_seconds:.0f}s, starting from {n_trees} trees...")
+
+            while n_trees < config.anytime_max_estimators:
+                if n_trees > 0 and time.perf_counter() - start + step_seconds > time_budget_seconds:
+                    stop_reason = "time_budget"
+                    break
+                step_start = time.perf_counter()
+                model.set_params(n_estimators=min(n_trees + config.anytime_increment, config.anytime_max_estimators))
+                model.fit(x_train, y_train, sample_weight=row_weight)
+                step_proba = sum(tree.predict_proba(x_validation) for tree in model.estimators_[n_trees:])
+                proba_sum = step_proba if proba_sum is None else proba_sum + step_proba
+                n_trees = len(model.estimators_)
+                step_seconds = time.perf_counter() - step_start
+                score = validation_score(proba_sum)
+                logger.debug(f"{n_trees} trees: validation {config.anytime_scoring}={score:.4f} ({step_seconds:.1f}s per step)")
+
+                stale_steps = 0 if score > best_score + config.anytime_min_improvement else stale_steps + 1
+                if score > best_score:
+                    best_score, best_n_trees = score, n_trees
+                    if checkpoint is not None:
+                        checkpoint(model)
+                if stale_steps >= config.anytime_patience:
+                    stop_reason = "plateau"
+                    break
+
+            if best_n_trees < n_trees:
+                model.estimators_ = model.estimators_[:best_n_trees]
+                model.set_params(n_estimators=best_n_trees)
+            logger.info(f"Anytime training stopped ({stop_reason}) after {time.perf_counter() - start:.1f}s, "
+                        f"keeping {best_n_trees} trees with validation {config.anytime_scoring}={best_score:.4f}.")
+            return model, self.evaluate_model(model, x_test=x_test, y_test=y_test), stop_reason
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
 
     
     def initiate_model_trainer(self) -> ModelTrainerArtifact:
         """
         Initiates the model training process:
         - Loads preprocessed training and test data
-        - Trains a RandomForestClassifier
+        - Optionally searches hyperparameters (Config/Model.yaml `search` section) and writes a leaderboard
+        - Trains the configured model family (or adds trees to the production forest when warm starting),
+          within `time_budget_seconds` (anytime training) when a budget is set, or as merged sub-forests
+          trained by distributed workers when `distributed` is set
         - Validates model performance against threshold
         - Saves the model wrapped with preprocessing pipeline
         - Returns artifact containing trained model path and evaluation metrics
@@ -120,13 +476,16 @@ class ModelTrainer:
         """
         try:
             logger.info("Entered initiate_model_trainer method of ModelTrainer class...")
+            start = time.perf_counter()
             print("\n" + "-"*80)
             print("🚀 Starting Model Trainer Component...")
 
-            # Load transformed train and test data
+            # Memory-map transformed train and test data (float32, read straight from the page cache)
             logger.debug("Loading transformed data...")
-            train_arr = load_numpy_array(file_path=self.data_transformation_artifact.data_transformation_transformed_train_file_path,logger=logger)
-            test_arr = load_numpy_array(file_path=self.data_transformation_artifact.data_transformation_transformed_test_file_path,logger=logger)
+            x_train = load_numpy_array(file_path=self.data_transformation_artifact.data_transformation_transformed_train_file_path,logger=logger,mmap_mode="r")
+            y_train = load_numpy_array(file_path=self.data_transformation_artifact.data_transformation_transformed_train_target_file_path,logger=logger,mmap_mode="r")
+            x_test = load_numpy_array(file_path=self.data_transformation_artifact.data_transformation_transformed_test_file_path,logger=logger,mmap_mode="r")
+            y_test = load_numpy_array(file_path=self.data_transformation_artifact.data_transformation_transformed_test_target_file_path,logger=logger,mmap_mode="r")
             logger.info("Data Loaded Successfully.")
 
             # Load Preprocessing object
@@ -134,7 +493,44 @@ class ModelTrainer:
             preprocessing_obj = load_object(file_path=self.data_transformation_artifact.data_transformation_transformed_object_file_path,logger=logger)
             logger.info("Object Loaded Succeessfully.")
 
-            trained_model, classification_report = self.train_model(train_data=train_arr, test_data=test_arr)
+            base_model = self.get_warm_start_model(preprocessing_obj)
+            # The base forest fixes the hyperparameters of a warm start, a search only runs for full retrains
+            best_params = self.search_hyperparameters() if base_model is None else None
+            if base_model is not None:
+                # The base forest was trained in the production model's feature scaling, which is kept with it
+                x_train = base_model.preprocessing_object.convert(x_train, source=preprocessing_obj)
+                x_test = base_model.preprocessing_object.convert(x_test, source=preprocessing_obj)
+                preprocessing_obj = base_model.preprocessing_object
+
+            time_budget_seconds = self.model_trainer_config.time_budget_seconds
+            segmented = self._segment_config.get("enabled", False)
+            if time_budget_seconds is not None and not self.model_family.supports_warm_start:
+                logger.warning(f"Time budget ignored, '{self.model_name}' cannot grow incrementally (it stops early on its own validation split).")
+                time_budget_seconds = None
+            elif time_budget_seconds is not None and segmented:
+                logger.warning("Time budget ignored, segment models are trained to their configured size.")
+                time_budget_seconds = None
+            stop_reason = None
+            if time_budget_seconds is not None:
+                # The search and data loading count against the budget, the best model so far is checkpointed as it grows
+                checkpoint = lambda model: save_object(self.model_trainer_config.model_trainer_trained_model_file_path,
+                                                       MyModel(preprocessing_object=preprocessing_obj, trained_model_object=model, logger=logger),
+                                                       logger=logger)
+                trained_model, classification_report, stop_reason = self.train_model_within_budget(
+                    x_train=x_train, y_train=y_train, x_test=x_test, y_test=y_test,
+                    time_budget_seconds=time_budget_seconds - (time.perf_counter() - start),
+                    base_model=base_model.trained_model_object if base_model is not None else None,
+                    params=best_params, checkpoint=checkpoint, sample_weight=self._sample_weight())
+            elif segmented:
+                trained_model, classification_report = self.train_model_segmented(x_train=x_train, y_train=y_train, x_test=x_test, y_test=y_test,
+                                                                                  preprocessing_obj=preprocessing_obj, params=best_params,
+                                                                                  sample_weight=self._sample_weight())
+            elif self.model_trainer_config.distributed and base_model is None and self.model_name == "random_forest":
+                trained_model, classification_report = self.train_model_distributed(x_test=x_test, y_test=y_test, params=best_params)
+            else:
+                trained_model, classification_report = self.train_model(x_train=x_train, y_train=y_train, x_test=x_test, y_test=y_test,
+                                                                        base_model=base_model.trained_model_object if base_model is not None else None,
+                                                                        params=best_params, sample_weight=self._sample_weight())
 
             # Check if the model's accuracy meets the expected threshold
             if classification_report.accuracy_score < self.model_trainer_config.model_trainer_expected_accuracy:
@@ -154,8 +550,15 @@ class ModelTrainer:
             # Create and return the ModelTrainerArtifact
             model_trainer_artifact = ModelTrainerArtifact(
                 trained_model_file_path= self.model_trainer_config.model_trainer_trained_model_file_path,
-                metric_artifact=classification_report
-            
+                metric_artifact=classification_report,
+                model_name=self.model_name,
+                n_estimators=ensemble_size(trained_model),
+                warm_started=base_model is not None,
+                leaderboard_file_path=self.model_trainer_config.model_trainer_leaderboard_file_path if best_params is not None else None,
+                training_seconds=time.perf_counter() - start,
+                time_budget_seconds=time_budget_seconds,
+                stop_reason=stop_reason,
+                n_segments=len(trained_model.segment_models_) if segmented else None
             )
 
             logger.info(f"Model trainer artifact: {model_trainer_artifact}")
@@ -1,12 +1,22 @@
+import os
 import sys
+import json
+import dataclasses
+import pandas as pd
+from typing import Optional, List, Callable
 from dataclasses import dataclass
-from sklearn.metrics import accuracy_score
-from src.Utils.Main_Utils import load_numpy_array, load_object
+from numpy import ndarray
+from pandas import DataFrame
+from src.Utils.Main_Utils import iter_ingested_split_chunks, load_object
+from src.Utils.Inference_Benchmark import benchmark_model_file, benchmark_model_files, inference_regressions
+from src.Utils.Metric_Utils import ConfusionMatrixAccumulator
 from src.Logger import configure_logger
 from src.Exception import MyException
 from src.Entity.Config_Entity import ModelEvaluationConfig
-from src.Entity.Artifact_Entity import DataTransformationArtifact, ModelTrainerArtifact, ModelEvaluationArtifact
+from src.Entity.Artifact_Entity import DataIngestionArtifact, DataTransformationArtifact, ModelTrainerArtifact, ModelEvaluationArtifact, InferenceBenchmarkArtifact
+from src.Constants import TARGET_COLUMN
 from src.Entity.S3_Estimator import Current_S3_Vehicle_Insurance_Estimator
+from src.Entity.Preprocessor import FusedPreprocessor
 
 logger = configure_logger(logger_name=__name__, level="DEBUG", to_console=True, to_file=True, log_file_name=__name__)
 
@@ -16,19 +26,25 @@ class EvaluateModelResponse:
     curr_S3_Production_model_accuracy_score: float
     is_model_accepted: bool
     difference_in_accuracy: float
+    trained_model_benchmark: Optional[InferenceBenchmarkArtifact] = None
+    production_model_benchmark: Optional[InferenceBenchmarkArtifact] = None
+    rejection_reasons: Optional[List[str]] = None
 
     def __str__(self):
         return (f"Trained Accuracy: {self.trained_model_accuracy_score}, "
                 f"Production Accuracy: {self.curr_S3_Production_model_accuracy_score}, "
                 f"Accepted: {self.is_model_accepted}, "
-                f"Accuracy Difference: {self.difference_in_accuracy}")
+                f"Accuracy Difference: {self.difference_in_accuracy}, "
+                f"Rejection Reasons: {self.rejection_reasons}")
 
 
 
 class ModelEvaluation:
-    def __init__(self,model_evaluation_config:ModelEvaluationConfig, data_transformation_artifact:DataTransformationArtifact, model_trainer_artifact:ModelTrainerArtifact):
+    def __init__(self,model_evaluation_config:ModelEvaluationConfig, data_ingestion_artifact:DataIngestionArtifact,
+                 data_transformation_artifact:DataTransformationArtifact, model_trainer_artifact:ModelTrainerArtifact):
         try:
             self.model_eval_config = model_evaluation_config
+            self.data_ingestion_artifact = data_ingestion_artifact
             self.data_transformation_artifact = data_transformation_artifact
             self.model_trainer_artifact = model_trainer_artifact
         except Exception as e:
@@ -57,43 +73,167 @@ class ModelEvaluation:
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
         
+    def get_production_scorer(self, curr_s3_model:Current_S3_Vehicle_Insurance_Estimator) -> Optional[Callable[[DataFrame], ndarray]]:
+        """
+        Method Name :   get_production_scorer
+        Description :   Returns a function scoring raw test records with the production model.
+                        A production model pushed with a `FusedPreprocessor` scores them itself.
+                        Older models have a scaling-only preprocessing object expecting the
+                        one-hot encoded columns (`Vehicle_Age_lt_1_Year`, ...): they are scored
+                        through this run's categorical encoder, whose output has the same
+                        column names, if it provides every column the old scaler expects.
+                        When neither works the production model cannot be scored on this
+                        run's data and is treated as absent.
+
+        Output      :   Returns the scoring function, or None
+        """
+        try:
+            production_model = curr_s3_model.loaded_model = curr_s3_model.load_model()
+            chunk_size = self.model_eval_config.prediction_chunk_size
+            production_preprocessor = production_model.preprocessing_object
+            if isinstance(production_preprocessor, FusedPreprocessor):
+                return lambda records: production_model.predict_batch(records=records, chunk_size=chunk_size)
+
+            encoder = load_object(self.data_transformation_artifact.data_transformation_transformed_object_file_path, logger=logger).encoder
+            encoded_columns = list(encoder.get_feature_names_out())
+            expected_columns = getattr(production_preprocessor, "feature_names_in_", None)
+            if expected_columns is None or set(expected_columns) - set(encoded_columns):
+                logger.warning(f"Legacy production model expects columns {expected_columns} this run does not produce, treating it as absent.")
+                return None
+
+            def score_legacy(records: DataFrame) -> ndarray:
+                encoded = DataFrame(encoder.transform(records), columns=encoded_columns)
+                return production_model.trained_model_object.predict(production_preprocessor.transform(encoded))
+
+            logger.info("Production model has a legacy preprocessing object, scoring it through this run's categorical encoder.")
+            return score_legacy
+        except Exception as e:
+            logger.warning(f"Production model cannot score this run's test records, treating it as absent: {e}")
+            return None
+
+    def get_benchmark_records(self) -> DataFrame:
+        """
+        Returns the first `benchmark_batch_rows` raw test records, without the target.
+        """
+        try:
+            chunks, n_rows = [], 0
+            for test_chunk in iter_ingested_split_chunks(self.data_ingestion_artifact, split="test",
+                                                         chunk_size=self.model_eval_config.benchmark_batch_rows, logger=logger):
+                chunks.append(test_chunk)
+                n_rows += len(test_chunk)
+                if n_rows >= self.model_eval_config.benchmark_batch_rows:
+                    break
+            records = pd.concat(chunks, ignore_index=True).head(self.model_eval_config.benchmark_batch_rows)
+            return records.drop(columns=TARGET_COLUMN, errors="ignore")
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def benchmark_models(self, curr_s3_model:Optional[Current_S3_Vehicle_Insurance_Estimator]):
+        """
+        Method Name :   benchmark_models
+        Description :   Benchmarks inference of the trained model and, if there is one, of the
+                        production model (downloaded first) on the same test records and hardware,
+                        alternating between them for `benchmark_repeats` rounds and comparing the
+                        medians, checks the regression thresholds of the config and writes both
+                        benchmarks to the benchmark report.
+
+        Output      :   Returns the trained model benchmark, the production model benchmark (or None)
+                        and the exceeded regression thresholds
+        On Failure  :   Write an exception log and then raise an exception
+        """
+        try:
+            config = self.model_eval_config
+            logger.debug("Benchmarking inference of the trained and the production model...")
+            records = self.get_benchmark_records()
+            production_model_benchmark, regressions = None, []
+            if curr_s3_model is None:
+                trained_model_benchmark = benchmark_model_file(self.model_trainer_artifact.trained_model_file_path, records=records,
+                                                               single_rows=config.benchmark_single_rows, batch_chunk_size=config.prediction_chunk_size,
+                                                               repeats=config.benchmark_repeats, logger=logger)
+            else:
+                curr_s3_model.download_model(local_file_path=config.production_model_file_path)
+                trained_model_benchmark, production_model_benchmark = benchmark_model_files(
+                    [self.model_trainer_artifact.trained_model_file_path, config.production_model_file_path], records=records,
+                    single_rows=config.benchmark_single_rows, batch_chunk_size=config.prediction_chunk_size,
+                    repeats=config.benchmark_repeats, logger=logger)
+                regressions = inference_regressions(trained_model_benchmark, production_model_benchmark,
+                                                    max_p99_latency_ratio=config.max_p99_latency_ratio,
+                                                    min_throughput_ratio=config.min_throughput_ratio,
+                                                    max_load_time_ratio=config.max_load_time_ratio,
+                                                    max_model_size_ratio=config.max_model_size_ratio,
+                                                    min_regression_ms=config.min_regression_ms,
+                                                    throughput_noise_floor=config.throughput_noise_floor)
+            os.makedirs(config.model_evaluation_dir, exist_ok=True)
+            with open(config.benchmark_report_file_path, "w") as report_file:
+                json.dump({"benchmark_rows": len(records), "single_rows": min(config.benchmark_single_rows, len(records)),
+                           "repeats": max(1, config.benchmark_repeats),
+                           "trained_model": dataclasses.asdict(trained_model_benchmark),
+                           "production_model": dataclasses.asdict(production_model_benchmark) if production_model_benchmark else None,
+                           "regressions": regressions}, report_file, indent=2)
+            logger.info(f"Inference benchmark report saved at: {config.benchmark_report_file_path}")
+            return trained_model_benchmark, production_model_benchmark, regressions
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
     def evaluate_model(self)-> EvaluateModelResponse:
         """
         Method Name :   evaluate_model
         Description :   This function is used to evaluate trained model 
-                        with production model and choose best model 
+                        with production model and choose best model.
+                        The production model is scored on the raw test records through
+                        its own persisted preprocessing object, so it does not depend on
+                        the preprocessing of the newly trained model.
+                        With the inference benchmark enabled, a trained model that is
+                        more accurate is still rejected when it is slower, larger or
+                        slower to load than the production model beyond the thresholds.
+                        A model rejected on accuracy is not benchmarked.
         
         Output      :   Returns bool value based on validation results
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
-            logger.debug("Loading transformed test data...")
-            test_arr = load_numpy_array(file_path=self.data_transformation_artifact.data_transformation_transformed_test_file_path, logger=logger)
-            x_test = test_arr[:,:-1]
-            y_test = test_arr[:,-1]
-            logger.info("Test data loaded successfully and splited into dependent and independent features.")
-            logger.debug(f"Loading trained model from: {self.model_trainer_artifact.trained_model_file_path}")
-            # trained_model = load_object(file_path=self.model_trainer_artifact.trained_model_file_path, logger=logger)
             trained_model_accuracy_score = self.model_trainer_artifact.metric_artifact.accuracy_score
             logger.info("Model loaded successfully.")
 
               
             curr_s3_model_accuracy_score = None
             curr_s3_model = self.get_curr_model_from_s3()
-            if curr_s3_model is not None:
-                logger.debug("Calculating acuraccy of current S3 Production model...")
-                y_pred_s3 = curr_s3_model.predict(x_test=x_test)
-                curr_s3_model_accuracy_score = accuracy_score(y_true=y_test,y_pred=y_pred_s3)
+            production_scorer = self.get_production_scorer(curr_s3_model) if curr_s3_model is not None else None
+            if production_scorer is not None:
+                logger.debug("Calculating acuraccy of current S3 Production model on the raw test records...")
+                confusion_matrix = ConfusionMatrixAccumulator()
+                for test_chunk in iter_ingested_split_chunks(self.data_ingestion_artifact, split="test",
+                                                             chunk_size=self.model_eval_config.prediction_chunk_size, logger=logger):
+                    confusion_matrix.update(test_chunk[TARGET_COLUMN].to_numpy(), production_scorer(test_chunk))
+                curr_s3_model_accuracy_score = confusion_matrix.accuracy()
+                logger.info(f"S3 Production model metrics: {confusion_matrix.metric_artifact()}")
                 logger.info(f"Accuracy-S3-Score-Production Model: {curr_s3_model_accuracy_score}, Accuracy-Score-New-Trained-Model: {trained_model_accuracy_score}")
             final_curr_s3_model_accuracy_score = 0 if curr_s3_model_accuracy_score is None else curr_s3_model_accuracy_score
 
             accuracy_improvement = trained_model_accuracy_score - final_curr_s3_model_accuracy_score
+            rejection_reasons = []
+            if accuracy_improvement <= self.model_eval_config.model_evaluation_change_threshold_score:
+                rejection_reasons.append(f"accuracy improvement {accuracy_improvement:.4f} is not above "
+                                         f"{self.model_eval_config.model_evaluation_change_threshold_score}")
+
+            trained_model_benchmark, production_model_benchmark = None, None
+            if self.model_eval_config.benchmark_enabled and rejection_reasons:
+                logger.info("Skipping the inference benchmark, the trained model is already rejected on accuracy.")
+            elif self.model_eval_config.benchmark_enabled:
+                # Only a production model serving raw records like the trained one is benchmarked against it
+                comparable_model = curr_s3_model if production_scorer is not None and \
+                    isinstance(curr_s3_model.loaded_model.preprocessing_object, FusedPreprocessor) else None
+                trained_model_benchmark, production_model_benchmark, regressions = self.benchmark_models(comparable_model)
+                rejection_reasons.extend(regressions)
 
             result = EvaluateModelResponse(
                                            trained_model_accuracy_score=trained_model_accuracy_score,
                                            curr_S3_Production_model_accuracy_score= curr_s3_model_accuracy_score,
-                                           is_model_accepted = accuracy_improvement > self.model_eval_config.model_evaluation_change_threshold_score,
-                                           difference_in_accuracy=(trained_model_accuracy_score - final_curr_s3_model_accuracy_score)
+                                           is_model_accepted = not rejection_reasons,
+                                           difference_in_accuracy=(trained_model_accuracy_score - final_curr_s3_model_accuracy_score),
+                                           trained_model_benchmark=trained_model_benchmark,
+                                           production_model_benchmark=production_model_benchmark,
+                                           rejection_reasons=rejection_reasons
                                            )
             logger.info(f"Result: {result}")
             return result
@@ -120,7 +260,12 @@ class ModelEvaluation:
             model_evaluation_artifact = ModelEvaluationArtifact(is_model_accepted=evaluate_model_response.is_model_accepted,
                                                                 changed_accuracy=evaluate_model_response.difference_in_accuracy,
                                                                 s3_model_path=s3_model_key,
-                                                                trained_model_path=self.model_trainer_artifact.trained_model_file_path
+                                                                trained_model_path=self.model_trainer_artifact.trained_model_file_path,
+                                                                trained_model_benchmark=evaluate_model_response.trained_model_benchmark,
+                                                                production_model_benchmark=evaluate_model_response.production_model_benchmark,
+                                                                rejection_reasons=evaluate_model_response.rejection_reasons,
+                                                                benchmark_report_file_path=(self.model_eval_config.benchmark_report_file_path
+                                                                                            if evaluate_model_response.trained_model_benchmark else None)
                                                                 )
             
             logger.info(f"Model evaluation artifact: {model_evaluation_artifact}")
@@ -1,9 +1,11 @@
 import sys
+import time
+from typing import Optional
 
 from src.Cloud_Storage.AWS_Storage import SimpleStorageService
 from src.Exception import MyException
 from src.Logger import configure_logger
-from src.Entity.Artifact_Entity import ModelPusherArtifact, ModelEvaluationArtifact, DataTransformationArtifact
+from src.Entity.Artifact_Entity import ModelPusherArtifact, ModelEvaluationArtifact, DataTransformationArtifact, DataIngestionArtifact
 from src.Entity.Config_Entity import ModelPusherConfig
 from src.Entity.S3_Estimator import Current_S3_Vehicle_Insurance_Estimator
 from src.Cloud_Storage.AWS_Storage import SimpleStorageService
@@ -12,14 +14,16 @@ logger = configure_logger(logger_name=__name__, level="DEBUG", to_console=True,
 
 class ModelPusher:
     def __init__(self, model_evaluation_artifact: ModelEvaluationArtifact,
-                 model_pusher_config: ModelPusherConfig):
+                 model_pusher_config: ModelPusherConfig, data_ingestion_artifact: Optional[DataIngestionArtifact] = None):
         """
         :param model_evaluation_artifact: Output reference of data evaluation artifact stage
         :param model_pusher_config: Configuration for model pusher
+        :param data_ingestion_artifact: Output reference of data ingestion, its latest document id is pushed as the model's watermark
         """
         try:
             self.s3 = SimpleStorageService(logger=logger)
             self.model_evaluation_artifact = model_evaluation_artifact
+            self.data_ingestion_artifact = data_ingestion_artifact
             self.model_pusher_config = model_pusher_config
             self.Current_S3_Vehicle_Insurance_Estimator = Current_S3_Vehicle_Insurance_Estimator(bucket_name=model_pusher_config.bucket_name,
                                     model_s3_key=model_pusher_config.s3_model_key_path, logger=logger)
@@ -53,6 +57,19 @@ class ModelPusher:
             logger.info("Artifacts and Logs are uploaded to S3 bucket Successfully.")
             logger.debug("Uploading new model to S3 bucket....")
             self.Current_S3_Vehicle_Insurance_Estimator.save_model_to_s3(local_model_file_path=self.model_evaluation_artifact.trained_model_path)
+            # Only once the model is pushed does its profile become the drift reference of the next runs
+            logger.debug("Uploading data profile as reference for drift detection...")
+            self.s3.upload_file_to_s3(from_filename=self.model_pusher_config.local_data_profile_path,
+                                      to_filename=self.model_pusher_config.s3_data_profile_key_path,
+                                      bucket_name=self.model_pusher_config.bucket_name,
+                                      remove=False)
+            if self.data_ingestion_artifact is not None and self.data_ingestion_artifact.latest_document_id is not None:
+                logger.debug("Uploading data watermark for incremental updates...")
+                self.Current_S3_Vehicle_Insurance_Estimator.save_watermark(
+                    watermark={"last_document_id": self.data_ingestion_artifact.latest_document_id, "incremental_updates": 0,
+                               "trained_by": "full", "updated_at": time.strftime("%Y-%m-%d %H:%M:%S")},
+                    local_file_path=self.model_pusher_config.local_watermark_file_path,
+                    watermark_s3_key=self.model_pusher_config.s3_watermark_key_path)
             model_pusher_artifact = ModelPusherArtifact(bucket_name=self.model_pusher_config.bucket_name,
                                                         s3_model_path=self.model_pusher_config.s3_model_key_path)
 
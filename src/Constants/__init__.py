@@ -34,10 +34,13 @@ PREPROCSSING_OBJECT_FILE_NAME = "preprocessing.pkl"
 """
  Data Variables
 """
-RAW_DATA_FILE_NAME: str = "data.csv"
-TRAIN_FILE_NAME: str = "train.csv"
-TEST_FILE_NAME: str = "test.csv"
-SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
+DATA_FILE_FORMAT: str = "parquet"                # "parquet" (columnar, compressed) or "csv"
+PARQUET_COMPRESSION: str = "zstd"                 # Codec used when writing parquet artifacts
+RAW_DATA_FILE_NAME: str = f"data.{DATA_FILE_FORMAT}"
+TRAIN_FILE_NAME: str = f"train.{DATA_FILE_FORMAT}"
+TEST_FILE_NAME: str = f"test.{DATA_FILE_FORMAT}"
+SPLIT_INDICES_FILE_NAME: str = "split_indices.npz"
+SCHEMA_FILE_PATH = os.path.join("Config", "Schema.yaml")
 
 
 """
@@ -47,12 +50,24 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TEST_DATA_SIZE: float = 0.25
+DATA_INGESTION_SPLIT_STRATEGY: str = "hash"          # "hash" (streaming, id based) or "random" (in-memory train_test_split)
+DATA_INGESTION_SPLIT_ID_COLUMN: str = "id"
+DATA_INGESTION_STRATIFY_COLUMN: str = TARGET_COLUMN  # Set to None to disable stratification
+DATA_INGESTION_CHUNK_SIZE: int = 50_000
+DATA_INGESTION_PERSIST_SPLIT_AS_INDICES: bool = False   # Store train/test as row indices over the feature store instead of copies
 
 """
 Data Validation related constants starts with DATA_VALIDATION VAR NAME
 """
 DATA_VALIDATION_DIR_NAME = "data_validation"
 DATA_VALIDATION_REPORT_FILE_NAME = "report.yaml"
+DATA_VALIDATION_CHUNK_SIZE: int = 100_000
+DATA_VALIDATION_PROFILE_FILE_NAME: str = "data_profile.json"
+DATA_VALIDATION_PROFILE_BINS: int = 100  # training-quantile bins of the stored reference profile
+DATA_VALIDATION_PROFILE_SKETCH_BINS: int = 2000  # equal-width bins over the schema range the quantiles are taken from
+DATA_VALIDATION_DRIFT_PSI_THRESHOLD: float = 0.2
+DATA_VALIDATION_DRIFT_KS_THRESHOLD: float = 0.1
+DATA_VALIDATION_DRIFT_MIN_ROWS: int = 1000  # fewer profiled rows are reported but never flagged as drift (sampling noise alone exceeds the thresholds)
 
 """
 Data Transformation ralated constant start with DATA_TRANSFORMATION VAR NAME
@@ -61,6 +76,29 @@ DATA_TRANSFORMATION_DIR_NAME: str = "data_transformation"
 DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
 DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR: str = "transformed_object"
 DATA_TRANSFORMATOIN_DUMP_CATEGORIES_FILE_NAME: str = "categories.json"
+DATA_TRANSFORMATION_TARGET_FILE_SUFFIX: str = "_target"
+DATA_TRANSFORMATION_CHUNK_SIZE: int = 100_000
+DATA_TRANSFORMATION_MODE: str = "in_memory"  # in_memory | chunked (out-of-core, memory bounded by DATA_TRANSFORMATION_CHUNK_SIZE)
+DATA_TRANSFORMATION_ENCODED_FILE_SUFFIX: str = "_encoded"
+DATA_TRANSFORMATION_IMBALANCE_STRATEGY: str = "smoteenn"  # smoteenn | smote | random_undersample | class_weight | none
+DATA_TRANSFORMATION_RESAMPLING_N_JOBS: int = -1
+DATA_TRANSFORMATION_RESAMPLING_CHUNK_SIZE: int = 100_000
+DATA_TRANSFORMATION_MAX_SYNTHETIC_SAMPLES = None  # int caps the SMOTE synthetic rows per class
+DATA_TRANSFORMATION_LEARNING_CURVE_FILE_NAME: str = "learning_curve.json"  # written when `learning_curve` is enabled in Config/Model.yaml
+
+"""
+Data Compaction related constants start with DATA_COMPACTION VAR NAME
+"""
+DATA_COMPACTION_ENABLED: bool = False  # merge duplicate training rows into unique rows with sample weights before training
+DATA_COMPACTION_DIR_NAME: str = "data_compaction"
+DATA_COMPACTION_SAMPLE_WEIGHT_FILE_NAME: str = "train_sample_weight.npy"
+DATA_COMPACTION_REPORT_FILE_NAME: str = "compaction_report.json"
+
+"""
+Stage cache related constants start with STAGE_CACHE VAR NAME
+"""
+STAGE_CACHE_DIR_NAME: str = "stage_cache"
+STAGE_CACHE_ENABLED: bool = True
 
 """
 MODEL TRAINER related constant start with MODEL_TRAINER var name
@@ -69,19 +107,68 @@ MODEL_TRAINER_DIR_NAME:str = 'model_trainer'
 MODEL_TRAINER_TRAINED_MODEL_DIR:str = 'trained_model'
 MODEL_TRAINER_TRAINED_MODEL_NAME:str = 'model.pkl'
 MODEL_TRAINER_EXPECTED_ACCURACY: float = 0.7121
-MODEL_TRAINER_MODEL_CONFIG_FILE_PATH:str = os.path.join("congfig","model.yaml")
+MODEL_TRAINER_MODEL_CONFIG_FILE_PATH:str = os.path.join("Config","Model.yaml")
+MODEL_TRAINER_LEADERBOARD_FILE_NAME:str = 'leaderboard.json'
+MODEL_TRAINER_MODEL_NAME:str = 'random_forest'  # model family used when Config/Model.yaml has no `model.name`
 MODEL_TRAINER_N_ESTIMATORS=200
 MODEL_TRAINER_MIN_SAMPLES_SPLIT: int = 7
 MODEL_TRAINER_MIN_SAMPLES_LEAF: int = 6
 MIN_SAMPLES_SPLIT_MAX_DEPTH: int = 10
 MIN_SAMPLES_SPLIT_CRITERION: str = 'entropy'
 MIN_SAMPLES_SPLIT_RANDOM_STATE: int = 101
+MODEL_TRAINER_N_JOBS: int = -1  # cores used to build the trees, -1 uses all cores
+MODEL_TRAINER_WARM_START: bool = False  # add trees to the production forest when no drift was detected
+MODEL_TRAINER_WARM_START_N_ESTIMATORS: int = 50  # trees added per warm-started retrain
+MODEL_TRAINER_WARM_START_MAX_ESTIMATORS: int = 1000  # full retrain once the production forest has this many trees
+MODEL_TRAINER_TIME_BUDGET_SECONDS = None  # float enables anytime training: the forest grows in increments until this wall-clock budget is spent
+MODEL_TRAINER_ANYTIME_INCREMENT: int = 25  # trees added per anytime step
+MODEL_TRAINER_ANYTIME_MAX_ESTIMATORS: int = 1000
+MODEL_TRAINER_ANYTIME_PATIENCE: int = 3  # steps without a validation gain of MODEL_TRAINER_ANYTIME_MIN_IMPROVEMENT before stopping
+MODEL_TRAINER_ANYTIME_MIN_IMPROVEMENT: float = 0.001
+MODEL_TRAINER_ANYTIME_VALIDATION_FRACTION: float = 0.1  # training rows held out (zero sample weight) to score the steps
+MODEL_TRAINER_ANYTIME_SCORING: str = "accuracy"  # accuracy | f1 | precision | recall
+MODEL_TRAINER_DISTRIBUTED: bool = False  # train the forest as sub-forests through a shared work directory (src/Utils/Distributed_Training.py)
+MODEL_TRAINER_DISTRIBUTED_DIR_NAME: str = "distributed"
+MODEL_TRAINER_DISTRIBUTED_N_TASKS: int = 8  # sub-forests the trees are split into
+MODEL_TRAINER_DISTRIBUTED_N_WORKERS: int = -1  # local worker processes, 0 leaves all tasks to workers on other hosts
+MODEL_TRAINER_DISTRIBUTED_DATA: str = "bootstrap"  # bootstrap (every task samples all rows) | shard (disjoint stratified shard per task)
+MODEL_TRAINER_DISTRIBUTED_TIMEOUT_SECONDS: float = 3600.0
+MODEL_TRAINER_DISTRIBUTED_LEASE_SECONDS: float = 300.0  # a claimed task without a worker heartbeat for this long is re-queued
+MODEL_TRAINER_EVALUATION_CHUNK_SIZE: int = 100_000  # test rows predicted per call while the confusion matrix is accumulated
+MODEL_TRAINER_EVALUATION_N_JOBS: int = 1  # chunks predicted concurrently (threads, the model then predicts with n_jobs=1), -1 for one per core
+
+"""
+MODEL INCREMENTAL TRAINER related constant start with MODEL_INCREMENTAL var name
+"""
+MODEL_INCREMENTAL_DIR_NAME: str = "incremental_trainer"
+MODEL_INCREMENTAL_NEW_DOCUMENTS_DIR_NAME: str = "new_documents"  # update / held-out split of the new documents, validated like an ingestion
+MODEL_INCREMENTAL_MIN_DOCUMENTS: int = 100  # new documents needed before the production model is updated
+MODEL_INCREMENTAL_CHUNK_SIZE: int = 10_000  # rows per partial_fit call
+MODEL_INCREMENTAL_CLASS_WEIGHT = "balanced"  # weights the classes of every update batch, None updates on the raw class frequencies
+MODEL_INCREMENTAL_VALIDATION_FRACTION: float = 0.2  # new documents the update is checked on before it is pushed
+MODEL_INCREMENTAL_MAX_ACCURACY_DROP: float = 0.01  # accuracy an update may lose on the held-out new documents and still be pushed, a bigger loss asks for a full retrain
+MODEL_INCREMENTAL_MAX_UPDATES: int = 30  # incremental updates between two full retrains
 
 
 """
 MODEL Evaluation related constants
 """
 MODEL_EVALUATION_CHANGE_THRESHOLD: float = 0.02
+MODEL_EVALUATION_PREDICTION_CHUNK_SIZE: int = 100_000
+MODEL_EVALUATION_DIR_NAME: str = "model_evaluation"
+MODEL_EVALUATION_PRODUCTION_MODEL_FILE_NAME: str = "production_model.pkl"  # local copy of the S3 model, benchmarked like the trained one
+MODEL_EVALUATION_BENCHMARK_REPORT_FILE_NAME: str = "inference_benchmark.json"
+MODEL_EVALUATION_BENCHMARK_ENABLED: bool = True
+MODEL_EVALUATION_BENCHMARK_SINGLE_ROWS: int = 200  # single-record predict calls timed for p50/p99
+MODEL_EVALUATION_BENCHMARK_BATCH_ROWS: int = 50_000  # test records scored with predict_batch for the throughput
+MODEL_EVALUATION_BENCHMARK_REPEATS: int = 3  # alternating trained / production rounds, the medians are compared
+# Regression gates of the trained model relative to the production model, None disables a gate
+MODEL_EVALUATION_MAX_P99_LATENCY_RATIO: float = 1.5
+MODEL_EVALUATION_MIN_THROUGHPUT_RATIO: float = 0.67
+MODEL_EVALUATION_MAX_LOAD_TIME_RATIO: float = 2.0
+MODEL_EVALUATION_MAX_MODEL_SIZE_RATIO: float = 1.5
+MODEL_EVALUATION_MIN_REGRESSION_MS: float = 1.0  # smaller latency / load time increases are timing noise, never a regression
+MODEL_EVALUATION_THROUGHPUT_NOISE_FLOOR: float = 0.05  # relative throughput shortfall always treated as noise (or the spread over the repeats if larger)
 MODEL_BUCKET_NAME: str = "vehicle-insurance-prediction-mlops-s3"
 MODEL_S3_PRIFIX_KEY: str = "model-registry"
 
@@ -95,6 +182,8 @@ LOCAL_CATEGORIES_JSON_PATH: str = os.path.join("artifact", DATA_TRANSFORMATOIN_D
 S3_ARTIFACTS_PREFIX = f"artifacts/{LOG_SESSION_TIME}/"
 S3_LOGS_PREFIX = f"logs/{LOG_SESSION_TIME}/"
 S3_CATEGORIES_JSON_PREFIX = f"artifacts/{DATA_TRANSFORMATOIN_DUMP_CATEGORIES_FILE_NAME}"
+# Newest MongoDB document the production model has seen, kept next to the model in the registry
+MODEL_WATERMARK_FILE_NAME: str = "watermark.json"
 
 
 
@@ -3,8 +3,9 @@ import pandas as pd
 import numpy as np
 import sys
 import time
-from typing import Optional
+from typing import Optional, Iterator
 from logging import Logger
+from bson import ObjectId
 from src.Logger import configure_logger
 from src.Exception import MyException
 from src.Configuration.Mongo_DB_Connection import MongoDBClient
@@ -86,4 +87,114 @@ class Vehicle_Insurance_Data:
                 self.logger.warning(f"[Attempt {attempt}] Failed to fetch data: {e}")
                 if attempt == MAX_RETRIES:
                         raise MyException(error_message=e, error_detail=sys, logger=self.logger)
-                time.sleep(DELAY)
\ No newline at end of file
+                time.sleep(DELAY)
+
+    def iterate_collection_in_chunks(self, collection_name: str, database_name: Optional[str] = None, chunk_size: int = 50_000) -> Iterator[pd.DataFrame]:
+        """
+        Streams a MongoDB collection as a sequence of pandas DataFrames.
+
+        Unlike `import_collection_as_dataframe`, at most `chunk_size` documents are
+        held in memory at a time, so the collection size is not limited by RAM.
+
+        Parameters:
+        ----------
+        collection_name : str
+            The name of the MongoDB collection to export.
+        database_name : Optional[str]
+            Name of the database (optional). Defaults to DATABASE_NAME.
+        chunk_size : int, default=50_000
+            Number of documents per yielded DataFrame (also used as the cursor batch size).
+
+        Yields:
+        -------
+        pd.DataFrame
+            Chunks of the collection with the '_id' column removed and 'na' values replaced with NaN.
+        """
+        try:
+            self.logger.debug(f"Streaming collection '{collection_name}' from MongoDB in chunks of {chunk_size}...")
+            if database_name is None:
+                collection = self.mongo_client.database[collection_name]
+            else:
+                collection = self.mongo_client._client[database_name][collection_name]
+
+            # _id order keeps the chunks (and the stratified split of their rows) stable as documents are appended
+            cursor = collection.find({}, projection={"_id": False}, batch_size=chunk_size).sort("_id", 1)
+            documents = []
+            n_chunks = 0
+            for document in cursor:
+                documents.append(document)
+                if len(documents) == chunk_size:
+                    n_chunks += 1
+                    yield pd.DataFrame(documents).replace({"na": np.nan})
+                    documents = []
+            if documents:
+                n_chunks += 1
+                yield pd.DataFrame(documents).replace({"na": np.nan})
+            self.logger.info(f"Streamed collection '{collection_name}' in {n_chunks} chunks.")
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def _collection(self, collection_name: str, database_name: Optional[str] = None):
+        if database_name is None:
+            return self.mongo_client.database[collection_name]
+        return self.mongo_client._client[database_name][collection_name]
+
+    def get_latest_document_id(self, collection_name: str, database_name: Optional[str] = None) -> Optional[str]:
+        """
+        Returns the `_id` of the newest document of a collection.
+
+        Default ObjectIds grow with the insertion time, so the newest `_id` marks how
+        far a training run has read the collection (the watermark of incremental updates).
+
+        Parameters:
+        ----------
+        collection_name : str
+            The name of the MongoDB collection.
+        database_name : Optional[str]
+            Name of the database (optional). Defaults to DATABASE_NAME.
+
+        Returns:
+        -------
+        Optional[str]
+            Hex string of the newest `_id`, None for an empty collection.
+        """
+        try:
+            document = self._collection(collection_name, database_name).find_one({}, projection={"_id": True}, sort=[("_id", -1)])
+            return str(document["_id"]) if document is not None else None
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def import_documents_after(self, collection_name: str, after_id: Optional[str], up_to_id: Optional[str] = None,
+                               database_name: Optional[str] = None) -> pd.DataFrame:
+        """
+        Exports the documents inserted after a watermark as a pandas DataFrame.
+
+        Parameters:
+        ----------
+        collection_name : str
+            The name of the MongoDB collection to export.
+        after_id : Optional[str]
+            Watermark `_id` (exclusive), None exports from the first document.
+        up_to_id : Optional[str]
+            Last `_id` to export (inclusive), fixed before reading so documents inserted meanwhile are left for the next run.
+        database_name : Optional[str]
+            Name of the database (optional). Defaults to DATABASE_NAME.
+
+        Returns:
+        -------
+        pd.DataFrame
+            New documents in insertion order, with the '_id' column removed and 'na' values replaced with NaN.
+        """
+        try:
+            query = {}
+            if after_id is not None:
+                query["$gt"] = ObjectId(after_id)
+            if up_to_id is not None:
+                query["$lte"] = ObjectId(up_to_id)
+            cursor = self._collection(collection_name, database_name).find({"_id": query} if query else {}, projection={"_id": False},
+                                                                           sort=[("_id", 1)])
+            df = pd.DataFrame(list(cursor)).replace({"na": np.nan})
+            self.logger.info(f"Fetched {len(df)} documents of '{collection_name}' after {after_id}.")
+            return df
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
@@ -1,23 +1,36 @@
 from dataclasses import dataclass
+from typing import Optional, List
 
 
 @dataclass
 class DataIngestionArtifact:
-    training_data_file_path:str 
-    test_data_file_path:str
+    training_data_file_path:Optional[str]
+    test_data_file_path:Optional[str]
+    feature_store_file_path:Optional[str] = None
+    split_indices_file_path:Optional[str] = None   # Set when the split is persisted as row indices into the feature store
+    latest_document_id:Optional[str] = None   # Newest MongoDB `_id` when ingestion started, the watermark of incremental updates
 
 @dataclass
 class DataValidationArtifact:
     validation_status:bool
     message:str
     validation_report_file_path:str
+    data_profile_file_path:Optional[str] = None
+    drift_detected:Optional[bool] = None   # None when no reference profile was available
 
 @dataclass
 class DataTransformationArtifact:
     data_transformation_transformed_object_file_path:str 
     data_transformation_transformed_train_file_path:str
     data_transformation_transformed_test_file_path:str
+    data_transformation_transformed_train_target_file_path:str
+    data_transformation_transformed_test_target_file_path:str
     data_transformation_categories_json_path:str
+    imbalance_strategy:str = "smoteenn"
+    training_fraction:float = 1.0   # Stratified share of the training split the model is trained on
+    learning_curve_file_path:Optional[str] = None   # Set when a learning curve was recorded
+    data_transformation_sample_weight_file_path:Optional[str] = None   # Set when duplicate training rows were compacted
+    compression_ratio:Optional[float] = None   # Training rows per unique row after compaction
 
 @dataclass
 class ClassificationMetricArtifact:
@@ -30,6 +43,23 @@ class ClassificationMetricArtifact:
 class ModelTrainerArtifact:
     trained_model_file_path:str 
     metric_artifact:ClassificationMetricArtifact
+    model_name:Optional[str] = None   # Model family, see src/Entity/Model_Families.py
+    n_estimators:Optional[int] = None   # Trees, or boosting iterations after early stopping
+    warm_started:bool = False   # True when trees were added to the previous production forest
+    leaderboard_file_path:Optional[str] = None   # Set when a hyperparameter search ran
+    training_seconds:Optional[float] = None   # Wall time of the trainer stage
+    time_budget_seconds:Optional[float] = None   # Set for anytime (time-budgeted) training
+    stop_reason:Optional[str] = None   # Why anytime training stopped: time_budget | plateau | max_estimators
+    n_segments:Optional[int] = None   # Set for segment-partitioned training
+
+@dataclass
+class InferenceBenchmarkArtifact:
+    model_size_mb:float   # Serialized model file
+    load_seconds:float   # Deserializing the model file
+    p50_latency_ms:float   # Single-record predict
+    p99_latency_ms:float
+    batch_rows_per_second:float   # predict_batch throughput
+    batch_throughput_spread:float = 0.0   # (max - min) / median throughput over the repeats
 
 @dataclass
 class ModelEvaluationArtifact:
@@ -37,8 +67,26 @@ class ModelEvaluationArtifact:
     changed_accuracy:float
     s3_model_path:str 
     trained_model_path:str
+    trained_model_benchmark:Optional[InferenceBenchmarkArtifact] = None   # Set when the inference benchmark ran
+    production_model_benchmark:Optional[InferenceBenchmarkArtifact] = None   # Set when there was a production model to compare to
+    rejection_reasons:Optional[List[str]] = None   # Accuracy and inference regression gates the trained model failed
+    benchmark_report_file_path:Optional[str] = None
 
 @dataclass
 class ModelPusherArtifact:
     bucket_name:str
-    s3_model_path:str
\ No newline at end of file
+    s3_model_path:str
+
+@dataclass
+class IncrementalTrainerArtifact:
+    updated:bool   # True when the production model was updated and pushed
+    message:str
+    n_documents:int = 0   # New documents since the watermark
+    last_document_id:Optional[str] = None   # Watermark after this run
+    trained_model_file_path:Optional[str] = None
+    metric_before:Optional[ClassificationMetricArtifact] = None   # Production model on the held-out new documents
+    metric_after:Optional[ClassificationMetricArtifact] = None   # Updated model on the same documents
+    update_seconds:Optional[float] = None
+    full_retrain_due:bool = False   # No watermark, too many incremental updates, invalid or drifted documents, or an accuracy drop
+    data_validation_artifact:Optional[DataValidationArtifact] = None   # Schema and drift validation of the new documents
+    model_evaluation_artifact:Optional[ModelEvaluationArtifact] = None   # Promotion gates of the updated model
@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from typing import Optional
 from datetime import datetime
 from src.Constants import *
 from src.Constants.global_logging import LOG_SESSION_TIME
@@ -19,45 +20,149 @@ class DataIngestionConfig:
     feature_store_file_path:str = os.path.join(data_ingestion_dir,DATA_INGESTION_FEATURE_STORE_DIR,RAW_DATA_FILE_NAME)
     training_data_file_path: str = os.path.join(data_ingestion_dir, DATA_INGESTION_INGESTED_DIR, TRAIN_FILE_NAME)
     test_data_file_path: str = os.path.join(data_ingestion_dir, DATA_INGESTION_INGESTED_DIR, TEST_FILE_NAME)
+    split_indices_file_path: str = os.path.join(data_ingestion_dir, DATA_INGESTION_INGESTED_DIR, SPLIT_INDICES_FILE_NAME)
     test_data_size: float = DATA_INGESTION_TEST_DATA_SIZE
     collection_name:str = os.getenv(COLLECTION_NAME)
     database_name:str = os.getenv(DATABASE_NAME)
     random_state:int = RANDOM_STATE
+    split_strategy:str = DATA_INGESTION_SPLIT_STRATEGY
+    split_id_column:str = DATA_INGESTION_SPLIT_ID_COLUMN
+    stratify_column:str = DATA_INGESTION_STRATIFY_COLUMN
+    chunk_size:int = DATA_INGESTION_CHUNK_SIZE
+    persist_split_as_indices:bool = DATA_INGESTION_PERSIST_SPLIT_AS_INDICES
 
 @dataclass
 class DataValidationConfig:
     data_validation_dir:str = os.path.join(training_pipeline_congfig.artifact_dir,DATA_VALIDATION_DIR_NAME)
     data_validation_report_file_path = os.path.join(data_validation_dir,DATA_VALIDATION_REPORT_FILE_NAME)
+    chunk_size:int = DATA_VALIDATION_CHUNK_SIZE
+    data_profile_file_path:str = os.path.join(data_validation_dir,DATA_VALIDATION_PROFILE_FILE_NAME)
+    profile_bins:int = DATA_VALIDATION_PROFILE_BINS
+    profile_sketch_bins:int = DATA_VALIDATION_PROFILE_SKETCH_BINS
+    drift_psi_threshold:float = DATA_VALIDATION_DRIFT_PSI_THRESHOLD
+    drift_ks_threshold:float = DATA_VALIDATION_DRIFT_KS_THRESHOLD
+    drift_min_rows:int = DATA_VALIDATION_DRIFT_MIN_ROWS
+    bucket_name:str = MODEL_BUCKET_NAME
+    s3_reference_profile_key_path:str = f"{MODEL_S3_PRIFIX_KEY.rstrip('/')}/{DATA_VALIDATION_PROFILE_FILE_NAME}"
 
 @dataclass
 class DataTransformationConfig:
     data_transformation_dir:str = os.path.join(training_pipeline_congfig.artifact_dir,DATA_TRANSFORMATION_DIR_NAME)
     data_transformation_transformed_train_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-                                                    TRAIN_FILE_NAME.replace("csv", "npy"))
+                                                    os.path.splitext(TRAIN_FILE_NAME)[0] + ".npy")
     data_transformation_transformed_test_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-                                                   TEST_FILE_NAME.replace("csv", "npy"))
+                                                   os.path.splitext(TEST_FILE_NAME)[0] + ".npy")
+    data_transformation_transformed_train_target_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                    os.path.splitext(TRAIN_FILE_NAME)[0] + DATA_TRANSFORMATION_TARGET_FILE_SUFFIX + ".npy")
+    data_transformation_transformed_test_target_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                   os.path.splitext(TEST_FILE_NAME)[0] + DATA_TRANSFORMATION_TARGET_FILE_SUFFIX + ".npy")
     data_transformation_transformed_object_file_path: str = os.path.join(data_transformation_dir,
                                                      DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
                                                      PREPROCSSING_OBJECT_FILE_NAME)
+    data_transformation_encoded_train_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                    os.path.splitext(TRAIN_FILE_NAME)[0] + DATA_TRANSFORMATION_ENCODED_FILE_SUFFIX + ".npy")
+    data_transformation_encoded_train_target_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+                                                    os.path.splitext(TRAIN_FILE_NAME)[0] + DATA_TRANSFORMATION_ENCODED_FILE_SUFFIX + DATA_TRANSFORMATION_TARGET_FILE_SUFFIX + ".npy")
     data_transformation_dump_categories_path: str = os.path.join(ARTIFACT_DIR,DATA_TRANSFORMATOIN_DUMP_CATEGORIES_FILE_NAME)
+    transformation_mode: str = DATA_TRANSFORMATION_MODE
+    chunk_size: int = DATA_TRANSFORMATION_CHUNK_SIZE
+    imbalance_strategy: str = DATA_TRANSFORMATION_IMBALANCE_STRATEGY
+    resampling_n_jobs: int = DATA_TRANSFORMATION_RESAMPLING_N_JOBS
+    resampling_chunk_size: int = DATA_TRANSFORMATION_RESAMPLING_CHUNK_SIZE
+    max_synthetic_samples: Optional[int] = DATA_TRANSFORMATION_MAX_SYNTHETIC_SAMPLES
+    data_transformation_learning_curve_file_path: str = os.path.join(data_transformation_dir, DATA_TRANSFORMATION_LEARNING_CURVE_FILE_NAME)
+    model_config_yaml_file_path: str = MODEL_TRAINER_MODEL_CONFIG_FILE_PATH
+@dataclass
+class DataCompactionConfig:
+    enabled:bool = DATA_COMPACTION_ENABLED
+    data_compaction_dir:str = os.path.join(training_pipeline_congfig.artifact_dir,DATA_COMPACTION_DIR_NAME)
+    compacted_train_file_path:str = os.path.join(data_compaction_dir, os.path.splitext(TRAIN_FILE_NAME)[0] + ".npy")
+    compacted_train_target_file_path:str = os.path.join(data_compaction_dir, os.path.splitext(TRAIN_FILE_NAME)[0] + DATA_TRANSFORMATION_TARGET_FILE_SUFFIX + ".npy")
+    sample_weight_file_path:str = os.path.join(data_compaction_dir, DATA_COMPACTION_SAMPLE_WEIGHT_FILE_NAME)
+    report_file_path:str = os.path.join(data_compaction_dir, DATA_COMPACTION_REPORT_FILE_NAME)
+
+@dataclass
+class StageCacheConfig:
+    cache_dir:str = os.path.join(ARTIFACT_DIR,STAGE_CACHE_DIR_NAME)
+    run_dir:str = training_pipeline_congfig.artifact_dir
+    enabled:bool = STAGE_CACHE_ENABLED
+
 @dataclass
 class ModelTrainerConfig:
     model_trainer_dir:str = os.path.join(training_pipeline_congfig.artifact_dir,MODEL_TRAINER_DIR_NAME)
     model_trainer_trained_model_file_path:str = os.path.join(model_trainer_dir,MODEL_TRAINER_TRAINED_MODEL_DIR,MODEL_TRAINER_TRAINED_MODEL_NAME)
     model_trainer_expected_accuracy:float = MODEL_TRAINER_EXPECTED_ACCURACY
     model_config_yaml_file_path:str = MODEL_TRAINER_MODEL_CONFIG_FILE_PATH
+    model_trainer_leaderboard_file_path:str = os.path.join(model_trainer_dir,MODEL_TRAINER_LEADERBOARD_FILE_NAME)
+    _model_name = MODEL_TRAINER_MODEL_NAME
     _n_estimators = MODEL_TRAINER_N_ESTIMATORS
     _min_samples_split = MODEL_TRAINER_MIN_SAMPLES_SPLIT
     _min_samples_leaf = MODEL_TRAINER_MIN_SAMPLES_LEAF
     _max_depth = MIN_SAMPLES_SPLIT_MAX_DEPTH
     _criterion = MIN_SAMPLES_SPLIT_CRITERION
     _random_state = MIN_SAMPLES_SPLIT_RANDOM_STATE
+    _n_jobs = MODEL_TRAINER_N_JOBS
+    warm_start:bool = MODEL_TRAINER_WARM_START
+    warm_start_n_estimators:int = MODEL_TRAINER_WARM_START_N_ESTIMATORS
+    warm_start_max_estimators:int = MODEL_TRAINER_WARM_START_MAX_ESTIMATORS
+    time_budget_seconds:Optional[float] = MODEL_TRAINER_TIME_BUDGET_SECONDS
+    anytime_increment:int = MODEL_TRAINER_ANYTIME_INCREMENT
+    anytime_max_estimators:int = MODEL_TRAINER_ANYTIME_MAX_ESTIMATORS
+    anytime_patience:int = MODEL_TRAINER_ANYTIME_PATIENCE
+    anytime_min_improvement:float = MODEL_TRAINER_ANYTIME_MIN_IMPROVEMENT
+    anytime_validation_fraction:float = MODEL_TRAINER_ANYTIME_VALIDATION_FRACTION
+    anytime_scoring:str = MODEL_TRAINER_ANYTIME_SCORING
+    distributed:bool = MODEL_TRAINER_DISTRIBUTED
+    distributed_work_dir:str = os.path.join(model_trainer_dir,MODEL_TRAINER_DISTRIBUTED_DIR_NAME)
+    distributed_n_tasks:int = MODEL_TRAINER_DISTRIBUTED_N_TASKS
+    distributed_n_workers:int = MODEL_TRAINER_DISTRIBUTED_N_WORKERS
+    distributed_data:str = MODEL_TRAINER_DISTRIBUTED_DATA
+    distributed_timeout_seconds:float = MODEL_TRAINER_DISTRIBUTED_TIMEOUT_SECONDS
+    distributed_lease_seconds:float = MODEL_TRAINER_DISTRIBUTED_LEASE_SECONDS
+    evaluation_chunk_size:int = MODEL_TRAINER_EVALUATION_CHUNK_SIZE
+    evaluation_n_jobs:int = MODEL_TRAINER_EVALUATION_N_JOBS
+    bucket_name:str = MODEL_BUCKET_NAME
+    s3_model_key_path:str = f"{MODEL_S3_PRIFIX_KEY.rstrip('/')}/{MODEL_FILE_NAME}"
+
+@dataclass
+class IncrementalTrainerConfig:
+    incremental_trainer_dir:str = os.path.join(training_pipeline_congfig.artifact_dir,MODEL_INCREMENTAL_DIR_NAME)
+    trained_model_file_path:str = os.path.join(incremental_trainer_dir,MODEL_TRAINER_TRAINED_MODEL_NAME)
+    watermark_file_path:str = os.path.join(incremental_trainer_dir,MODEL_WATERMARK_FILE_NAME)
+    new_documents_train_file_path:str = os.path.join(incremental_trainer_dir,MODEL_INCREMENTAL_NEW_DOCUMENTS_DIR_NAME,TRAIN_FILE_NAME)
+    new_documents_test_file_path:str = os.path.join(incremental_trainer_dir,MODEL_INCREMENTAL_NEW_DOCUMENTS_DIR_NAME,TEST_FILE_NAME)
+    collection_name:str = os.getenv(COLLECTION_NAME)
+    database_name:str = os.getenv(DATABASE_NAME)
+    min_documents:int = MODEL_INCREMENTAL_MIN_DOCUMENTS
+    chunk_size:int = MODEL_INCREMENTAL_CHUNK_SIZE
+    class_weight:Optional[str] = MODEL_INCREMENTAL_CLASS_WEIGHT
+    validation_fraction:float = MODEL_INCREMENTAL_VALIDATION_FRACTION
+    max_accuracy_drop:float = MODEL_INCREMENTAL_MAX_ACCURACY_DROP
+    max_updates:int = MODEL_INCREMENTAL_MAX_UPDATES
+    random_state:int = RANDOM_STATE
+    bucket_name:str = MODEL_BUCKET_NAME
+    s3_model_key_path:str = f"{MODEL_S3_PRIFIX_KEY.rstrip('/')}/{MODEL_FILE_NAME}"
+    s3_watermark_key_path:str = f"{MODEL_S3_PRIFIX_KEY.rstrip('/')}/{MODEL_WATERMARK_FILE_NAME}"
 
 @dataclass
 class ModelEvaluationConfig:
     model_evaluation_change_threshold_score: float = MODEL_EVALUATION_CHANGE_THRESHOLD
     bucket_name: str = MODEL_BUCKET_NAME
     s3_model_key_path: str = f"{MODEL_S3_PRIFIX_KEY.rstrip('/')}/{MODEL_FILE_NAME}"
+    prediction_chunk_size: int = MODEL_EVALUATION_PREDICTION_CHUNK_SIZE
+    model_evaluation_dir: str = os.path.join(training_pipeline_congfig.artifact_dir, MODEL_EVALUATION_DIR_NAME)
+    production_model_file_path: str = os.path.join(model_evaluation_dir, MODEL_EVALUATION_PRODUCTION_MODEL_FILE_NAME)
+    benchmark_report_file_path: str = os.path.join(model_evaluation_dir, MODEL_EVALUATION_BENCHMARK_REPORT_FILE_NAME)
+    benchmark_enabled: bool = MODEL_EVALUATION_BENCHMARK_ENABLED
+    benchmark_single_rows: int = MODEL_EVALUATION_BENCHMARK_SINGLE_ROWS
+    benchmark_batch_rows: int = MODEL_EVALUATION_BENCHMARK_BATCH_ROWS
+    benchmark_repeats: int = MODEL_EVALUATION_BENCHMARK_REPEATS
+    max_p99_latency_ratio: Optional[float] = MODEL_EVALUATION_MAX_P99_LATENCY_RATIO
+    min_throughput_ratio: Optional[float] = MODEL_EVALUATION_MIN_THROUGHPUT_RATIO
+    max_load_time_ratio: Optional[float] = MODEL_EVALUATION_MAX_LOAD_TIME_RATIO
+    max_model_size_ratio: Optional[float] = MODEL_EVALUATION_MAX_MODEL_SIZE_RATIO
+    min_regression_ms: float = MODEL_EVALUATION_MIN_REGRESSION_MS
+    throughput_noise_floor: float = MODEL_EVALUATION_THROUGHPUT_NOISE_FLOOR
 
 @dataclass
 class ModelPusherConfig:
@@ -69,6 +174,10 @@ class ModelPusherConfig:
     s3_artifact_prefix: str = S3_ARTIFACTS_PREFIX
     s3_logs_prefix: str = S3_LOGS_PREFIX
     s3_categories_json_prefix: str = S3_CATEGORIES_JSON_PREFIX
+    local_data_profile_path: str = os.path.join(training_pipeline_congfig.artifact_dir,DATA_VALIDATION_DIR_NAME,DATA_VALIDATION_PROFILE_FILE_NAME)
+    s3_data_profile_key_path: str = f"{MODEL_S3_PRIFIX_KEY.rstrip('/')}/{DATA_VALIDATION_PROFILE_FILE_NAME}"
+    local_watermark_file_path: str = os.path.join(training_pipeline_congfig.artifact_dir,MODEL_WATERMARK_FILE_NAME)
+    s3_watermark_key_path: str = f"{MODEL_S3_PRIFIX_KEY.rstrip('/')}/{MODEL_WATERMARK_FILE_NAME}"
 
 @dataclass
 class VehiclePredictorConfig:
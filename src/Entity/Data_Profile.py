@@ -0,0 +1,254 @@
+import os
+import sys
+import json
+import numpy as np
+from typing import Optional, Iterable, Iterator, List
+from logging import Logger
+from pandas import DataFrame
+from pandas.api.types import CategoricalDtype
+from src.Exception import MyException
+from src.Logger import configure_logger
+
+# Smoothing added to empty buckets so PSI stays finite
+_PSI_EPSILON = 1e-4
+# Number of reference-quantile buckets PSI is computed over
+_PSI_BUCKETS = 10
+
+
+class DataProfile:
+    """
+    Compact, mergeable per-column profile of a dataset.
+
+    Numeric columns are summarized by a histogram over fixed inner edges plus two
+    open-ended outer bins (below the first and from the last edge on), categorical
+    columns by a frequency table, and every column by its null count. Profiles are
+    built in a single streaming pass over a fine sketch of the schema `value_ranges`;
+    the profile stored next to the model (`with_quantile_edges`) has bins at the
+    quantiles of its training data, so new data can later be compared against the
+    training data without reloading it.
+    """
+
+    def __init__(self, numeric_edges: dict, categorical_columns: List[str], logger: Optional[Logger] = None):
+        """
+        Args:
+            numeric_edges (dict): Column name -> increasing inner bin edges, the outer bins are open-ended.
+            categorical_columns (List[str]): Columns profiled with frequency tables.
+            logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+        """
+        self.logger = logger or configure_logger(
+                                        logger_name=__name__,
+                                        level="DEBUG",
+                                        to_console=True,
+                                        to_file=True,
+                                        log_file_name=__name__
+                                        )
+        self.numeric_edges = {column: np.asarray(edges, dtype=np.float64) for column, edges in numeric_edges.items()}
+        self.categorical_columns = list(categorical_columns)
+        self.n_rows = 0
+        self.histograms = {column: np.zeros(len(edges) + 1, dtype=np.int64) for column, edges in self.numeric_edges.items()}
+        self.frequencies = {column: {} for column in self.categorical_columns}
+        self.null_counts = {column: 0 for column in [*self.numeric_edges, *self.categorical_columns]}
+
+    @classmethod
+    def from_schema(cls, schema_config: dict, n_bins: int, logger: Optional[Logger] = None) -> "DataProfile":
+        """
+        Creates an empty profile for the columns described in Schema.yaml.
+
+        Columns with a finite domain (`allowed_values` and `categorical_columns`)
+        get frequency tables, the remaining `value_ranges` columns a sketch of `n_bins`
+        equal-width bins over the range plus the open outer bins, so values outside
+        the schema range are counted apart instead of inflating the edge bins.
+        Columns listed in `drop_columns` are skipped.
+        """
+        drop_columns = schema_config.get("drop_columns") or []
+        drop_columns = [drop_columns] if isinstance(drop_columns, str) else list(drop_columns)
+        categorical_columns = [column for column in dict.fromkeys([*schema_config.get("categorical_columns", []),
+                                                                   *schema_config.get("allowed_values", {})])
+                               if column not in drop_columns]
+        numeric_edges = {column: np.linspace(bounds[0], bounds[1], n_bins + 1)
+                         for column, bounds in schema_config.get("value_ranges", {}).items()
+                         if column not in drop_columns and column not in categorical_columns}
+        return cls(numeric_edges=numeric_edges, categorical_columns=categorical_columns, logger=logger)
+
+    def update(self, chunk: DataFrame) -> None:
+        """
+        Adds one chunk of data to the profile.
+        """
+        try:
+            self.n_rows += len(chunk)
+            for column, edges in self.numeric_edges.items():
+                if column not in chunk.columns:
+                    continue
+                values = chunk[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                missing = np.isnan(values)
+                self.null_counts[column] += int(missing.sum())
+                bins = np.searchsorted(edges, values[~missing], side="right")
+                self.histograms[column] += np.bincount(bins, minlength=len(edges) + 1)
+            for column in self.categorical_columns:
+                if column not in chunk.columns:
+                    continue
+                series = chunk[column]
+                self.null_counts[column] += int(series.isna().sum())
+                if not isinstance(series.dtype, CategoricalDtype):
+                    series = series.astype("category")
+                counts = np.bincount(series.cat.codes.to_numpy()[series.cat.codes.to_numpy() >= 0], minlength=len(series.cat.categories))
+                table = self.frequencies[column]
+                for level, count in zip(series.cat.categories.astype(str), counts):
+                    if count:
+                        table[level] = table.get(level, 0) + int(count)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def observe(self, chunks: Iterable[DataFrame]) -> Iterator[DataFrame]:
+        """
+        Profiles chunks as they pass through, so profiling can share the
+        streaming pass of another consumer (e.g. the schema validator).
+        """
+        for chunk in chunks:
+            self.update(chunk)
+            yield chunk
+
+    def quantiles(self, column: str, probabilities: Iterable[float]) -> np.ndarray:
+        """
+        Approximates quantiles of a numeric column from its histogram (linear interpolation
+        within bins, quantiles inside the open outer bins are clamped to the outer edges).
+        """
+        edges, counts = self.numeric_edges[column], self.histograms[column]
+        cdf = np.cumsum(counts)[:-1] / max(counts.sum(), 1)
+        return np.interp(np.asarray(list(probabilities), dtype=np.float64), cdf, edges)
+
+    def counts_on(self, column: str, edges: np.ndarray) -> np.ndarray:
+        """
+        Re-bins the histogram of a numeric column onto other inner edges (plus open outer bins).
+
+        Exact for edges that are edges of this profile, linear within a bin otherwise.
+        """
+        counts = self.histograms[column]
+        below = np.interp(np.asarray(edges, dtype=np.float64), self.numeric_edges[column], np.cumsum(counts)[:-1])
+        return np.diff(np.concatenate([[0.0], below, [float(counts.sum())]]))
+
+    def with_quantile_edges(self, n_bins: int) -> "DataProfile":
+        """
+        Returns a copy whose numeric bins hold about equal shares of the profiled rows.
+
+        The inner edges are the 1/n_bins, 2/n_bins, ... quantiles, snapped to edges of
+        this profile so the counts stay exact (bins that would be narrower than a sketch
+        bin are merged). This is the profile stored as the drift reference: its bins
+        follow the training distribution instead of the schema range.
+        """
+        numeric_edges = {}
+        for column, edges in self.numeric_edges.items():
+            below = np.cumsum(self.histograms[column])[:-1]
+            total = self.histograms[column].sum()
+            if total == 0:
+                numeric_edges[column] = edges
+                continue
+            indices = np.unique(np.searchsorted(below, total * np.arange(1, n_bins) / n_bins, side="left"))
+            numeric_edges[column] = edges[indices[indices < len(edges)]]
+        profile = DataProfile(numeric_edges=numeric_edges, categorical_columns=self.categorical_columns, logger=self.logger)
+        profile.n_rows = self.n_rows
+        profile.histograms = {column: np.rint(self.counts_on(column, edges)).astype(np.int64) for column, edges in numeric_edges.items()}
+        profile.frequencies = {column: dict(table) for column, table in self.frequencies.items()}
+        profile.null_counts = dict(self.null_counts)
+        return profile
+
+    def compare(self, reference: "DataProfile", psi_threshold: float, ks_threshold: float, min_rows: int = 0) -> dict:
+        """
+        Compares this profile against a reference profile using only the sketches.
+
+        Numeric columns are re-binned onto the reference's bin edges and get the
+        Population Stability Index over reference-quantile buckets and the
+        Kolmogorov-Smirnov statistic over those edges,
+        categorical columns get PSI over the union of levels, all columns get the
+        change in null rate.
+
+        Args:
+            reference (DataProfile): Profile of the data the current model was trained on.
+            psi_threshold (float): PSI above which a column counts as drifted.
+            ks_threshold (float): KS statistic above which a numeric column counts as drifted.
+            min_rows (int): Profiled rows needed before any column counts as drifted; on fewer rows
+                the PSI and KS of a sample from the reference distribution alone exceed the thresholds.
+
+        Returns:
+            dict: Per-column statistics, the list of drifted columns and an overall `drift_detected` flag.
+        """
+        try:
+            columns = {}
+            for column in self.histograms:
+                if column not in reference.histograms:
+                    continue
+                ref_counts = reference.histograms[column]
+                counts = self.counts_on(column, reference.numeric_edges[column])
+                ref_cdf = np.cumsum(ref_counts) / max(ref_counts.sum(), 1)
+                cur_cdf = np.cumsum(counts) / max(counts.sum(), 1)
+                # Group the fine bins into buckets holding ~equal reference mass (deciles)
+                buckets = np.minimum((np.concatenate([[0.0], ref_cdf[:-1]]) * _PSI_BUCKETS).astype(int), _PSI_BUCKETS - 1)
+                psi = _psi(np.bincount(buckets, weights=ref_counts, minlength=_PSI_BUCKETS),
+                           np.bincount(buckets, weights=counts, minlength=_PSI_BUCKETS))
+                ks = float(np.max(np.abs(ref_cdf - cur_cdf))) if len(counts) else 0.0
+                columns[column] = {"type": "numeric", "psi": psi, "ks": ks,
+                                   "drifted": psi > psi_threshold or ks > ks_threshold}
+            for column, table in self.frequencies.items():
+                if column not in reference.frequencies:
+                    continue
+                ref_table = reference.frequencies[column]
+                levels = sorted(set(table) | set(ref_table))
+                psi = _psi(np.array([ref_table.get(level, 0) for level in levels], dtype=np.float64),
+                           np.array([table.get(level, 0) for level in levels], dtype=np.float64))
+                columns[column] = {"type": "categorical", "psi": psi,
+                                   "new_levels": sorted(set(table) - set(ref_table)),
+                                   "drifted": psi > psi_threshold}
+            for column, stats in columns.items():
+                stats["null_rate_change"] = self.null_counts[column] / max(self.n_rows, 1) - reference.null_counts.get(column, 0) / max(reference.n_rows, 1)
+
+            if self.n_rows < min_rows:
+                for stats in columns.values():
+                    stats["drifted"] = False
+            drifted_columns = [column for column, stats in columns.items() if stats["drifted"]]
+            return {"drift_detected": bool(drifted_columns),
+                    "drifted_columns": drifted_columns,
+                    "psi_threshold": psi_threshold,
+                    "ks_threshold": ks_threshold,
+                    "min_rows": min_rows,
+                    "reference_rows": reference.n_rows,
+                    "current_rows": self.n_rows,
+                    "columns": columns}
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def to_dict(self) -> dict:
+        return {"n_rows": self.n_rows,
+                "numeric": {column: {"edges": edges.tolist(), "counts": self.histograms[column].tolist()}
+                            for column, edges in self.numeric_edges.items()},
+                "categorical": self.frequencies,
+                "null_counts": self.null_counts}
+
+    @classmethod
+    def from_dict(cls, payload: dict, logger: Optional[Logger] = None) -> "DataProfile":
+        # Profiles saved before the open outer bins had closed outer edges that out-of-range values were clipped into
+        numeric_edges = {column: sketch["edges"][1:-1] if len(sketch["counts"]) == len(sketch["edges"]) - 1 else sketch["edges"]
+                         for column, sketch in payload["numeric"].items()}
+        profile = cls(numeric_edges=numeric_edges, categorical_columns=list(payload["categorical"]), logger=logger)
+        profile.n_rows = int(payload["n_rows"])
+        profile.histograms = {column: np.asarray(sketch["counts"], dtype=np.int64) for column, sketch in payload["numeric"].items()}
+        profile.frequencies = {column: dict(table) for column, table in payload["categorical"].items()}
+        profile.null_counts = dict(payload["null_counts"])
+        return profile
+
+    def save(self, file_path: str) -> None:
+        """
+        Writes the profile as JSON.
+        """
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "w") as profile_file:
+                json.dump(self.to_dict(), profile_file)
+            self.logger.info(f"Data profile saved at: {file_path} ({os.path.getsize(file_path)/1024:.2f} KB)")
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+
+def _psi(expected_counts: np.ndarray, actual_counts: np.ndarray) -> float:
+    expected = expected_counts / max(expected_counts.sum(), 1) + _PSI_EPSILON
+    actual = actual_counts / max(actual_counts.sum(), 1) + _PSI_EPSILON
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
@@ -4,7 +4,7 @@ from logging import Logger
 
 
 from pandas import DataFrame
-from numpy import ndarray
+from numpy import ndarray, concatenate, empty
 from sklearn.pipeline import Pipeline
 
 from src.Exception import MyException
@@ -31,7 +31,7 @@ class MyModel:
         Initializes the MyModel class with a preprocessor and trained model.
 
         Args:
-            preprocessing_object (Pipeline): The fitted preprocessing pipeline.
+            preprocessing_object (Pipeline): The fitted preprocessing object (raw records -> model matrix).
             trained_model_object (BaseEstimator): The trained model object.
             logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
         """
@@ -47,13 +47,14 @@ class MyModel:
 
 
 
-    def predict(self, x_test: Union[DataFrame, ndarray], do_scaling: bool = False) -> DataFrame:
+    def predict(self, x_test: Union[DataFrame, ndarray], do_scaling: Optional[bool] = None) -> DataFrame:
         """
         Performs prediction using the trained model.
 
         Args:
-            x_test (Union[DataFrame, ndarray]): Input features to predict on.
-            do_scaling (bool): Whether to apply preprocessing_object.transform() before prediction.
+            x_test (Union[DataFrame, ndarray]): Raw schema records (DataFrame) or an already preprocessed model matrix (ndarray).
+            do_scaling (Optional[bool]): Whether to apply preprocessing_object.transform() before prediction.
+                By default it is inferred from the input: DataFrames are preprocessed, arrays are not.
 
         Returns:
             DataFrame: DataFrame containing predicted values.
@@ -62,6 +63,8 @@ class MyModel:
             self.logger.info("Starting prediction process.")
 
             # Step 1: Apply preprocessing if needed
+            if do_scaling is None:
+                do_scaling = isinstance(x_test, DataFrame)
             if do_scaling:
                 self.logger.debug("Applying preprocessing transformations using the trained pipeline...")
                 transformed_feature = self.preprocessing_object.transform(x_test)
@@ -75,7 +78,6 @@ class MyModel:
             predictions = self.trained_model_object.predict(transformed_feature)
 
             self.logger.debug("Prediction completed successfully.")
-            print(f"##### Prediction: {predictions} #####")
             return DataFrame(predictions, columns=["prediction"])
 
         except Exception as e:
@@ -83,6 +85,26 @@ class MyModel:
             raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
 
 
+    def predict_batch(self, records: DataFrame, chunk_size: int = 100_000) -> ndarray:
+        """
+        Scores a large batch of raw schema records, preprocessing and predicting
+        `chunk_size` rows at a time so memory does not grow with the batch size.
+
+        Args:
+            records (DataFrame): Raw schema records, extra columns (`id`, the target) are ignored.
+            chunk_size (int): Rows preprocessed and predicted per step.
+
+        Returns:
+            ndarray: Predicted classes, in the order of `records`.
+        """
+        try:
+            self.logger.info(f"Scoring {len(records)} records in chunks of {chunk_size}...")
+            predictions = [self.trained_model_object.predict(self.preprocessing_object.transform(records.iloc[start:start + chunk_size]))
+                           for start in range(0, len(records), chunk_size)]
+            return concatenate(predictions) if predictions else empty(0)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
     def __repr__(self):
         return f"{type(self.trained_model_object).__name__}()"
 
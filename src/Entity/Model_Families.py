@@ -0,0 +1,217 @@
+from dataclasses import dataclass, field
+import numpy as np
+from typing import Dict, Optional, Tuple
+from sklearn.base import ClassifierMixin
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.utils.class_weight import compute_sample_weight
+from src.Constants import (MODEL_TRAINER_MODEL_NAME, MODEL_TRAINER_N_ESTIMATORS, MODEL_TRAINER_MIN_SAMPLES_SPLIT, MODEL_TRAINER_MIN_SAMPLES_LEAF,
+                           MIN_SAMPLES_SPLIT_MAX_DEPTH, MIN_SAMPLES_SPLIT_CRITERION, MIN_SAMPLES_SPLIT_RANDOM_STATE)
+
+
+@dataclass(frozen=True)
+class ModelFamily:
+    """
+    Estimator the model trainer can fit, selected by `model.name` in Config/Model.yaml.
+
+    Args:
+        estimator (type): scikit-learn classifier class.
+        budget_param (str): Parameter sizing the ensemble (trees, boosting iterations or epochs), used as search budget.
+        uses_n_jobs (bool): Whether the estimator takes `n_jobs` (HistGradientBoosting uses all OpenMP threads instead).
+        supports_warm_start (bool): Whether new trees can be added to the production model on retrain.
+        supports_partial_fit (bool): Whether the production model can be updated with new documents only (`/train/incremental`).
+        scale_invariant (bool): Whether fits do not depend on per-feature affine scaling (tree ensembles), so encoded
+            features can be used unscaled (e.g. by the learning curve).
+        defaults (dict): Hyperparameters applied under the `model.params` of the YAML.
+    """
+    estimator: type
+    budget_param: str
+    uses_n_jobs: bool
+    supports_warm_start: bool
+    supports_partial_fit: bool = False
+    scale_invariant: bool = False
+    defaults: Dict = field(default_factory=dict)
+
+
+MODEL_FAMILIES: Dict[str, ModelFamily] = {
+    "random_forest": ModelFamily(estimator=RandomForestClassifier,
+                                 budget_param="n_estimators",
+                                 uses_n_jobs=True,
+                                 supports_warm_start=True,
+                                 scale_invariant=True,
+                                 defaults={"n_estimators": MODEL_TRAINER_N_ESTIMATORS,
+                                           "criterion": MIN_SAMPLES_SPLIT_CRITERION,
+                                           "min_samples_split": MODEL_TRAINER_MIN_SAMPLES_SPLIT,
+                                           "min_samples_leaf": MODEL_TRAINER_MIN_SAMPLES_LEAF,
+                                           "max_depth": MIN_SAMPLES_SPLIT_MAX_DEPTH,
+                                           "random_state": MIN_SAMPLES_SPLIT_RANDOM_STATE}),
+    # Features are binned into at most `max_bins` levels once, so every split search is a histogram
+    # scan instead of a sort; early stopping holds out `validation_fraction` of the training data
+    "hist_gradient_boosting": ModelFamily(estimator=HistGradientBoostingClassifier,
+                                          budget_param="max_iter",
+                                          uses_n_jobs=False,
+                                          supports_warm_start=False,
+                                          scale_invariant=True,
+                                          defaults={"max_iter": 300,
+                                                    "learning_rate": 0.1,
+                                                    "max_leaf_nodes": 31,
+                                                    "max_bins": 255,
+                                                    "early_stopping": True,
+                                                    "validation_fraction": 0.1,
+                                                    "n_iter_no_change": 10,
+                                                    "random_state": MIN_SAMPLES_SPLIT_RANDOM_STATE}),
+    # Logistic regression fitted by averaged SGD on the scaled model matrix; `max_iter` epochs are the
+    # search budget and `partial_fit` updates the production model with the new documents only
+    "sgd_logistic": ModelFamily(estimator=SGDClassifier,
+                                budget_param="max_iter",
+                                uses_n_jobs=True,
+                                supports_warm_start=False,
+                                supports_partial_fit=True,
+                                defaults={"loss": "log_loss",
+                                          "penalty": "l2",
+                                          "alpha": 1e-4,
+                                          "max_iter": 50,
+                                          "tol": 1e-3,
+                                          "average": True,
+                                          "random_state": MIN_SAMPLES_SPLIT_RANDOM_STATE}),
+}
+
+
+def get_model_family(name: str) -> ModelFamily:
+    """
+    Looks up a model family by its `model.name`.
+
+    Raises:
+        ValueError: If the name is not registered in MODEL_FAMILIES.
+    """
+    if name not in MODEL_FAMILIES:
+        raise ValueError(f"Unknown model '{name}', expected one of {tuple(MODEL_FAMILIES)}")
+    return MODEL_FAMILIES[name]
+
+
+def get_model_name(model_config: dict) -> str:
+    """
+    Returns the `model.name` of a parsed model YAML, MODEL_TRAINER_MODEL_NAME if unset.
+    """
+    return (model_config.get("model") or {}).get("name") or MODEL_TRAINER_MODEL_NAME
+
+
+def get_model_params(model_config: dict, model_name: str, defaults: Optional[dict] = None) -> dict:
+    """
+    Resolves the hyperparameters of a model family.
+
+    Args:
+        model_config (dict): Parsed model YAML (Config/Model.yaml).
+        model_name (str): Model family, a key of MODEL_FAMILIES.
+        defaults (Optional[dict]): Values taking precedence over the family defaults, e.g. from ModelTrainerConfig.
+
+    Returns:
+        dict: Family defaults, then `defaults`, then the `model.params.<model_name>` section of the YAML.
+    """
+    params = {**get_model_family(model_name).defaults, **(defaults or {})}
+    params.update(((model_config.get("model") or {}).get("params") or {}).get(model_name) or {})
+    return params
+
+
+def build_model(name: str, params: dict, n_jobs: Optional[int] = None, class_weight: Optional[str] = None) -> ClassifierMixin:
+    """
+    Instantiates an unfitted estimator of the given family.
+
+    Args:
+        name (str): Model family, a key of MODEL_FAMILIES.
+        params (dict): Hyperparameters of the estimator.
+        n_jobs (Optional[int]): Cores to train on, ignored by families that do not take `n_jobs`.
+        class_weight (Optional[str]): "balanced" to reweight the classes, None otherwise.
+
+    Returns:
+        ClassifierMixin: The estimator.
+    """
+    family = get_model_family(name)
+    params = {**params, "class_weight": class_weight}
+    if family.uses_n_jobs and n_jobs is not None:
+        params["n_jobs"] = n_jobs
+    return family.estimator(**params)
+
+
+def ensemble_size(model: ClassifierMixin) -> Optional[int]:
+    """
+    Returns the number of trees of a fitted forest, boosting iterations of a fitted
+    gradient boosting model (after early stopping) or epochs of a fitted SGD model,
+    summed over the segment models of a `SegmentedModel`, None for other estimators.
+    """
+    if hasattr(model, "segment_models_"):
+        sizes = [ensemble_size(segment_model) for segment_model in model.segment_models_]
+        return None if None in sizes else sum(sizes)
+    if hasattr(model, "estimators_"):
+        return len(model.estimators_)
+    return getattr(model, "n_iter_", None)
+
+
+def balanced_sample_weight(y: np.ndarray, sample_weight: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Returns row weights that give every class the same total weight, like `class_weight="balanced"`,
+    but counting each row `sample_weight` times. On compacted training data, where a unique row
+    stands for all its duplicates, this balances the classes of the original rows rather than
+    of the unique rows (whose class ratio differs when the classes have different duplicate rates).
+    Rows with zero weight (e.g. a validation hold-out) stay at zero and do not count.
+
+    Args:
+        y (np.ndarray): Labels.
+        sample_weight (Optional[np.ndarray]): Row weights, 1 per row if None.
+
+    Returns:
+        np.ndarray: `sample_weight` times `total weight / (n_classes * class weight)` of the row's class.
+    """
+    weights = np.ones(len(y), dtype=np.float64) if sample_weight is None else np.asarray(sample_weight, dtype=np.float64)
+    _, inverse = np.unique(np.asarray(y), return_inverse=True)
+    class_totals = np.bincount(inverse.ravel(), weights=weights)
+    factors = np.zeros(len(class_totals), dtype=np.float64)
+    present = class_totals > 0
+    factors[present] = weights.sum() / (present.sum() * class_totals[present])
+    return weights * factors[inverse.ravel()]
+
+
+def fit_weights(class_weight: Optional[str], y: np.ndarray, sample_weight: Optional[np.ndarray] = None
+                ) -> Tuple[Optional[str], Optional[np.ndarray]]:
+    """
+    Resolves the `class_weight` and `sample_weight` to fit a model with.
+
+    sklearn derives `class_weight="balanced"` from the raw label counts and ignores the row weights,
+    so with row weights the balancing is folded into them (see `balanced_sample_weight`) and
+    the estimator gets no class weight. Without row weights both are returned unchanged.
+
+    Returns:
+        Tuple[Optional[str], Optional[np.ndarray]]: Class weight of the estimator and the sample weight of `fit`.
+    """
+    if class_weight == "balanced" and sample_weight is not None:
+        return None, balanced_sample_weight(y, sample_weight)
+    return class_weight, sample_weight
+
+
+def partial_fit_model(model: ClassifierMixin, x: np.ndarray, y: np.ndarray, class_weight: Optional[str] = "balanced",
+                      chunk_size: int = 10_000) -> ClassifierMixin:
+    """
+    Updates a fitted model of a family that supports `partial_fit` with new rows, `chunk_size` rows per call.
+
+    `partial_fit` does not take `class_weight="balanced"`, so the estimator's class weight is
+    cleared and the classes of the new rows are weighted through sample weights instead.
+
+    Args:
+        model (ClassifierMixin): Fitted estimator, updated in place.
+        x (np.ndarray): New rows in the model's feature space.
+        y (np.ndarray): Their labels.
+        class_weight (Optional[str]): "balanced" to weight the classes of the new rows equally, None for their raw frequencies.
+        chunk_size (int): Rows per `partial_fit` call.
+
+    Returns:
+        ClassifierMixin: The updated estimator.
+    """
+    if not hasattr(model, "partial_fit"):
+        raise ValueError(f"{type(model).__name__} cannot be updated incrementally")
+    model.set_params(class_weight=None)
+    sample_weight = compute_sample_weight(class_weight, y) if class_weight is not None else None
+    for start in range(0, len(y), chunk_size):
+        stop = start + chunk_size
+        model.partial_fit(x[start:stop], y[start:stop], classes=model.classes_,
+                          sample_weight=sample_weight[start:stop] if sample_weight is not None else None)
+    return model
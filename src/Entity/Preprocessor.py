@@ -0,0 +1,167 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import StandardScaler, MinMaxScaler, FunctionTransformer
+from src.Logger import configure_logger
+
+logger = configure_logger(logger_name=__name__, level="DEBUG", to_console=True, to_file=True, log_file_name=__name__)
+
+
+def _clean_level_name(level: str) -> str:
+    """
+    Turns a category level into a column-name friendly token, e.g. "< 1 Year" -> "lt_1_Year".
+    """
+    level = level.replace("<", "lt").replace(">", "gt")
+    return re.sub(r"[^0-9A-Za-z]+", "_", level).strip("_")
+
+
+class CategoricalEncoder(BaseEstimator, TransformerMixin):
+    """
+    Fitted one-hot encoder that replaces `pd.get_dummies(drop_first=True)` + rename map.
+
+    The levels of every categorical column are learned once at fit time and
+    persisted with the preprocessing object, so the output layout no longer
+    depends on which levels happen to be present in a frame. `transform` writes
+    the passthrough columns and the indicator columns directly into one
+    preallocated float32 matrix. Levels not seen during fit (and missing values)
+    are encoded as all zeros, the same as the dropped reference level.
+
+    Output column order and names match the previous `get_dummies` output:
+    passthrough columns in input order, then `<column>_<level>` per encoded column.
+    """
+
+    def __init__(self, columns: List[str], drop_first: bool = True):
+        """
+        Args:
+            columns (List[str]): Categorical columns to encode.
+            drop_first (bool): Drop the first (sorted) level of each column, as `get_dummies(drop_first=True)`.
+        """
+        self.columns = columns
+        self.drop_first = drop_first
+
+    def fit(self, X: pd.DataFrame, y=None) -> "CategoricalEncoder":
+        self.__dict__.pop("levels_", None)
+        return self.partial_fit(X)
+
+    def partial_fit(self, X: pd.DataFrame, y=None) -> "CategoricalEncoder":
+        """
+        Adds the levels of one chunk of training data, so the encoder can be fitted
+        on a stream of chunks. Fitting on all chunks gives the same encoder as `fit`
+        on the concatenated data.
+        """
+        seen_levels = getattr(self, "levels_", {column: [] for column in self.columns})
+        self.passthrough_columns_ = [column for column in X.columns if column not in self.columns]
+        # All levels seen in training (sorted like get_dummies) and the ones that get an indicator column
+        self.levels_ = {column: sorted(set(seen_levels[column]).union(X[column].dropna().astype(str).unique().tolist()))
+                        for column in self.columns}
+        self.categories_ = {column: levels[1:] if self.drop_first else levels for column, levels in self.levels_.items()}
+        self.feature_names_out_ = np.array(self.passthrough_columns_ +
+                                           [f"{column}_{_clean_level_name(level)}"
+                                            for column in self.columns for level in self.categories_[column]], dtype=object)
+        return self
+
+    def transform(self, X: pd.DataFrame) -> np.ndarray:
+        n_passthrough = len(self.passthrough_columns_)
+        out = np.zeros((len(X), len(self.feature_names_out_)), dtype=np.float32)
+        out[:, :n_passthrough] = X[self.passthrough_columns_].to_numpy(dtype=np.float32, na_value=np.nan)
+        rows = np.arange(len(X))
+        offset = n_passthrough
+        for column in self.columns:
+            categories = self.categories_[column]
+            codes = pd.Categorical(X[column].astype(str), categories=self.levels_[column]).codes
+            n_unseen = int((codes < 0).sum())
+            if n_unseen:
+                logger.warning(f"{n_unseen} values of '{column}' not seen during fit, encoded as all zeros")
+            # Shift codes past the dropped reference level, anything below 0 gets no indicator
+            codes = codes - (len(self.levels_[column]) - len(categories))
+            hit = codes >= 0
+            out[rows[hit], offset + codes[hit]] = 1.0
+            offset += len(categories)
+        return out
+
+    def get_feature_names_out(self, input_features: Optional[List[str]] = None) -> np.ndarray:
+        return self.feature_names_out_
+
+
+class FusedPreprocessor(BaseEstimator, TransformerMixin):
+    """
+    The persisted preprocessing object: raw schema records in, model matrix out.
+
+    Combines the fitted `CategoricalEncoder` with the fitted StandardScaler/MinMaxScaler
+    ColumnTransformer. The scalers are folded into one per-column affine map
+    (`x * scale_ + offset_`, in the ColumnTransformer's output column order) that is
+    applied to the encoder's float32 output, so a batch of raw records becomes the
+    model matrix in one vectorized pass without any pandas intermediates. Columns the
+    encoder was not fitted on (`id`, the target) are ignored, so records can be passed
+    as they come from the database, a CSV or the API.
+    """
+
+    def __init__(self, encoder: CategoricalEncoder, scaler: ColumnTransformer):
+        """
+        Args:
+            encoder (CategoricalEncoder): Fitted categorical encoder.
+            scaler (ColumnTransformer): Scalers fitted on the encoder's output (selected by column position).
+        """
+        self.encoder = encoder
+        self.scaler = scaler
+
+    def fit(self, X=None, y=None) -> "FusedPreprocessor":
+        """
+        Folds the already fitted scalers into `column_order_`, `scale_` and `offset_` (X is not used).
+        """
+        column_order, scale, offset = [], [], []
+        for name, transformer, columns in self.scaler.transformers_:
+            columns = list(columns)
+            if isinstance(transformer, str) and transformer == "drop" or not columns:
+                continue
+            if isinstance(transformer, StandardScaler):
+                column_scale = 1.0 / transformer.scale_ if transformer.with_std else np.ones(len(columns))
+                column_offset = -transformer.mean_ * column_scale if transformer.with_mean else np.zeros(len(columns))
+            elif isinstance(transformer, MinMaxScaler) and not transformer.clip:
+                column_scale, column_offset = transformer.scale_, transformer.min_
+            elif (isinstance(transformer, str) and transformer == "passthrough"
+                  # Recent scikit-learn stores a passthrough remainder as an identity FunctionTransformer
+                  or isinstance(transformer, FunctionTransformer) and transformer.func is None):
+                column_scale, column_offset = np.ones(len(columns)), np.zeros(len(columns))
+            else:
+                raise TypeError(f"Cannot fold transformer '{name}' ({type(transformer).__name__}) into the fused preprocessor")
+            column_order.extend(columns)
+            scale.extend(column_scale)
+            offset.extend(column_offset)
+        self.column_order_ = np.array(column_order, dtype=np.intp)
+        self.scale_ = np.array(scale, dtype=np.float32)
+        self.offset_ = np.array(offset, dtype=np.float32)
+        return self
+
+    def scale(self, encoded: np.ndarray) -> np.ndarray:
+        """
+        Applies only the scaling part to rows that are already encoded (e.g. resampled training data).
+        """
+        out = np.take(encoded, self.column_order_, axis=1).astype(np.float32, copy=False)
+        out *= self.scale_
+        out += self.offset_
+        return out
+
+    def transform(self, X: pd.DataFrame) -> np.ndarray:
+        return self.scale(self.encoder.transform(X))
+
+    def convert(self, X: np.ndarray, source: "FusedPreprocessor") -> np.ndarray:
+        """
+        Re-expresses a model matrix produced by `source` in this preprocessor's scaling,
+        e.g. to train on new data in the feature space of an existing model. Both must
+        produce the same features; indicator columns are unaffected.
+        """
+        if list(source.get_feature_names_out()) != list(self.get_feature_names_out()):
+            raise ValueError("Preprocessors produce different features, the model matrix cannot be converted.")
+        scale = self.scale_ / source.scale_
+        offset = self.offset_ - source.offset_ * scale
+        out = np.array(X, dtype=np.float32)
+        out *= scale
+        out += offset
+        return out
+
+    def get_feature_names_out(self, input_features: Optional[List[str]] = None) -> np.ndarray:
+        return self.encoder.get_feature_names_out()[self.column_order_]
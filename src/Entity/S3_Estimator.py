@@ -1,3 +1,5 @@
+import os
+import json
 from src.Cloud_Storage.AWS_Storage import SimpleStorageService
 from src.Exception import MyException
 from src.Entity.Estimator import MyModel
@@ -57,6 +59,17 @@ class Current_S3_Vehicle_Insurance_Estimator:
             print(e)
             return False
 
+    def get_model_version(self) -> str:
+        """
+        Returns the S3 ETag of the model file, which changes whenever a new model is pushed.
+        """
+        try:
+            model_object = self.s3.get_file_object(filename=self.model_s3_key, bucket_name=self.bucket_name)
+            model_object = model_object[0] if isinstance(model_object, list) else model_object
+            return model_object.e_tag.strip('"')
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
     def load_model(self)->MyModel:
         """
         Loads the serialized model from the configured S3 path and returns it.
@@ -72,6 +85,26 @@ class Current_S3_Vehicle_Insurance_Estimator:
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
         
+    def download_model(self, local_file_path: str) -> str:
+        """
+        Downloads the serialized model from the configured S3 path without loading it.
+
+        Args:
+            local_file_path (str): Where the model file is written.
+
+        Returns:
+            str: `local_file_path`.
+        """
+        try:
+            model_object = self.s3.get_file_object(filename=self.model_s3_key, bucket_name=self.bucket_name)
+            model_object = model_object[0] if isinstance(model_object, list) else model_object
+            os.makedirs(os.path.dirname(local_file_path) or ".", exist_ok=True)
+            with open(local_file_path, "wb") as model_file:
+                model_file.write(self.s3.read_s3_object(s3_object=model_object, decode=False))
+            return local_file_path
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
     def save_model_to_s3(self,local_model_file_path: str, remove:bool=False)->None:
         """
         Uploads a local model file to the S3 bucket.
@@ -93,13 +126,55 @@ class Current_S3_Vehicle_Insurance_Estimator:
                 raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
 
 
-    def predict(self, x_test: Union[DataFrame, ndarray], do_scaling: bool = False)-> DataFrame:
+    def load_watermark(self, watermark_s3_key: str) -> Optional[dict]:
+        """
+        Loads the data watermark of the model (newest MongoDB document it was trained on).
+
+        Args:
+            watermark_s3_key (str): Key of the watermark JSON inside the S3 bucket.
+
+        Returns:
+            Optional[dict]: The watermark, or None if there is none or it was written for another model version
+                (a model pushed without watermark leaves the old one behind).
+        """
+        try:
+            watermark = self.s3.read_json_from_s3(s3_file_key=watermark_s3_key, bucket_name=self.bucket_name)
+            if watermark is None or watermark.get("model_version") != self.get_model_version():
+                return None
+            return watermark
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def save_watermark(self, watermark: dict, local_file_path: str, watermark_s3_key: str) -> dict:
+        """
+        Stamps a watermark with the version of the model currently in S3 and uploads it next to the model.
+        Call it right after `save_model_to_s3`.
+
+        Args:
+            watermark (dict): Watermark fields (`last_document_id`, `incremental_updates`, ...).
+            local_file_path (str): Local copy of the watermark JSON.
+            watermark_s3_key (str): Key of the watermark JSON inside the S3 bucket.
+
+        Returns:
+            dict: The uploaded watermark.
+        """
+        try:
+            watermark = {**watermark, "model_version": self.get_model_version()}
+            os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
+            with open(local_file_path, "w") as watermark_file:
+                json.dump(watermark, watermark_file, indent=2)
+            self.s3.upload_file_to_s3(from_filename=local_file_path, to_filename=watermark_s3_key, bucket_name=self.bucket_name, remove=False)
+            return watermark
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def predict(self, x_test: Union[DataFrame, ndarray], do_scaling: Optional[bool] = None)-> DataFrame:
         """
         Predicts the output using the loaded model for the given test data.
 
         Args:
-            x_test (Union[DataFrame, ndarray]): Input features to predict on.
-            do_scaling (bool): If True, applies preprocessing (scaling) before prediction.
+            x_test (Union[DataFrame, ndarray]): Raw schema records (DataFrame) or an already preprocessed model matrix (ndarray).
+            do_scaling (Optional[bool]): If True, applies preprocessing before prediction, inferred from the input type by default.
 
         Returns:
             DataFrame: DataFrame containing prediction results.
@@ -117,3 +192,21 @@ class Current_S3_Vehicle_Insurance_Estimator:
 
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def predict_batch(self, records: DataFrame, chunk_size: int = 100_000) -> ndarray:
+        """
+        Scores a large batch of raw schema records in chunks (see `MyModel.predict_batch`).
+
+        Args:
+            records (DataFrame): Raw schema records.
+            chunk_size (int): Rows preprocessed and predicted per step.
+
+        Returns:
+            ndarray: Predicted classes.
+        """
+        try:
+            if self.loaded_model is None:
+                self.loaded_model = self.load_model()
+            return self.loaded_model.predict_batch(records=records, chunk_size=chunk_size)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
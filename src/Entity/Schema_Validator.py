@@ -0,0 +1,314 @@
+import sys
+import time
+import numpy as np
+from typing import Optional, Iterable, Tuple, List
+from logging import Logger
+from pandas import DataFrame, to_numeric
+from pandas.api.types import is_integer_dtype, is_float_dtype, is_bool_dtype, is_object_dtype, is_string_dtype, CategoricalDtype
+from src.Exception import MyException
+from src.Logger import configure_logger
+
+
+# Schema dtype name -> check that an actual column dtype is acceptable for it
+_DTYPE_CHECKS = {
+    "int": is_integer_dtype,
+    "float": is_float_dtype,
+    "bool": is_bool_dtype,
+    "object": lambda dtype: is_object_dtype(dtype) or is_string_dtype(dtype) or isinstance(dtype, CategoricalDtype),
+}
+
+MAX_REPORTED_VALUES = 5
+
+
+class SchemaValidator:
+    """
+    Validation engine compiled once from Schema.yaml.
+
+    All rules (column presence, dtypes, null rates, allowed value domains and
+    numeric ranges) are turned into arrays and lookups up front, every chunk
+    is then checked with a handful of vectorized operations. State is kept per
+    call, so one compiled validator can check several datasets concurrently.
+    """
+
+    def __init__(self, schema_config: dict, logger: Optional[Logger] = None):
+        """
+        Compiles the schema into validation rules.
+
+        Args:
+            schema_config (dict): Parsed contents of Schema.yaml.
+            logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+        """
+        self.logger = logger or configure_logger(
+                                        logger_name=__name__,
+                                        level="DEBUG",
+                                        to_console=True,
+                                        to_file=True,
+                                        log_file_name=__name__
+                                        )
+        try:
+            self.expected_dtypes = {list(d.keys())[0]: list(d.values())[0] for d in schema_config["columns"]}
+            self.expected_columns = list(self.expected_dtypes)
+            self.max_null_rate = float(schema_config.get("max_null_rate", 0.0))
+            self.allowed_values = {column: np.array([str(value) for value in values], dtype=object)
+                                   for column, values in schema_config.get("allowed_values", {}).items()}
+            # Numeric domains (e.g. binary flags) are compared as numbers, without string conversion
+            self.allowed_numeric = {column: np.array(values, dtype=np.float64)
+                                    for column, values in schema_config.get("allowed_values", {}).items()
+                                    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values)}
+            value_ranges = schema_config.get("value_ranges", {})
+            self.range_columns = list(value_ranges)
+            self.range_lower = np.array([bounds[0] for bounds in value_ranges.values()], dtype=np.float64)
+            self.range_upper = np.array([bounds[1] for bounds in value_ranges.values()], dtype=np.float64)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def _new_state(self) -> dict:
+        return {
+            "n_rows": 0,
+            "missing_columns": set(),
+            "unexpected_columns": set(),
+            "dtype_mismatches": {},
+            "null_counts": {column: 0 for column in self.expected_columns},
+            "domain_violations": {column: 0 for column in self.allowed_values},
+            "domain_examples": {column: set() for column in self.allowed_values},
+            "range_violations": np.zeros(len(self.range_columns), dtype=np.int64),
+            "range_min": np.full(len(self.range_columns), np.inf),
+            "range_max": np.full(len(self.range_columns), -np.inf),
+            "timings": {check: 0.0 for check in ("column_presence", "dtypes", "null_rate", "value_domain", "value_range")},
+        }
+
+    def _update(self, state: dict, chunk: DataFrame) -> None:
+        timings = state["timings"]
+        state["n_rows"] += len(chunk)
+        present = set(chunk.columns)
+
+        start = time.perf_counter()
+        state["missing_columns"].update(column for column in self.expected_columns if column not in present)
+        state["unexpected_columns"].update(present.difference(self.expected_dtypes))
+        timings["column_presence"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for column, expected in self.expected_dtypes.items():
+            if column in present and not _DTYPE_CHECKS.get(expected, lambda dtype: str(dtype) == expected)(chunk[column].dtype):
+                state["dtype_mismatches"][column] = (str(chunk[column].dtype), expected)
+        timings["dtypes"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        null_counts = chunk[[column for column in self.expected_columns if column in present]].isna().sum()
+        for column, count in null_counts.items():
+            state["null_counts"][column] += int(count)
+        timings["null_rate"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for column, allowed in self.allowed_values.items():
+            if column not in present:
+                continue
+            series = chunk[column]
+            if isinstance(series.dtype, CategoricalDtype):
+                # Only the (few) category levels need to be compared, not every row
+                levels = series.cat.categories.astype(str).to_numpy(dtype=object)
+                bad_levels = ~np.isin(levels, allowed)
+                invalid = bad_levels[series.cat.codes.to_numpy()] & (series.cat.codes.to_numpy() >= 0)
+            elif column in self.allowed_numeric and (is_integer_dtype(series.dtype) or is_float_dtype(series.dtype)):
+                invalid = series.notna().to_numpy() & ~np.isin(series.to_numpy(), self.allowed_numeric[column])
+            else:
+                invalid = series.notna().to_numpy() & ~np.isin(series.astype(str).to_numpy(dtype=object), allowed)
+            n_invalid = int(invalid.sum())
+            if n_invalid:
+                state["domain_violations"][column] += n_invalid
+                examples = state["domain_examples"][column]
+                if len(examples) < MAX_REPORTED_VALUES:
+                    examples.update(series[invalid].astype(str).unique()[:MAX_REPORTED_VALUES - len(examples)].tolist())
+        timings["value_domain"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        range_idx = [i for i, column in enumerate(self.range_columns) if column in present and column not in state["dtype_mismatches"]]
+        if range_idx:
+            values = chunk[[self.range_columns[i] for i in range_idx]].to_numpy(dtype=np.float64, na_value=np.nan)
+            lower, upper = self.range_lower[range_idx], self.range_upper[range_idx]
+            with np.errstate(invalid="ignore"):
+                state["range_violations"][range_idx] += ((values < lower) | (values > upper)).sum(axis=0)
+            if len(values):
+                state["range_min"][range_idx] = np.fmin(state["range_min"][range_idx], np.nanmin(values, axis=0, initial=np.inf))
+                state["range_max"][range_idx] = np.fmax(state["range_max"][range_idx], np.nanmax(values, axis=0, initial=-np.inf))
+        timings["value_range"] += time.perf_counter() - start
+
+    def _report(self, state: dict) -> dict:
+        n_rows = max(state["n_rows"], 1)
+        null_rates = {column: count / n_rows for column, count in state["null_counts"].items() if column not in state["missing_columns"]}
+        failed_nulls = {column: rate for column, rate in null_rates.items() if rate > self.max_null_rate}
+        failed_domains = {column: {"count": count, "examples": sorted(state["domain_examples"][column])}
+                          for column, count in state["domain_violations"].items() if count}
+        failed_ranges = {column: {"count": int(state["range_violations"][i]),
+                                  "allowed": [float(self.range_lower[i]), float(self.range_upper[i])],
+                                  "observed": [float(state["range_min"][i]), float(state["range_max"][i])]}
+                         for i, column in enumerate(self.range_columns) if state["range_violations"][i]}
+        timings = {check: round(seconds * 1000, 3) for check, seconds in state["timings"].items()}
+
+        checks = {
+            "column_presence": {"passed": not state["missing_columns"] and not state["unexpected_columns"],
+                                "missing_columns": sorted(state["missing_columns"]),
+                                "unexpected_columns": sorted(state["unexpected_columns"])},
+            "dtypes": {"passed": not state["dtype_mismatches"],
+                       "mismatches": {column: {"actual": actual, "expected": expected}
+                                      for column, (actual, expected) in state["dtype_mismatches"].items()}},
+            "null_rate": {"passed": not failed_nulls, "max_null_rate": self.max_null_rate, "failed_columns": failed_nulls},
+            "value_domain": {"passed": not failed_domains, "failed_columns": failed_domains},
+            "value_range": {"passed": not failed_ranges, "failed_columns": failed_ranges},
+        }
+        for check, result in checks.items():
+            result["duration_ms"] = timings[check]
+
+        messages = []
+        if state["missing_columns"]:
+            messages.append(f"Missing columns: {sorted(state['missing_columns'])}")
+        if state["unexpected_columns"]:
+            messages.append(f"Unexpected columns: {sorted(state['unexpected_columns'])}")
+        for column, (actual, expected) in state["dtype_mismatches"].items():
+            messages.append(f"Data type mismatch in column '{column}': Expected '{expected}', Found '{actual}'")
+        for column, rate in failed_nulls.items():
+            messages.append(f"Null rate of column '{column}' is {rate:.6f} (max {self.max_null_rate})")
+        for column, failure in failed_domains.items():
+            messages.append(f"{failure['count']} values of column '{column}' outside allowed values, e.g. {failure['examples']}")
+        for column, failure in failed_ranges.items():
+            messages.append(f"{failure['count']} values of column '{column}' outside range {failure['allowed']}")
+
+        return {"validation_status": not messages,
+                "n_rows": state["n_rows"],
+                "total_duration_ms": round(sum(timings.values()), 3),
+                "checks": checks,
+                "messages": messages}
+
+    def validate_chunks(self, chunks: Iterable[DataFrame]) -> dict:
+        """
+        Validates a dataset streamed as DataFrame chunks in a single pass.
+
+        Args:
+            chunks (Iterable[DataFrame]): The dataset, e.g. from `iter_ingested_split_chunks`.
+
+        Returns:
+            dict: Structured report with overall status, per-check results and timings, and messages.
+        """
+        try:
+            state = self._new_state()
+            for chunk in chunks:
+                self._update(state, chunk)
+            return self._report(state)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def validate(self, dataframe: DataFrame) -> dict:
+        """
+        Validates an in-memory DataFrame, see `validate_chunks`.
+        """
+        return self.validate_chunks([dataframe])
+
+
+class RequestValidator:
+    """
+    Request-time input validator compiled from the same Schema.yaml as the
+    training data validator, plus the `categories.json` dumped at transformation.
+
+    Checks presence, numeric types (integer columns must hold whole numbers),
+    allowed values, ranges and the `Region_Code` / `Policy_Sales_Channel` codes
+    seen during training for a whole batch of raw records at once, so invalid
+    rows are rejected before any model is loaded.
+    """
+
+    def __init__(self, schema_config: dict, categories: Optional[dict] = None, logger: Optional[Logger] = None):
+        """
+        Compiles the schema into request validation rules.
+
+        Args:
+            schema_config (dict): Parsed contents of Schema.yaml.
+            categories (Optional[dict]): Parsed categories.json with `region_codes` and `policy_channels`.
+            logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+        """
+        self.logger = logger or configure_logger(
+                                        logger_name=__name__,
+                                        level="DEBUG",
+                                        to_console=True,
+                                        to_file=True,
+                                        log_file_name=__name__
+                                        )
+        try:
+            drop_columns = schema_config.get("drop_columns") or []
+            drop_columns = [drop_columns] if isinstance(drop_columns, str) else list(drop_columns)
+            excluded = {*drop_columns, schema_config.get("target_columns")}
+            dtypes = {list(d.keys())[0]: list(d.values())[0] for d in schema_config["columns"]}
+            self.input_dtypes = {column: dtype for column, dtype in dtypes.items() if column not in excluded}
+            self.input_columns = list(self.input_dtypes)
+            self.numeric_columns = [column for column, dtype in self.input_dtypes.items() if dtype in ("int", "float")]
+            self.integer_columns = [column for column, dtype in self.input_dtypes.items() if dtype == "int"]
+
+            allowed_values = {column: values for column, values in schema_config.get("allowed_values", {}).items() if column in self.input_dtypes}
+            categories = categories or {}
+            # Codes the model has actually seen, tighter than the generic schema range
+            for column, key in (("Region_Code", "region_codes"), ("Policy_Sales_Channel", "policy_channels")):
+                if column in self.input_dtypes and categories.get(key):
+                    allowed_values[column] = categories[key]
+            self.allowed_numeric = {column: np.array(values, dtype=np.float64) for column, values in allowed_values.items()
+                                    if column in self.numeric_columns}
+            self.allowed_values = {column: np.array([str(value) for value in values], dtype=object)
+                                   for column, values in allowed_values.items() if column not in self.allowed_numeric}
+            self.value_ranges = {column: (float(bounds[0]), float(bounds[1]))
+                                 for column, bounds in schema_config.get("value_ranges", {}).items() if column in self.numeric_columns}
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def validate(self, records: DataFrame) -> Tuple[DataFrame, List[dict]]:
+        """
+        Validates a batch of raw input records.
+
+        Args:
+            records (DataFrame): One row per request with the raw schema columns, values may still be strings.
+
+        Returns:
+            Tuple[DataFrame, List[dict]]: The records restricted to the input columns with numeric columns
+            parsed, and per row a dict mapping each invalid field to its error message (empty when valid).
+        """
+        try:
+            n_rows = len(records)
+            errors = [{} for _ in range(n_rows)]
+
+            def flag(column: str, invalid: np.ndarray, message: str) -> None:
+                for row in np.flatnonzero(invalid):
+                    errors[row].setdefault(column, message)
+
+            parsed = DataFrame(index=records.index)
+            for column in self.input_columns:
+                if column not in records.columns:
+                    flag(column, np.ones(n_rows, dtype=bool), "is required")
+                    parsed[column] = np.nan
+                    continue
+                raw = records[column]
+                missing = raw.isna().to_numpy() | (raw.astype(str).str.strip() == "").to_numpy()
+                flag(column, missing, "is required")
+                if column not in self.numeric_columns:
+                    parsed[column] = raw
+                    continue
+                values = to_numeric(raw, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+                flag(column, np.isnan(values) & ~missing, "must be a number")
+                if column in self.integer_columns:
+                    with np.errstate(invalid="ignore"):
+                        flag(column, ~np.isnan(values) & (np.mod(values, 1) != 0), "must be a whole number")
+                parsed[column] = values
+
+            for column, (lower, upper) in self.value_ranges.items():
+                values = parsed[column].to_numpy(dtype=np.float64)
+                with np.errstate(invalid="ignore"):
+                    flag(column, (values < lower) | (values > upper), f"must be between {lower:g} and {upper:g}")
+            for column, allowed in self.allowed_numeric.items():
+                values = parsed[column].to_numpy(dtype=np.float64)
+                flag(column, ~np.isnan(values) & ~np.isin(values, allowed), "is not an allowed value")
+            for column, allowed in self.allowed_values.items():
+                values = parsed[column]
+                flag(column, values.notna().to_numpy() & ~np.isin(values.astype(str).to_numpy(dtype=object), allowed),
+                     f"must be one of {allowed.tolist()}")
+
+            n_invalid = sum(1 for row_errors in errors if row_errors)
+            if n_invalid:
+                self.logger.info(f"Rejected {n_invalid} of {n_rows} input records")
+            return parsed, errors
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
@@ -0,0 +1,130 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+from sklearn.base import ClassifierMixin
+from src.Entity.Model_Families import build_model, fit_weights
+
+
+def segment_columns(feature_names: Sequence[str], keys: Sequence[str], categorical_columns: Sequence[str]) -> List[int]:
+    """
+    Maps raw segment key columns to their columns in the model matrix: a numeric key is
+    its own column, a categorical key the indicator columns `<key>_<level>` of its levels.
+
+    Args:
+        feature_names (Sequence[str]): Feature names of the model matrix (`FusedPreprocessor.get_feature_names_out()`).
+        keys (Sequence[str]): Raw columns the data is segmented by, e.g. `Vehicle_Age`, `Previously_Insured`.
+        categorical_columns (Sequence[str]): Columns one-hot encoded by the preprocessor.
+
+    Returns:
+        List[int]: Column positions of the segment keys.
+
+    Raises:
+        ValueError: If a key has no column in the model matrix.
+    """
+    columns = []
+    for key in keys:
+        key_columns = [index for index, name in enumerate(feature_names)
+                       if name == key or key in categorical_columns and str(name).startswith(f"{key}_")]
+        if not key_columns:
+            raise ValueError(f"Segment key '{key}' is not a feature of the model")
+        columns.extend(key_columns)
+    return columns
+
+
+def _fit_segment(model_name: str, params: dict, class_weight: Optional[str], n_jobs: int, x: np.ndarray, y: np.ndarray,
+                 sample_weight: Optional[np.ndarray]) -> ClassifierMixin:
+    class_weight, sample_weight = fit_weights(class_weight, y, sample_weight)
+    model = build_model(model_name, params, n_jobs=n_jobs, class_weight=class_weight)
+    return model.fit(x, y, sample_weight=sample_weight)
+
+
+class SegmentedModel:
+    """
+    One model per data segment behind a routing layer, used as the trained model of `MyModel`.
+
+    A segment is a combination of values of the segment key columns of the model matrix
+    (e.g. the `Vehicle_Age` indicators and `Previously_Insured`). Combinations with at least
+    `min_segment_rows` training rows of every class get their own model, all segment models are
+    fitted concurrently in a process pool. Rows are routed in a vectorized way: the distinct key
+    combinations of a batch are matched once to the nearest segment (exactly for the segments
+    themselves; smaller combinations, synthetic resampled rows between segments and unseen values
+    go to the closest one) and `np.unique`'s inverse spreads the result over the rows, so each
+    segment model predicts all of its rows in one call.
+    """
+
+    def __init__(self, model_name: str, params: dict, key_columns: List[int], min_segment_rows: int = 1000,
+                 class_weight: Optional[str] = None, n_jobs: int = -1):
+        """
+        Args:
+            model_name (str): Model family of the segment models, a key of MODEL_FAMILIES.
+            params (dict): Hyperparameters of every segment model.
+            key_columns (List[int]): Model matrix columns defining the segments, see `segment_columns`.
+            min_segment_rows (int): Smallest segment with a model of its own, rows of smaller ones join the nearest segment.
+            class_weight (Optional[str]): "balanced" to reweight the classes in every segment, None otherwise.
+            n_jobs (int): Processes fitting segment models concurrently, -1 for one per core.
+        """
+        self.model_name = model_name
+        self.params = {key: value for key, value in params.items() if key != "n_jobs"}
+        self.key_columns = list(key_columns)
+        self.min_segment_rows = min_segment_rows
+        self.class_weight = class_weight
+        self.n_jobs = n_jobs
+
+    def route(self, x: np.ndarray) -> np.ndarray:
+        """
+        Returns the segment index of every row.
+        """
+        keys, inverse = np.unique(np.asarray(x[:, self.key_columns], dtype=np.float64), axis=0, return_inverse=True)
+        distances = ((keys[:, None, :] - self.segment_keys_[None, :, :]) ** 2).sum(axis=2)
+        return np.argmin(distances, axis=1)[inverse.ravel()]
+
+    def fit(self, x: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None) -> "SegmentedModel":
+        y = np.asarray(y)
+        keys, inverse, counts = np.unique(np.asarray(x[:, self.key_columns], dtype=np.float64), axis=0,
+                                          return_inverse=True, return_counts=True)
+        self.classes_ = np.unique(y)
+        n_classes = len(self.classes_)
+        # Classes present per key combination, a segment model needs all of them
+        key_classes = np.unique(inverse.ravel() * n_classes + np.searchsorted(self.classes_, y))
+        complete = np.bincount(key_classes // n_classes, minlength=len(keys)) == n_classes
+        eligible = (counts >= self.min_segment_rows) & complete
+        # Without any eligible combination all rows form a single segment
+        self.segment_keys_ = keys[eligible] if eligible.any() else keys[[np.argmax(counts)]]
+        segments = self.route(x)
+        row_indices = [np.flatnonzero(segments == segment) for segment in range(len(self.segment_keys_))]
+        n_cores = os.cpu_count() if self.n_jobs == -1 else self.n_jobs
+        n_workers = min(n_cores, len(row_indices))
+        # Cores left over by a few large segments build their trees in parallel
+        tasks = [(self.model_name, self.params, self.class_weight, max(1, n_cores // n_workers), np.asarray(x[indices]), np.asarray(y[indices]),
+                  None if sample_weight is None else np.asarray(sample_weight[indices])) for indices in row_indices]
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                # Largest segments first so the longest fits do not end up last in the queue
+                order = np.argsort([-len(indices) for indices in row_indices])
+                futures = {segment: executor.submit(_fit_segment, *tasks[segment]) for segment in order}
+                self.segment_models_ = [futures[segment].result() for segment in range(len(tasks))]
+        else:
+            self.segment_models_ = [_fit_segment(*task) for task in tasks]
+        self.segment_rows_ = [int(len(indices)) for indices in row_indices]
+        return self
+
+    def _dispatch(self, x: np.ndarray, method: str, width: Optional[int] = None) -> np.ndarray:
+        segments = self.route(x)
+        out = np.empty(len(x) if width is None else (len(x), width), dtype=np.float64 if width else self.classes_.dtype)
+        # Rows grouped by segment with one stable sort instead of one mask per segment
+        order = np.argsort(segments, kind="stable")
+        present, starts, counts = np.unique(segments[order], return_index=True, return_counts=True)
+        for segment, start, count in zip(present, starts, counts):
+            rows = order[start:start + count]
+            out[rows] = getattr(self.segment_models_[segment], method)(x[rows])
+        return out
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        return self._dispatch(x, "predict")
+
+    def predict_proba(self, x: np.ndarray) -> np.ndarray:
+        return self._dispatch(x, "predict_proba", width=len(self.classes_))
+
+    def __repr__(self):
+        return f"SegmentedModel({self.model_name}, {len(getattr(self, 'segment_models_', []))} segments)"
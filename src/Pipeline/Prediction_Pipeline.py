@@ -3,7 +3,9 @@ from src.Entity.Config_Entity import VehiclePredictorConfig
 from src.Entity.S3_Estimator import Current_S3_Vehicle_Insurance_Estimator
 from src.Exception import MyException
 from src.Logger import configure_logger
+from typing import Optional
 from pandas import DataFrame
+from numpy import ndarray
 
 logger = configure_logger(logger_name=__name__, level="DEBUG", to_console=True, to_file=True, log_file_name=__name__)
 
@@ -14,16 +16,17 @@ class VehicleData:
                 Driving_License,
                 Region_Code,
                 Previously_Insured,
+                Vehicle_Age,
+                Vehicle_Damage,
                 Annual_Premium,
                 Policy_Sales_Channel,
-                Vintage,
-                Vehicle_Age_lt_1_Year,
-                Vehicle_Age_gt_2_Years,
-                Vehicle_Damage_Yes
+                Vintage
                 ):
         """
         Vehicle Data constructor
-        Input: all features of the trained model for prediction
+        Input: all raw features of the trained model for prediction (categorical
+        values as in the training data, e.g. Gender="Male", Vehicle_Age="< 1 Year"),
+        encoding is done by the preprocessing object saved with the model
         """
         try:
             self.Gender = Gender
@@ -31,12 +34,11 @@ class VehicleData:
             self.Driving_License = Driving_License
             self.Region_Code = Region_Code
             self.Previously_Insured = Previously_Insured
+            self.Vehicle_Age = Vehicle_Age
+            self.Vehicle_Damage = Vehicle_Damage
             self.Annual_Premium = Annual_Premium
             self.Policy_Sales_Channel = Policy_Sales_Channel
             self.Vintage = Vintage
-            self.Vehicle_Age_lt_1_Year = Vehicle_Age_lt_1_Year
-            self.Vehicle_Age_gt_2_Years = Vehicle_Age_gt_2_Years
-            self.Vehicle_Damage_Yes = Vehicle_Damage_Yes
 
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
@@ -50,17 +52,16 @@ class VehicleData:
         try:
             logger.debug("Converting User input form to dictionary...")
             input_data = {
-                "Gender_Male": [self.Gender],
+                "Gender": [self.Gender],
                 "Age": [self.Age],
                 "Driving_License": [self.Driving_License],
                 "Region_Code": [self.Region_Code],
                 "Previously_Insured": [self.Previously_Insured],
+                "Vehicle_Age": [self.Vehicle_Age],
+                "Vehicle_Damage": [self.Vehicle_Damage],
                 "Annual_Premium": [self.Annual_Premium],
                 "Policy_Sales_Channel": [self.Policy_Sales_Channel],
-                "Vintage": [self.Vintage],
-                "Vehicle_Age_lt_1_Year": [self.Vehicle_Age_lt_1_Year],
-                "Vehicle_Age_gt_2_Years": [self.Vehicle_Age_gt_2_Years],
-                "Vehicle_Damage_Yes": [self.Vehicle_Damage_Yes]
+                "Vintage": [self.Vintage]
             }
 
             logger.info("Created vehicle data dict")
@@ -96,23 +97,26 @@ class VehicleDataClassifier:
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
 
-    def predict(self, dataframe: DataFrame,do_scaling: bool)-> int:
+    def _get_model(self) -> Current_S3_Vehicle_Insurance_Estimator:
+        return Current_S3_Vehicle_Insurance_Estimator(
+            bucket_name=self.prediction_pipeline_config.model_bucket_name,
+            model_s3_key=self.prediction_pipeline_config.s3_model_file_path,
+        )
+
+    def predict(self, dataframe: DataFrame, do_scaling: Optional[bool] = None)-> int:
         """
         This is the method of VehicleDataClassifier
         Returns: Predicted class (int) from the model
-        :param dataframe: DataFrame containing the input data for prediction
-        :param do_scaling: Boolean flag indicating whether to apply scaling or not
+        :param dataframe: DataFrame containing the raw input record for prediction
+        :param do_scaling: Whether to apply the model's preprocessing, inferred from the input type by default
         """
         try:
             logger.debug("Entered predict method of VehicleDataClassifier class")
             logger.debug("Loading Current Production Model...")
-            model = Current_S3_Vehicle_Insurance_Estimator(
-                bucket_name=self.prediction_pipeline_config.model_bucket_name,
-                model_s3_key=self.prediction_pipeline_config.s3_model_file_path,
-            )
+            model = self._get_model()
             logger.debug("Model Loaded Successfully.")
             logger.debug("Predicting target variable based on user input...")
-            print("Columns before prediction:", dataframe.columns.tolist())
+            logger.debug(f"Columns before prediction: {dataframe.columns.tolist()}")
 
             result =  model.predict(x_test=dataframe,do_scaling=do_scaling)["prediction"].values[0]
             logger.info("Prediction made successfully.")
@@ -120,5 +124,18 @@ class VehicleDataClassifier:
         
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
-        
-    
\ No newline at end of file
+
+    def predict_batch(self, dataframe: DataFrame, chunk_size: int = 100_000) -> ndarray:
+        """
+        Batch scoring of raw records with the current production model
+        Returns: Predicted classes, one per row of `dataframe`
+        :param dataframe: DataFrame of raw records (schema columns, extra columns are ignored)
+        :param chunk_size: Rows preprocessed and predicted per step
+        """
+        try:
+            logger.debug("Entered predict_batch method of VehicleDataClassifier class")
+            predictions = self._get_model().predict_batch(records=dataframe, chunk_size=chunk_size)
+            logger.info(f"Scored {len(predictions)} records.")
+            return predictions
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
@@ -1,4 +1,5 @@
 import sys
+from typing import Optional
 from src.Logger import configure_logger
 from src.Exception import MyException
 
@@ -8,20 +9,30 @@ from src.Components.S3_Data_Transformation import DataTransformation
 from src.Components.S4_Model_Trainer import ModelTrainer
 from src.Components.S5_Data_Evaluation import ModelEvaluation
 from src.Components.S6_Model_Pusher import ModelPusher
+from src.Components.Incremental_Model_Trainer import IncrementalModelTrainer
+from src.Entity import Schema_Validator, Data_Profile, Preprocessor, Estimator, Model_Families, Segmented_Model
+from src.Utils import Main_Utils, Resampling_Utils, Learning_Curve, Hyperparameter_Search, Distributed_Training, Compaction_Utils, Metric_Utils
+from src.Utils.Compaction_Utils import compact_training_data
+from src.Utils.Stage_Cache import StageCache, artifact_file_paths
+from src.Constants import SCHEMA_FILE_PATH
 
 from src.Entity.Config_Entity import(DataIngestionConfig,
                                      DataValidationConfig,
                                      DataTransformationConfig,
                                      ModelTrainerConfig,
                                      ModelEvaluationConfig,
-                                     ModelPusherConfig)
+                                     ModelPusherConfig,
+                                     DataCompactionConfig,
+                                     IncrementalTrainerConfig,
+                                     StageCacheConfig)
 
 from src.Entity.Artifact_Entity import(DataIngestionArtifact,
                                        DataValidationArtifact,
                                        DataTransformationArtifact,
                                        ModelTrainerArtifact,
                                        ModelEvaluationArtifact,
-                                       ModelPusherArtifact)
+                                       ModelPusherArtifact,
+                                       IncrementalTrainerArtifact)
 
 logger = configure_logger(logger_name=__name__, level="DEBUG", to_console=True, to_file=True, log_file_name=__name__)
 
@@ -34,6 +45,13 @@ class TrainPipeline:
             self.model_trainer_config = ModelTrainerConfig()
             self.mode_evaluation_config = ModelEvaluationConfig()
             self.model_pusher_config = ModelPusherConfig()
+            self.data_compaction_config = DataCompactionConfig()
+            self.incremental_trainer_config = IncrementalTrainerConfig()
+            self.stage_cache_config = StageCacheConfig()
+            self.stage_cache = StageCache(cache_dir=self.stage_cache_config.cache_dir,
+                                          run_dir=self.stage_cache_config.run_dir,
+                                          enabled=self.stage_cache_config.enabled,
+                                          logger=logger)
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
     
@@ -55,13 +73,21 @@ class TrainPipeline:
     def start_data_validation(self, data_ingestion_artifact:DataIngestionArtifact) ->DataValidationArtifact:
         """
         This method of TrainPipeline class is responsible for starting data validation component
+        (reused from the stage cache when data, schema, config, reference profile and code are unchanged)
         """
         try:
             logger.info("Entered the 'start_data_validation' method of 'TrainPipeline' class")
             logger.debug("Initializing data validation...")
             data_validation = DataValidation(data_ingestion_artifact=data_ingestion_artifact,
                                              data_validation_config=self.data_validation_config)
-            data_validation_artifact = data_validation.initiate_data_validation()
+            reference_profile = data_validation.load_reference_profile()
+            data_validation_artifact = self.stage_cache.run("data_validation",
+                                                            lambda: data_validation.initiate_data_validation(reference_profile=reference_profile,
+                                                                                                             load_reference_profile=False),
+                                                            input_files=[*artifact_file_paths(data_ingestion_artifact), SCHEMA_FILE_PATH],
+                                                            config=self.data_validation_config,
+                                                            code_modules=[sys.modules[DataValidation.__module__], Schema_Validator, Data_Profile, Main_Utils],
+                                                            extra={"reference_profile": reference_profile.to_dict() if reference_profile else None})
             logger.info("Data Validation Completed.")
             logger.info("Exited the 'start_data_validation' method of 'TrainPipeline' class")
             return data_validation_artifact
@@ -71,6 +97,7 @@ class TrainPipeline:
     def start_data_transformation(self, data_ingestion_artifact:DataIngestionArtifact, data_validation_artifact:DataValidationArtifact) ->DataTransformationArtifact:
         """
         This method of TrainPipeline class is responsible for starting data transformation component
+        (reused from the stage cache when data, schema, model YAML, config and code are unchanged)
         """
         try:
             logger.debug("Entered the 'start_data_transformation' method of 'TrainPipeline' class")
@@ -78,29 +105,63 @@ class TrainPipeline:
             data_transformation = DataTransformation(data_transformation_config=self.data_transformation_config,
                                                      data_ingestion_artifact=data_ingestion_artifact,
                                                      data_validation_artifact=data_validation_artifact)
-            data_transformation_artifact = data_transformation.initiate_data_transformation() 
+            data_transformation_artifact = self.stage_cache.run("data_transformation", data_transformation.initiate_data_transformation,
+                                                                input_files=[*artifact_file_paths(data_ingestion_artifact), SCHEMA_FILE_PATH,
+                                                                             self.data_transformation_config.model_config_yaml_file_path],
+                                                                config=self.data_transformation_config,
+                                                                code_modules=[sys.modules[DataTransformation.__module__], Preprocessor, Resampling_Utils,
+                                                                              Learning_Curve, Model_Families, Main_Utils])
             logger.info("Data Transformation Completed.")
             logger.info("Exited the 'start_data_transformation' method of 'TrainPipeline' class")
             return data_transformation_artifact
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
         
-    def start_model_training(self, data_transforamtion_artifact:DataTransformationArtifact)->ModelTrainerArtifact:
+    def start_data_compaction(self, data_transformation_artifact:DataTransformationArtifact) ->DataTransformationArtifact:
+        """
+        This method of TrainPipeline class is responsible for compacting duplicate training rows into sample weights
+        (reused from the stage cache when the transformed data and code are unchanged)
+        """
+        try:
+            logger.debug("Entered the 'start_data_compaction' method of 'TrainPipeline' class")
+            data_compaction_artifact = self.stage_cache.run("data_compaction",
+                                                            lambda: compact_training_data(data_transformation_artifact, self.data_compaction_config, logger=logger),
+                                                            input_files=artifact_file_paths(data_transformation_artifact),
+                                                            config=self.data_compaction_config,
+                                                            code_modules=[Compaction_Utils, Main_Utils])
+            logger.info("Data Compaction Completed.")
+            logger.debug("Exited the 'start_data_compaction' method of 'TrainPipeline' class")
+            return data_compaction_artifact
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def start_model_training(self, data_transforamtion_artifact:DataTransformationArtifact, data_validation_artifact:Optional[DataValidationArtifact]=None)->ModelTrainerArtifact:
         """
         This method of TrainPipeline class is responsible for starting model training
+        (reused from the stage cache when transformed data, hyperparameters and code are unchanged)
         """
         try:
             logger.debug("Entered the 'start_model_training' method of 'TrainPipeline' class")
             logger.debug("Initailizing Model Training...")
-            model_trainer = ModelTrainer(model_trainer_config=self.model_trainer_config, data_transformation_artifact=data_transforamtion_artifact)
-            model_trainer_artifact = model_trainer.initiate_model_trainer()
+            model_trainer = ModelTrainer(model_trainer_config=self.model_trainer_config, data_transformation_artifact=data_transforamtion_artifact,
+                                         data_validation_artifact=data_validation_artifact)
+            # The expected accuracy is rewritten after every accepted model, it gates the result instead of keying it
+            model_trainer_artifact = self.stage_cache.run("model_trainer", model_trainer.initiate_model_trainer,
+                                                          input_files=[*artifact_file_paths(data_transforamtion_artifact), self.model_trainer_config.model_config_yaml_file_path],
+                                                          config=self.model_trainer_config,
+                                                          code_modules=[sys.modules[ModelTrainer.__module__], Estimator, Preprocessor, Model_Families, Segmented_Model,
+                                                                        Hyperparameter_Search, Learning_Curve, Distributed_Training, Metric_Utils, Main_Utils],
+                                                          extra={"warm_start_base": model_trainer.warm_start_base_version()},
+                                                          exclude=["model_trainer_expected_accuracy"])
+            if model_trainer_artifact.metric_artifact.accuracy_score < self.model_trainer_config.model_trainer_expected_accuracy:
+                raise Exception("No model found with score above the base score")
             logger.info("Model Training Completed.")
             logger.info("Exited the 'start_model_training' method of 'TrainPipeline' class")
             return model_trainer_artifact
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
     
-    def start_model_evaluation(self, data_transformation_artifact:DataTransformationArtifact, model_trainer_artifact:ModelTrainerArtifact)->ModelEvaluationArtifact:
+    def start_model_evaluation(self, data_ingestion_artifact:DataIngestionArtifact, data_transformation_artifact:DataTransformationArtifact, model_trainer_artifact:ModelTrainerArtifact)->ModelEvaluationArtifact:
         """
         This method of TrainPipeline class is responsible for starting modle evaluation
         """
@@ -108,6 +169,7 @@ class TrainPipeline:
             logger.debug("Entered the 'start_model_evaluation' method of 'TrainPipeline' class")
             logger.debug("Initializing Model Evaluation...")
             model_evaluation = ModelEvaluation(model_evaluation_config=self.mode_evaluation_config,
+                                            data_ingestion_artifact=data_ingestion_artifact,
                                             data_transformation_artifact=data_transformation_artifact,
                                             model_trainer_artifact=model_trainer_artifact)
             model_evaluation_artifact = model_evaluation.initiate_model_evaluation()
@@ -117,14 +179,15 @@ class TrainPipeline:
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
     
-    def start_model_pusher(self,model_evaluation_artifact:ModelEvaluationArtifact)->ModelPusherArtifact:
+    def start_model_pusher(self,model_evaluation_artifact:ModelEvaluationArtifact, data_ingestion_artifact:Optional[DataIngestionArtifact]=None)->ModelPusherArtifact:
         """
         This method of TrainPipeline class is responsible for starting model pushing
         """
         try:
             logger.debug("Entered the 'start_model_pusher' method of 'TrainPipeline' class")
             logger.debug("Initializing Model Pusher...")
-            model_pusher = ModelPusher(model_evaluation_artifact=model_evaluation_artifact,model_pusher_config=self.model_pusher_config)
+            model_pusher = ModelPusher(model_evaluation_artifact=model_evaluation_artifact,model_pusher_config=self.model_pusher_config,
+                                       data_ingestion_artifact=data_ingestion_artifact)
             mode_pusher_artifact = model_pusher.initiate_model_pusher()
             logger.info("Model Pushed Successfully.")
             logger.info("Exited the 'start_model_pusher' method of 'TrainPipeline' class")
@@ -149,14 +212,48 @@ class TrainPipeline:
                 raise MyException(error_message="Data validation failed. Check validation report.",error_detail=sys,logger=logger)
 
             data_transformation_artifact = self.start_data_transformation(data_ingestion_artifact=data_ingetion_artifact,data_validation_artifact=data_validation_artifact)
+            if self.data_compaction_config.enabled:
+                data_transformation_artifact = self.start_data_compaction(data_transformation_artifact=data_transformation_artifact)
             
-            model_trainer_artifact = self.start_model_training(data_transforamtion_artifact=data_transformation_artifact)
-            model_evaluation_artifact = self.start_model_evaluation(data_transformation_artifact=data_transformation_artifact, model_trainer_artifact=model_trainer_artifact)
+            model_trainer_artifact = self.start_model_training(data_transforamtion_artifact=data_transformation_artifact, data_validation_artifact=data_validation_artifact)
+            model_evaluation_artifact = self.start_model_evaluation(data_ingestion_artifact=data_ingetion_artifact, data_transformation_artifact=data_transformation_artifact, model_trainer_artifact=model_trainer_artifact)
+            logger.info(self.stage_cache.summary())
             
             if not model_evaluation_artifact.is_model_accepted:
-                logger.info(f"Model not accepted.")
+                logger.info(f"Model not accepted: {model_evaluation_artifact.rejection_reasons}")
                 return None
-            model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact)
+            model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact, data_ingestion_artifact=data_ingetion_artifact)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def start_incremental_training(self) ->IncrementalTrainerArtifact:
+        """
+        This method of TrainPipeline class is responsible for updating the production model with the new documents only
+        """
+        try:
+            logger.debug("Entered the 'start_incremental_training' method of 'TrainPipeline' class")
+            incremental_trainer = IncrementalModelTrainer(incremental_trainer_config=self.incremental_trainer_config,
+                                                          data_validation_config=self.data_validation_config,
+                                                          model_evaluation_config=self.mode_evaluation_config)
+            incremental_trainer_artifact = incremental_trainer.initiate_incremental_training()
+            logger.info(f"Incremental Training Completed: {incremental_trainer_artifact.message}")
+            logger.debug("Exited the 'start_incremental_training' method of 'TrainPipeline' class")
+            return incremental_trainer_artifact
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+    def run_incremental_pipeline(self) ->IncrementalTrainerArtifact:
+        """
+        This method of TrainPipeline class is responsible for the lightweight update path:
+        an incremental update of the production model, or the complete pipeline when a full retrain is due
+        """
+        try:
+            logger.debug("Starting Incremental Training Pipeline...")
+            incremental_trainer_artifact = self.start_incremental_training()
+            if incremental_trainer_artifact.full_retrain_due:
+                logger.info("Full retrain due, running the complete training pipeline...")
+                self.run_pipeline()
+            return incremental_trainer_artifact
         except Exception as e:
             raise MyException(error_message=e, error_detail=sys, logger=logger) from e
 
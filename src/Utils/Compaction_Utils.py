@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import time
+import dataclasses
+import numpy as np
+from typing import Optional, Tuple
+from logging import Logger
+from src.Exception import MyException
+from src.Logger import configure_logger
+from src.Entity.Config_Entity import DataCompactionConfig
+from src.Entity.Artifact_Entity import DataTransformationArtifact
+from src.Utils.Main_Utils import load_numpy_array, save_numpy_array
+
+
+def compact_duplicate_rows(x: np.ndarray, y: np.ndarray, sample_weight: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Groups identical (feature row, label) pairs into unique rows with their multiplicity as sample weight.
+
+    Fitting on the unique rows with these weights gives the split criteria the same
+    class counts as fitting on the duplicated rows, and "balanced" class weights are
+    derived from the weighted counts (`fit_weights` in Model_Families). It is not the
+    same model though: a forest bootstrap samples unique rows and multiplies each draw
+    by its weight instead of sampling the duplicates independently, and `min_samples_leaf`
+    counts unique rows, so the trees (and metrics) differ slightly from an uncompacted fit.
+
+    Args:
+        x (np.ndarray): Feature matrix.
+        y (np.ndarray): Labels.
+        sample_weight (Optional[np.ndarray]): Existing row weights, summed per unique row (1 per row if None).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Unique features, their labels and their weights.
+    """
+    rows = np.column_stack([np.asarray(x), np.asarray(y).astype(x.dtype)])
+    unique_rows, inverse, counts = np.unique(rows, axis=0, return_inverse=True, return_counts=True)
+    weights = counts.astype(np.float64) if sample_weight is None else np.bincount(inverse.ravel(), weights=sample_weight, minlength=len(unique_rows))
+    return np.ascontiguousarray(unique_rows[:, :-1]), unique_rows[:, -1].astype(np.asarray(y).dtype), weights
+
+
+def compact_training_data(data_transformation_artifact: DataTransformationArtifact, data_compaction_config: DataCompactionConfig,
+                          logger: Optional[Logger] = None) -> DataTransformationArtifact:
+    """
+    Compacts the transformed training arrays into unique rows plus sample weights and
+    reports the compression ratio. The test arrays are left as they are.
+
+    Args:
+        data_transformation_artifact (DataTransformationArtifact): Output of the data transformation.
+        data_compaction_config (DataCompactionConfig): Output paths of the compacted arrays, weights and report.
+        logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+
+    Returns:
+        DataTransformationArtifact: The input artifact pointing at the compacted training arrays and their sample weights.
+    """
+    logger = logger or configure_logger(
+                                    logger_name=__name__,
+                                    level="DEBUG",
+                                    to_console=True,
+                                    to_file=True,
+                                    log_file_name=__name__
+                                    )
+    try:
+        start = time.perf_counter()
+        x = load_numpy_array(data_transformation_artifact.data_transformation_transformed_train_file_path, logger=logger, mmap_mode="r")
+        y = load_numpy_array(data_transformation_artifact.data_transformation_transformed_train_target_file_path, logger=logger, mmap_mode="r")
+        x_unique, y_unique, sample_weight = compact_duplicate_rows(x, y)
+        save_numpy_array(data_compaction_config.compacted_train_file_path, x_unique, logger=logger)
+        save_numpy_array(data_compaction_config.compacted_train_target_file_path, y_unique, logger=logger)
+        save_numpy_array(data_compaction_config.sample_weight_file_path, sample_weight, logger=logger)
+
+        report = {"rows": int(len(y)), "unique_rows": int(len(y_unique)), "compression_ratio": len(y) / max(len(y_unique), 1),
+                  "max_weight": float(sample_weight.max()) if len(sample_weight) else 0.0, "seconds": time.perf_counter() - start}
+        os.makedirs(os.path.dirname(data_compaction_config.report_file_path), exist_ok=True)
+        with open(data_compaction_config.report_file_path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+        logger.info(f"Compacted {report['rows']} training rows into {report['unique_rows']} unique rows "
+                    f"(compression ratio {report['compression_ratio']:.2f}x) in {report['seconds']:.1f}s")
+
+        return dataclasses.replace(data_transformation_artifact,
+                                   data_transformation_transformed_train_file_path=data_compaction_config.compacted_train_file_path,
+                                   data_transformation_transformed_train_target_file_path=data_compaction_config.compacted_train_target_file_path,
+                                   data_transformation_sample_weight_file_path=data_compaction_config.sample_weight_file_path,
+                                   compression_ratio=report["compression_ratio"])
+    except Exception as e:
+        raise MyException(error_message=e, error_detail=sys, logger=logger) from e
@@ -0,0 +1,340 @@
+"""
+Sharded random forest training through a shared work directory.
+
+The coordinator (`DistributedForestTrainer`) splits the forest into tasks of a
+few trees each and writes them as JSON files to `<work_dir>/tasks`. Workers
+claim a task by atomically renaming it into `<work_dir>/claimed`, train the
+sub-forest on the transformed training data (all rows, bootstrapped per tree
+as usual, or a disjoint stratified shard) and publish it to
+`<work_dir>/results`. The coordinator starts local worker processes itself;
+other hosts that mount the same directory can join once the tasks are
+submitted with:
+
+    python -m src.Utils.Distributed_Training --work-dir <work_dir> --n-jobs 8
+
+Every task carries its own seed derived from the forest's `random_state` and
+sub-forests are merged in task order, so the merged forest does not depend on
+which worker trained which task.
+
+Workers keep touching their claimed task file while training; the coordinator
+moves a claim that has not been touched for `lease_seconds` (its worker died)
+back to `<work_dir>/tasks`; workers keep polling the queue while claimed tasks
+have no result, so re-queued tasks are picked up. When the coordinator gives up (a failed task or the
+timeout) it writes `<work_dir>/stop`, and workers exit before their next claim.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import traceback
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List
+from logging import Logger
+from sklearn.ensemble import RandomForestClassifier
+from src.Exception import MyException
+from src.Logger import configure_logger
+from src.Utils.Main_Utils import save_object, load_object
+from src.Entity.Model_Families import fit_weights
+
+# Supported values of `distributed_data`: every worker samples from all rows, or trains on its own shard
+DATA_MODES = ("bootstrap", "shard")
+_TASKS_DIR, _CLAIMED_DIR, _RESULTS_DIR = "tasks", "claimed", "results"
+_STOP_FILE = "stop"
+
+
+def split_trees(n_estimators: int, n_tasks: int) -> List[int]:
+    """
+    Splits `n_estimators` trees into `n_tasks` near-equal counts (at most one tree apart).
+    """
+    n_tasks = max(1, min(n_tasks, n_estimators))
+    return [n_estimators // n_tasks + (index < n_estimators % n_tasks) for index in range(n_tasks)]
+
+
+def shard_indices(y: np.ndarray, n_shards: int, shard: int, random_state: Optional[int] = None) -> np.ndarray:
+    """
+    Returns the sorted row indices of one of `n_shards` disjoint, stratified shards.
+
+    Every class is shuffled with the same seed and dealt out over the shards, so
+    all shards see both classes in the original proportions.
+    """
+    rng = np.random.default_rng(random_state)
+    indices = [np.array_split(rng.permutation(np.flatnonzero(y == label)), n_shards)[shard] for label in np.unique(y)]
+    return np.sort(np.concatenate(indices))
+
+
+def merge_forests(forests: List[RandomForestClassifier]) -> RandomForestClassifier:
+    """
+    Merges fitted random forests with the same classes and features into one forest
+    holding all their trees, in the given order.
+    """
+    merged = forests[0]
+    for forest in forests[1:]:
+        if list(forest.classes_) != list(merged.classes_) or forest.n_features_in_ != merged.n_features_in_:
+            raise ValueError("Cannot merge forests fitted on different classes or features")
+    merged.estimators_ = [tree for forest in forests for tree in forest.estimators_]
+    merged.set_params(n_estimators=len(merged.estimators_))
+    return merged
+
+
+def train_task(task: dict, n_jobs: int = 1) -> RandomForestClassifier:
+    """
+    Trains the sub-forest described by a task on its training rows.
+    """
+    x = np.load(task["x_file_path"], mmap_mode="r")
+    y = np.load(task["y_file_path"], mmap_mode="r")
+    sample_weight = np.load(task["w_file_path"], mmap_mode="r") if task.get("w_file_path") else None
+    if task["data"] == "shard":
+        indices = shard_indices(np.asarray(y), task["n_tasks"], task["task_id"], random_state=task["data_random_state"])
+        x, y = x[indices], y[indices]
+        sample_weight = sample_weight[indices] if sample_weight is not None else None
+    params = dict(task["params"])
+    params["class_weight"], sample_weight = fit_weights(params.get("class_weight"), y, sample_weight)
+    forest = RandomForestClassifier(**params, n_estimators=task["n_estimators"], random_state=task["random_state"], n_jobs=n_jobs)
+    return forest.fit(x, y, sample_weight=sample_weight)
+
+
+def _heartbeat(claimed_path: str, interval_seconds: float, stop: threading.Event) -> None:
+    # Renews the lease on a claimed task until training ends (or the claim was re-queued)
+    while not stop.wait(interval_seconds):
+        try:
+            os.utime(claimed_path)
+        except FileNotFoundError:
+            return
+
+
+def _has_outstanding_claims(work_dir: str) -> bool:
+    # Claimed tasks without a result yet, their worker may still die and the coordinator re-queue them
+    results = set(os.listdir(os.path.join(work_dir, _RESULTS_DIR)))
+    return any(f"{claimed_name.split('.json')[0]}.pkl" not in results for claimed_name in os.listdir(os.path.join(work_dir, _CLAIMED_DIR)))
+
+
+def run_worker(work_dir: str, n_jobs: int = 1, poll_seconds: float = 1.0, logger: Optional[Logger] = None) -> int:
+    """
+    Claims and trains tasks from `work_dir` until the coordinator wrote the stop marker, or
+    no task is queued and every claimed task has a result. While other workers still train
+    claimed tasks it keeps polling the queue, so a task re-queued after its worker died is
+    picked up.
+
+    Args:
+        work_dir (str): Shared work directory of the coordinator.
+        n_jobs (int): Cores used to build the trees of a task.
+        poll_seconds (float): Wait between queue checks while claimed tasks are outstanding.
+        logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+
+    Returns:
+        int: Number of tasks this worker trained.
+    """
+    logger = logger or configure_logger(
+                                    logger_name=__name__,
+                                    level="DEBUG",
+                                    to_console=True,
+                                    to_file=True,
+                                    log_file_name=__name__
+                                    )
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    n_trained = 0
+    while True:
+        if os.path.exists(os.path.join(work_dir, _STOP_FILE)):
+            logger.info(f"Worker {worker_id} stopped by the coordinator after {n_trained} tasks")
+            return n_trained
+        pending = sorted(name for name in os.listdir(os.path.join(work_dir, _TASKS_DIR)) if name.endswith(".json"))
+        if not pending:
+            if not _has_outstanding_claims(work_dir):
+                return n_trained
+            time.sleep(poll_seconds)
+            continue
+        task_name = pending[0]
+        claimed_path = os.path.join(work_dir, _CLAIMED_DIR, f"{task_name}.{worker_id}")
+        try:
+            # rename is atomic on a shared filesystem: exactly one worker wins the task
+            os.rename(os.path.join(work_dir, _TASKS_DIR, task_name), claimed_path)
+            # rename keeps the submit time, the lease starts with the claim
+            os.utime(claimed_path)
+            with open(claimed_path) as task_file:
+                task = json.load(task_file)
+        except FileNotFoundError:
+            continue
+        result_path = os.path.join(work_dir, _RESULTS_DIR, f"{task['task_id']:05d}")
+        stop_heartbeat = threading.Event()
+        threading.Thread(target=_heartbeat, args=(claimed_path, task["lease_seconds"] / 3, stop_heartbeat), daemon=True).start()
+        try:
+            start = time.perf_counter()
+            forest = train_task(task, n_jobs=n_jobs)
+            save_object(result_path + ".tmp", forest, logger=logger)
+            os.replace(result_path + ".tmp", result_path + ".pkl")
+            logger.info(f"Worker {worker_id} trained task {task['task_id']} ({task['n_estimators']} trees) in {time.perf_counter() - start:.1f}s")
+            n_trained += 1
+        except Exception:
+            with open(result_path + ".error", "w") as error_file:
+                error_file.write(f"{worker_id}\n{traceback.format_exc()}")
+            raise
+        finally:
+            stop_heartbeat.set()
+
+
+class DistributedForestTrainer:
+    """
+    Coordinator of a sharded random forest fit (see the module docstring).
+    """
+
+    def __init__(self, x_file_path: str, y_file_path: str, work_dir: str, params: dict, n_tasks: int = 4, n_workers: int = -1,
+                 data: str = "bootstrap", timeout_seconds: float = 3600.0, lease_seconds: float = 300.0, w_file_path: Optional[str] = None,
+                 logger: Optional[Logger] = None):
+        """
+        Args:
+            x_file_path (str): Transformed training features (`.npy`), on storage every worker can read.
+            y_file_path (str): Training labels (`.npy`).
+            work_dir (str): Shared directory holding the task queue and the results.
+            params (dict): RandomForestClassifier parameters, `n_estimators` trees are split over the tasks
+                and `random_state` seeds them.
+            n_tasks (int): Number of sub-forests (and shards with data="shard").
+            n_workers (int): Local worker processes to start, -1 for one per core, 0 to rely on external workers only.
+            data (str): "bootstrap" to train every sub-forest on all rows, "shard" for disjoint stratified shards.
+            timeout_seconds (float): Time to wait for all results.
+            lease_seconds (float): Time after which a claimed task without a worker heartbeat is re-queued.
+            w_file_path (Optional[str]): Training row weights (`.npy`) of compacted training data.
+            logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+        """
+        self.logger = logger or configure_logger(
+                                        logger_name=__name__,
+                                        level="DEBUG",
+                                        to_console=True,
+                                        to_file=True,
+                                        log_file_name=__name__
+                                        )
+        self.x_file_path = os.path.abspath(x_file_path)
+        self.y_file_path = os.path.abspath(y_file_path)
+        self.w_file_path = os.path.abspath(w_file_path) if w_file_path else None
+        self.work_dir = os.path.abspath(work_dir)
+        self.params = {key: value for key, value in params.items() if key not in ("n_jobs", "warm_start")}
+        self.n_estimators = int(self.params.pop("n_estimators", 100))
+        self.random_state = self.params.pop("random_state", None)
+        self.n_tasks = len(split_trees(self.n_estimators, n_tasks))
+        self.n_workers = min(os.cpu_count() if n_workers == -1 else n_workers, self.n_tasks)
+        self.data = data
+        self.timeout_seconds = timeout_seconds
+        self.lease_seconds = lease_seconds
+
+    def submit(self) -> None:
+        """
+        Writes one task file per sub-forest to the queue, with seeds derived from `random_state`.
+        """
+        if self.data not in DATA_MODES:
+            raise ValueError(f"Unknown data mode '{self.data}', expected one of {DATA_MODES}")
+        for sub_dir in (_TASKS_DIR, _CLAIMED_DIR, _RESULTS_DIR):
+            os.makedirs(os.path.join(self.work_dir, sub_dir), exist_ok=True)
+            for stale_file in os.listdir(os.path.join(self.work_dir, sub_dir)):
+                os.remove(os.path.join(self.work_dir, sub_dir, stale_file))
+        if os.path.exists(os.path.join(self.work_dir, _STOP_FILE)):
+            os.remove(os.path.join(self.work_dir, _STOP_FILE))
+        seed_sequence = np.random.SeedSequence(self.random_state)
+        seeds = [int(child.generate_state(1)[0]) for child in seed_sequence.spawn(self.n_tasks)]
+        for task_id, (n_estimators, seed) in enumerate(zip(split_trees(self.n_estimators, self.n_tasks), seeds)):
+            task = {"task_id": task_id, "n_tasks": self.n_tasks, "n_estimators": n_estimators, "random_state": seed,
+                    "params": self.params, "data": self.data, "data_random_state": self.random_state, "lease_seconds": self.lease_seconds,
+                    "x_file_path": self.x_file_path, "y_file_path": self.y_file_path, "w_file_path": self.w_file_path}
+            # Written under a temporary name first so workers never read a partial task
+            task_path = os.path.join(self.work_dir, _TASKS_DIR, f"{task_id:05d}.json")
+            with open(task_path + ".tmp", "w") as task_file:
+                json.dump(task, task_file)
+            os.replace(task_path + ".tmp", task_path)
+        self.logger.info(f"Submitted {self.n_tasks} tasks ({self.n_estimators} trees, data: {self.data}) to {self.work_dir}")
+
+    def stop(self) -> None:
+        """
+        Writes the stop marker, workers finish their current task and claim no more.
+        """
+        open(os.path.join(self.work_dir, _STOP_FILE), "w").close()
+
+    def requeue_expired_claims(self) -> List[str]:
+        """
+        Moves claimed tasks whose lease expired, and that have no result yet, back to the queue.
+
+        Returns:
+            List[str]: Re-queued task files.
+        """
+        claimed_dir = os.path.join(self.work_dir, _CLAIMED_DIR)
+        requeued = []
+        for claimed_name in os.listdir(claimed_dir):
+            task_name = claimed_name.split(".json")[0] + ".json"
+            claimed_path = os.path.join(claimed_dir, claimed_name)
+            try:
+                expired = time.time() - os.path.getmtime(claimed_path) > self.lease_seconds
+                if expired and not os.path.exists(os.path.join(self.work_dir, _RESULTS_DIR, task_name.replace(".json", ".pkl"))):
+                    os.rename(claimed_path, os.path.join(self.work_dir, _TASKS_DIR, task_name))
+                    requeued.append(task_name)
+            except FileNotFoundError:
+                continue
+        if requeued:
+            self.logger.warning(f"Re-queued tasks {requeued} after their lease of {self.lease_seconds}s expired")
+        return requeued
+
+    def collect(self, workers: Optional[list] = None) -> RandomForestClassifier:
+        """
+        Waits for the results of all tasks and merges them in task order.
+        """
+        results_dir = os.path.join(self.work_dir, _RESULTS_DIR)
+        deadline = time.perf_counter() + self.timeout_seconds
+        while True:
+            results = set(os.listdir(results_dir))
+            errors = sorted(name for name in results if name.endswith(".error"))
+            if errors:
+                with open(os.path.join(results_dir, errors[0])) as error_file:
+                    raise RuntimeError(f"Task {errors[0]} failed on worker {error_file.read()}")
+            if all(f"{task_id:05d}.pkl" in results for task_id in range(self.n_tasks)):
+                break
+            for worker in workers or []:
+                if worker.done() and worker.exception() is not None:
+                    raise worker.exception()
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Only {len(results)} of {self.n_tasks} tasks finished within {self.timeout_seconds}s")
+            self.requeue_expired_claims()
+            time.sleep(0.5)
+        forests = [load_object(os.path.join(results_dir, f"{task_id:05d}.pkl"), logger=self.logger) for task_id in range(self.n_tasks)]
+        return merge_forests(forests)
+
+    def run(self) -> RandomForestClassifier:
+        """
+        Submits the tasks, trains them on `n_workers` local processes (plus any external
+        workers on the same work directory) and returns the merged forest.
+        """
+        try:
+            start = time.perf_counter()
+            self.submit()
+            if self.n_workers > 0:
+                executor = ProcessPoolExecutor(max_workers=self.n_workers)
+                try:
+                    workers = [executor.submit(run_worker, self.work_dir) for _ in range(self.n_workers)]
+                    forest = self.collect(workers)
+                except BaseException:
+                    # Workers only finish the task they are training instead of draining the queue
+                    self.stop()
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise
+                executor.shutdown(wait=True)
+            else:
+                try:
+                    forest = self.collect()
+                except BaseException:
+                    self.stop()
+                    raise
+            self.logger.info(f"Merged {self.n_tasks} sub-forests into {len(forest.estimators_)} trees in {time.perf_counter() - start:.1f}s")
+            return forest
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Worker of a sharded random forest fit, trains tasks from a shared work directory.")
+    parser.add_argument("--work-dir", required=True, help="Work directory of the coordinator (model_trainer/distributed in the run artifacts).")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Cores used to build the trees of a task.")
+    args = parser.parse_args()
+    print(f"Trained {run_worker(args.work_dir, n_jobs=args.n_jobs)} tasks.")
+
+
+if __name__ == "__main__":
+    main()
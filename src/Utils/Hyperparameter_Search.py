@@ -0,0 +1,222 @@
+import os
+import sys
+import math
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
+from logging import Logger
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import train_test_split
+from threadpoolctl import threadpool_limits
+from src.Exception import MyException
+from src.Logger import configure_logger
+from src.Entity.Model_Families import build_model, get_model_family, fit_weights
+
+
+# Supported values of `search.strategy` in Config/Model.yaml
+SEARCH_STRATEGIES = ("successive_halving", "hyperband")
+SCORERS = {"accuracy": accuracy_score, "f1": f1_score, "precision": precision_score, "recall": recall_score}
+_PREDICT_CHUNK_SIZE = 100_000
+
+# Opened once per worker process and shared by every trial that process runs
+_worker_state: Dict[str, Any] = {}
+
+
+def sample_search_space(space: dict, n_candidates: int, random_state: Optional[int] = None) -> List[dict]:
+    """
+    Draws hyperparameter candidates from a search space.
+
+    A list is sampled uniformly, a `{low, high, type}` mapping is an int, float or
+    log-uniform range and any other value is kept fixed.
+
+    Args:
+        space (dict): Search space, e.g. the `search.space` section of Config/Model.yaml.
+        n_candidates (int): Number of candidates to draw.
+        random_state (Optional[int]): Seed for the draws.
+
+    Returns:
+        List[dict]: Candidate parameter sets.
+    """
+    rng = np.random.default_rng(random_state)
+    candidates = []
+    for _ in range(n_candidates):
+        params = {}
+        for name, spec in space.items():
+            if isinstance(spec, list):
+                params[name] = spec[rng.integers(len(spec))]
+            elif isinstance(spec, dict):
+                low, high, kind = spec["low"], spec["high"], spec.get("type", "float")
+                if kind == "int":
+                    params[name] = int(rng.integers(low, high + 1))
+                elif kind == "log":
+                    params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+                else:
+                    params[name] = float(rng.uniform(low, high))
+            else:
+                params[name] = spec
+        candidates.append(params)
+    return candidates
+
+
+def _init_worker(x_file_path: str, y_file_path: str, w_file_path: Optional[str], validation_fraction: float, random_state: Optional[int],
+                 max_threads: Optional[int] = None) -> None:
+    """
+    Memory-maps the training arrays read-only and builds the validation hold-out.
+
+    Validation rows are excluded from fitting through a zero sample weight (tree
+    splitters skip zero-weight rows), so trials never copy the training matrix.
+    Row weights of compacted training data carry over to fitting and scoring.
+
+    Pool workers pass `max_threads=1`: gradient boosting ignores `n_jobs` and would
+    start an OpenMP thread per core in every worker, oversubscribing the cores.
+    """
+    if max_threads is not None:
+        threadpool_limits(limits=max_threads)
+    x = np.load(x_file_path, mmap_mode="r")
+    y = np.load(y_file_path, mmap_mode="r")
+    _, validation_indices = train_test_split(np.arange(len(y)), test_size=validation_fraction, stratify=y, random_state=random_state)
+    validation_indices = np.sort(validation_indices)
+    sample_weight = np.ones(len(y), dtype=np.float64) if w_file_path is None else np.load(w_file_path).astype(np.float64)
+    validation_weight = sample_weight[validation_indices]
+    sample_weight[validation_indices] = 0.0
+    _worker_state.update(x=x, y=y, sample_weight=sample_weight, validation_indices=validation_indices, validation_weight=validation_weight)
+
+
+def _run_trial(trial: dict) -> dict:
+    x, y = _worker_state["x"], _worker_state["y"]
+    validation_indices = _worker_state["validation_indices"]
+    start = time.perf_counter()
+    budget_param = get_model_family(trial["model_name"]).budget_param
+    params = {**trial["params"], budget_param: trial["budget"]}
+    class_weight, sample_weight = fit_weights(params.pop("class_weight", None), y, _worker_state["sample_weight"])
+    model = build_model(trial["model_name"], params, n_jobs=1, class_weight=class_weight)
+    model.fit(x, y, sample_weight=sample_weight)
+    fit_seconds = time.perf_counter() - start
+    y_pred = np.concatenate([model.predict(x[validation_indices[i:i + _PREDICT_CHUNK_SIZE]])
+                             for i in range(0, len(validation_indices), _PREDICT_CHUNK_SIZE)])
+    y_true, validation_weight = y[validation_indices], _worker_state["validation_weight"]
+    metrics = {name: float(scorer(y_true, y_pred, sample_weight=validation_weight) if name == "accuracy"
+                           else scorer(y_true, y_pred, sample_weight=validation_weight, zero_division=0))
+               for name, scorer in SCORERS.items()}
+    return {**trial, **metrics, "fit_seconds": fit_seconds}
+
+
+class HyperparameterSearch:
+    """
+    Successive halving / Hyperband search over the hyperparameters of a model family.
+
+    The ensemble size (trees, or boosting iterations) is the budget: every rung
+    trains the surviving candidates with `eta` times more budget than the previous
+    one and only the best `1/eta` are promoted, so bad trials are stopped after
+    their cheapest fit. Trials run
+    in a process pool; each worker memory-maps the transformed `.npy` training
+    arrays read-only once, so the data is shared through the page cache instead
+    of being pickled to or copied by every trial.
+    """
+
+    def __init__(self, x_file_path: str, y_file_path: str, search_config: dict, base_params: Optional[dict] = None,
+                 model_name: str = "random_forest", w_file_path: Optional[str] = None, random_state: Optional[int] = None, logger: Optional[Logger] = None):
+        """
+        Args:
+            x_file_path (str): Transformed training features (`.npy`).
+            y_file_path (str): Training labels (`.npy`).
+            search_config (dict): `search` section of Config/Model.yaml, with `space` resolved for the model family.
+            base_params (Optional[dict]): Parameters shared by all trials (e.g. `random_state`, `class_weight`).
+            model_name (str): Model family to search, a key of MODEL_FAMILIES.
+            w_file_path (Optional[str]): Training row weights (`.npy`) of compacted training data.
+            random_state (Optional[int]): Seed for candidate sampling and the validation split.
+            logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+        """
+        self.logger = logger or configure_logger(
+                                        logger_name=__name__,
+                                        level="DEBUG",
+                                        to_console=True,
+                                        to_file=True,
+                                        log_file_name=__name__
+                                        )
+        self.x_file_path = x_file_path
+        self.y_file_path = y_file_path
+        self.w_file_path = w_file_path
+        self.model_name = model_name
+        self.budget_param = get_model_family(model_name).budget_param
+        self.base_params = {key: value for key, value in (base_params or {}).items() if key not in (self.budget_param, "n_jobs")}
+        self.random_state = random_state
+        self.strategy = search_config.get("strategy", "successive_halving")
+        self.scoring = search_config.get("scoring", "f1")
+        self.n_candidates = int(search_config.get("n_candidates", 27))
+        self.min_resource = int(search_config.get("min_resource", 25))
+        self.max_resource = int(search_config.get("max_resource", 200))
+        self.eta = int(search_config.get("eta", 3))
+        self.validation_fraction = float(search_config.get("validation_fraction", 0.2))
+        n_jobs = int(search_config.get("n_jobs", -1))
+        self.n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        self.space = search_config.get("space") or {}
+        self.trials: List[dict] = []
+
+    def _evaluate(self, executor: Optional[ProcessPoolExecutor], trials: List[dict]) -> List[dict]:
+        results = list(executor.map(_run_trial, trials)) if executor else [_run_trial(trial) for trial in trials]
+        self.trials.extend(results)
+        return results
+
+    def _successive_halving(self, executor: Optional[ProcessPoolExecutor], candidates: List[dict], min_resource: int, bracket: int) -> None:
+        survivors = [{"trial_id": len(self.trials) + index, "model_name": self.model_name, "params": {**self.base_params, **params}}
+                     for index, params in enumerate(candidates)]
+        resource, rung = min_resource, 0
+        while True:
+            budget = min(int(round(resource)), self.max_resource)
+            results = self._evaluate(executor, [{**trial, "bracket": bracket, "rung": rung, "budget": budget} for trial in survivors])
+            best = max(results, key=lambda result: result[self.scoring])
+            self.logger.info(f"Bracket {bracket} rung {rung}: {len(results)} trials x {budget} {self.budget_param}, "
+                             f"best {self.scoring}={best[self.scoring]:.4f}")
+            if budget >= self.max_resource or len(results) <= 1:
+                return
+            keep = max(1, len(results) // self.eta)
+            survivors = [{"trial_id": result["trial_id"], "model_name": self.model_name, "params": result["params"]}
+                         for result in sorted(results, key=lambda result: result[self.scoring], reverse=True)[:keep]]
+            resource, rung = resource * self.eta, rung + 1
+
+    def run(self) -> Tuple[dict, List[dict]]:
+        """
+        Runs the search.
+
+        Returns:
+            Tuple[dict, List[dict]]: Best hyperparameters (base parameters included, without the budget parameter) and every
+            trial result (params, budget, validation metrics and fit time), best first.
+        """
+        try:
+            if self.strategy not in SEARCH_STRATEGIES:
+                raise ValueError(f"Unknown search strategy '{self.strategy}', expected one of {SEARCH_STRATEGIES}")
+            if self.scoring not in SCORERS:
+                raise ValueError(f"Unknown scoring '{self.scoring}', expected one of {tuple(SCORERS)}")
+            self.trials = []
+            start = time.perf_counter()
+            init_args = (self.x_file_path, self.y_file_path, self.w_file_path, self.validation_fraction, self.random_state)
+            executor = ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker, initargs=(*init_args, 1)) if self.n_jobs > 1 else None
+            if executor is None:
+                _init_worker(*init_args)
+            try:
+                if self.strategy == "successive_halving":
+                    candidates = sample_search_space(self.space, self.n_candidates, random_state=self.random_state)
+                    self._successive_halving(executor, candidates, self.min_resource, bracket=0)
+                else:
+                    s_max = int(math.floor(math.log(self.max_resource / self.min_resource, self.eta) + 1e-9))
+                    for bracket, s in enumerate(range(s_max, -1, -1)):
+                        n_candidates = int(math.ceil((s_max + 1) / (s + 1) * self.eta ** s))
+                        seed = None if self.random_state is None else self.random_state + bracket
+                        candidates = sample_search_space(self.space, n_candidates, random_state=seed)
+                        self._successive_halving(executor, candidates, self.max_resource / self.eta ** s, bracket=bracket)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+                _worker_state.clear()
+
+            # Only trials that reached the largest budget are comparable with the final model
+            max_budget = max(trial["budget"] for trial in self.trials)
+            leaderboard = sorted(self.trials, key=lambda trial: (trial["budget"] == max_budget, trial[self.scoring]), reverse=True)
+            best_params = leaderboard[0]["params"]
+            self.logger.info(f"Search finished: {len(self.trials)} trials in {time.perf_counter() - start:.1f}s, "
+                             f"best {self.scoring}={leaderboard[0][self.scoring]:.4f} with {best_params}")
+            return best_params, leaderboard
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
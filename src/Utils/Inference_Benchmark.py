@@ -0,0 +1,126 @@
+import os
+import sys
+import time
+import numpy as np
+from typing import Optional, List, Sequence
+from logging import Logger
+from pandas import DataFrame
+from src.Exception import MyException
+from src.Logger import configure_logger
+from src.Entity.Artifact_Entity import InferenceBenchmarkArtifact
+from src.Utils.Main_Utils import load_object
+
+
+def _benchmark_round(model_file_path: str, records: DataFrame, single_rows: int, batch_chunk_size: int, logger: Logger) -> dict:
+    # One load, one warm-up call (lazy imports and allocations are not timed), the single-record calls and one batch
+    start = time.perf_counter()
+    model = load_object(model_file_path, logger=logger)
+    load_seconds = time.perf_counter() - start
+    model.predict(records.iloc[:1])
+    latencies = []
+    for index in range(min(single_rows, len(records))):
+        start = time.perf_counter()
+        model.predict(records.iloc[index:index + 1])
+        latencies.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    model.predict_batch(records, chunk_size=batch_chunk_size)
+    batch_seconds = time.perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    return {"load_seconds": load_seconds, "p50_latency_ms": float(p50), "p99_latency_ms": float(p99),
+            "batch_rows_per_second": len(records) / batch_seconds}
+
+
+def benchmark_model_files(model_file_paths: Sequence[str], records: DataFrame, single_rows: int = 200, batch_chunk_size: int = 100_000,
+                          repeats: int = 3, logger: Optional[Logger] = None) -> List[InferenceBenchmarkArtifact]:
+    """
+    Measures what serving persisted `MyModel`s costs: file size, load time, single-record
+    latency (p50/p99 over `single_rows` calls of `predict`) and `predict_batch` throughput.
+
+    The models are benchmarked in `repeats` rounds, alternating between them within every
+    round, and each measure is the median over the rounds. Drifts of the machine (CPU
+    frequency, other processes, page cache) then hit all models alike instead of whichever
+    model happened to run during them.
+
+    Args:
+        model_file_paths (Sequence[str]): Serialized `MyModel`s, compared on the same records.
+        records (DataFrame): Raw schema records, the first `single_rows` are predicted one by one.
+        single_rows (int): Single-record predictions timed per round.
+        batch_chunk_size (int): Chunk size of `predict_batch`.
+        repeats (int): Rounds over all models.
+        logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+
+    Returns:
+        List[InferenceBenchmarkArtifact]: Median size, load time, latencies and throughput per model, in input order.
+    """
+    logger = logger or configure_logger(
+                                    logger_name=__name__,
+                                    level="DEBUG",
+                                    to_console=True,
+                                    to_file=True,
+                                    log_file_name=__name__
+                                    )
+    try:
+        rounds = [[] for _ in model_file_paths]
+        for _ in range(max(1, repeats)):
+            for model_rounds, model_file_path in zip(rounds, model_file_paths):
+                model_rounds.append(_benchmark_round(model_file_path, records, single_rows, batch_chunk_size, logger))
+
+        benchmarks = []
+        for model_rounds, model_file_path in zip(rounds, model_file_paths):
+            medians = {name: float(np.median([model_round[name] for model_round in model_rounds])) for name in model_rounds[0]}
+            throughputs = [model_round["batch_rows_per_second"] for model_round in model_rounds]
+            benchmark = InferenceBenchmarkArtifact(model_size_mb=os.path.getsize(model_file_path) / 1024**2, **medians,
+                                                   batch_throughput_spread=(max(throughputs) - min(throughputs)) / medians["batch_rows_per_second"])
+            logger.info(f"Inference benchmark of {model_file_path} (median of {len(model_rounds)} rounds): {benchmark}")
+            benchmarks.append(benchmark)
+        return benchmarks
+    except Exception as e:
+        raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+
+def benchmark_model_file(model_file_path: str, records: DataFrame, single_rows: int = 200, batch_chunk_size: int = 100_000,
+                         repeats: int = 3, logger: Optional[Logger] = None) -> InferenceBenchmarkArtifact:
+    """
+    Benchmarks a single persisted `MyModel`, see `benchmark_model_files`.
+    """
+    return benchmark_model_files([model_file_path], records, single_rows=single_rows, batch_chunk_size=batch_chunk_size,
+                                 repeats=repeats, logger=logger)[0]
+
+
+def inference_regressions(candidate: InferenceBenchmarkArtifact, baseline: InferenceBenchmarkArtifact,
+                          max_p99_latency_ratio: Optional[float] = None, min_throughput_ratio: Optional[float] = None,
+                          max_load_time_ratio: Optional[float] = None, max_model_size_ratio: Optional[float] = None,
+                          min_regression_ms: float = 0.0, throughput_noise_floor: float = 0.0) -> List[str]:
+    """
+    Compares the benchmark of a candidate model with the one of the baseline (production) model.
+
+    Args:
+        candidate (InferenceBenchmarkArtifact): Benchmark of the candidate model.
+        baseline (InferenceBenchmarkArtifact): Benchmark of the baseline model, on the same records and hardware.
+        max_p99_latency_ratio (Optional[float]): Largest allowed candidate / baseline p99 single-record latency.
+        min_throughput_ratio (Optional[float]): Smallest allowed candidate / baseline batch throughput.
+        max_load_time_ratio (Optional[float]): Largest allowed candidate / baseline load time.
+        max_model_size_ratio (Optional[float]): Largest allowed candidate / baseline model size.
+        min_regression_ms (float): Latency and load time increases below this are timing noise and always allowed.
+        throughput_noise_floor (float): Relative throughput shortfall below the threshold that is timing noise and
+            always allowed; the larger throughput spread over the benchmark repeats of either model is used if larger.
+
+    Returns:
+        List[str]: One message per exceeded threshold, empty if the candidate passes (None disables a threshold).
+    """
+    regressions = []
+    if (max_p99_latency_ratio is not None and candidate.p99_latency_ms > baseline.p99_latency_ms * max_p99_latency_ratio
+            and candidate.p99_latency_ms - baseline.p99_latency_ms > min_regression_ms):
+        regressions.append(f"p99 latency {candidate.p99_latency_ms:.2f}ms exceeds {max_p99_latency_ratio}x the production "
+                           f"{baseline.p99_latency_ms:.2f}ms")
+    throughput_noise = max(throughput_noise_floor, candidate.batch_throughput_spread, baseline.batch_throughput_spread)
+    if (min_throughput_ratio is not None
+            and candidate.batch_rows_per_second < baseline.batch_rows_per_second * min_throughput_ratio * (1 - throughput_noise)):
+        regressions.append(f"batch throughput {candidate.batch_rows_per_second:,.0f} rows/s is below {min_throughput_ratio}x the production "
+                           f"{baseline.batch_rows_per_second:,.0f} rows/s (beyond a {throughput_noise:.0%} noise margin)")
+    if (max_load_time_ratio is not None and candidate.load_seconds > baseline.load_seconds * max_load_time_ratio
+            and (candidate.load_seconds - baseline.load_seconds) * 1000 > min_regression_ms):
+        regressions.append(f"load time {candidate.load_seconds:.3f}s exceeds {max_load_time_ratio}x the production {baseline.load_seconds:.3f}s")
+    if max_model_size_ratio is not None and candidate.model_size_mb > baseline.model_size_mb * max_model_size_ratio:
+        regressions.append(f"model size {candidate.model_size_mb:.2f}MB exceeds {max_model_size_ratio}x the production {baseline.model_size_mb:.2f}MB")
+    return regressions
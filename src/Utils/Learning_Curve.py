@@ -0,0 +1,178 @@
+import os
+import sys
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Dict, Any, Tuple
+from logging import Logger
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
+from src.Exception import MyException
+from src.Logger import configure_logger
+from src.Entity.Model_Families import build_model, get_model_family
+from src.Utils.Resampling_Utils import resample_imbalanced
+from src.Utils.Hyperparameter_Search import SCORERS
+
+_PREDICT_CHUNK_SIZE = 100_000
+
+# Opened once per worker process and shared by every point that process fits
+_worker_state: Dict[str, Any] = {}
+
+
+def stratified_sample_indices(y: np.ndarray, fraction: float, random_state: Optional[int] = None) -> np.ndarray:
+    """
+    Draws a stratified sample of row indices.
+
+    Args:
+        y (np.ndarray): Class labels of all rows.
+        fraction (float): Share of the rows to keep, 1.0 keeps all of them.
+        random_state (Optional[int]): Seed for the draw.
+
+    Returns:
+        np.ndarray: Sorted indices of the sampled rows.
+    """
+    if fraction >= 1.0:
+        return np.arange(len(y))
+    indices, _ = train_test_split(np.arange(len(y)), train_size=fraction, stratify=y, random_state=random_state)
+    return np.sort(indices)
+
+
+def _init_worker(x_file_path: str, y_file_path: str, validation_fraction: float, random_state: Optional[int],
+                 max_threads: Optional[int] = None) -> None:
+    """
+    Memory-maps the encoded training arrays read-only and splits off the stratified
+    validation hold-out every point of the curve is scored on. Pool workers limit
+    OpenMP/BLAS to `max_threads` so gradient boosting fits do not oversubscribe the cores.
+    """
+    if max_threads is not None:
+        threadpool_limits(limits=max_threads)
+    x = np.load(x_file_path, mmap_mode="r")
+    y = np.load(y_file_path, mmap_mode="r")
+    pool_indices, validation_indices = train_test_split(np.arange(len(y)), test_size=validation_fraction, stratify=y, random_state=random_state)
+    _worker_state.update(x=x, y=y, pool_indices=np.sort(pool_indices), validation_indices=np.sort(validation_indices))
+
+
+def _run_point(point: dict) -> dict:
+    x, y = _worker_state["x"], _worker_state["y"]
+    pool_indices, validation_indices = _worker_state["pool_indices"], _worker_state["validation_indices"]
+    start = time.perf_counter()
+    sample_indices = pool_indices[stratified_sample_indices(y[pool_indices], point["fraction"], random_state=point["random_state"])]
+    x_sample, y_sample = np.asarray(x[sample_indices]), np.asarray(y[sample_indices])
+    x_resampled, y_resampled = resample_imbalanced(x_sample, y_sample, strategy=point["imbalance_strategy"],
+                                                   random_state=point["random_state"], n_jobs=1, **point["resampling"])
+    resample_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    model = build_model(point["model_name"], point["params"], n_jobs=1, class_weight=point["class_weight"])
+    if not get_model_family(point["model_name"]).scale_invariant:
+        # Fitted on the resampled sample like the pipeline's scalers, applied to the validation rows too
+        model = make_pipeline(StandardScaler(), model)
+    model.fit(x_resampled, y_resampled)
+    fit_seconds = time.perf_counter() - start
+    y_pred = np.concatenate([model.predict(x[validation_indices[i:i + _PREDICT_CHUNK_SIZE]])
+                             for i in range(0, len(validation_indices), _PREDICT_CHUNK_SIZE)])
+    y_true = y[validation_indices]
+    metrics = {name: float(scorer(y_true, y_pred) if name == "accuracy" else scorer(y_true, y_pred, zero_division=0))
+               for name, scorer in SCORERS.items()}
+    return {"fraction": point["fraction"], "n_rows": int(len(y_sample)), "n_resampled_rows": int(len(y_resampled)),
+            **metrics, "resample_seconds": resample_seconds, "fit_seconds": fit_seconds, "seconds": resample_seconds + fit_seconds}
+
+
+class LearningCurve:
+    """
+    Learning curve of the configured model over the training-set size.
+
+    Every point draws a stratified fraction of the encoded training data *before*
+    the class-imbalance strategy, resamples and fits it exactly like a full run
+    would and scores the model on a fixed stratified validation hold-out, so the
+    curve shows what the extra rows buy against what they cost in resampling and
+    fitting time. Points are fitted in a process pool that memory-maps the encoded
+    `.npy` arrays read-only. Features of tree ensembles are not scaled, they are
+    invariant to the per-feature affine scalers; other families (`sgd_logistic`)
+    are fitted behind a StandardScaler fitted on each resampled sample.
+    """
+
+    def __init__(self, x_file_path: str, y_file_path: str, curve_config: dict, model_name: str, model_params: dict,
+                 imbalance_strategy: str, resampling_params: Optional[dict] = None, random_state: Optional[int] = None,
+                 logger: Optional[Logger] = None):
+        """
+        Args:
+            x_file_path (str): Encoded, not yet resampled training features (`.npy`).
+            y_file_path (str): Training labels (`.npy`).
+            curve_config (dict): `learning_curve` section of Config/Model.yaml.
+            model_name (str): Model family to fit, a key of MODEL_FAMILIES.
+            model_params (dict): Hyperparameters of the model.
+            imbalance_strategy (str): Class-imbalance strategy applied to every sample.
+            resampling_params (Optional[dict]): Extra `resample_imbalanced` arguments (`chunk_size`, `max_synthetic_samples`).
+            random_state (Optional[int]): Seed for the samples, the validation split and the resampling.
+            logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+        """
+        self.logger = logger or configure_logger(
+                                        logger_name=__name__,
+                                        level="DEBUG",
+                                        to_console=True,
+                                        to_file=True,
+                                        log_file_name=__name__
+                                        )
+        self.x_file_path = x_file_path
+        self.y_file_path = y_file_path
+        self.model_name = model_name
+        self.model_params = {key: value for key, value in model_params.items() if key != "n_jobs"}
+        self.imbalance_strategy = imbalance_strategy
+        self.resampling_params = resampling_params or {}
+        self.random_state = random_state
+        self.fractions = sorted(float(fraction) for fraction in curve_config.get("fractions", [0.05, 0.1, 0.2, 0.4, 0.7, 1.0]))
+        self.scoring = curve_config.get("scoring", "f1")
+        self.tolerance = float(curve_config.get("tolerance", 0.005))
+        self.validation_fraction = float(curve_config.get("validation_fraction", 0.2))
+        n_jobs = int(curve_config.get("n_jobs", -1))
+        self.n_jobs = min(os.cpu_count() if n_jobs == -1 else n_jobs, len(self.fractions))
+
+    def recommend(self, curve: List[dict]) -> float:
+        """
+        Returns the smallest fraction whose score is within `tolerance` of the best score on the curve.
+        """
+        best_score = max(point[self.scoring] for point in curve)
+        return min(point["fraction"] for point in curve if point[self.scoring] >= best_score - self.tolerance)
+
+    def run(self) -> Tuple[float, List[dict]]:
+        """
+        Fits every point of the curve.
+
+        Returns:
+            Tuple[float, List[dict]]: Recommended fraction and the curve (fraction, rows before and after
+            resampling, validation metrics, resampling and fitting wall time), by increasing fraction.
+        """
+        try:
+            if self.scoring not in SCORERS:
+                raise ValueError(f"Unknown scoring '{self.scoring}', expected one of {tuple(SCORERS)}")
+            if not self.fractions or not all(0.0 < fraction <= 1.0 for fraction in self.fractions):
+                raise ValueError(f"Learning curve fractions must be in (0, 1], got {self.fractions}")
+            start = time.perf_counter()
+            points = [{"fraction": fraction, "model_name": self.model_name, "params": self.model_params,
+                       "class_weight": "balanced" if self.imbalance_strategy == "class_weight" else None,
+                       "imbalance_strategy": self.imbalance_strategy, "resampling": self.resampling_params,
+                       "random_state": self.random_state}
+                      for fraction in self.fractions]
+            init_args = (self.x_file_path, self.y_file_path, self.validation_fraction, self.random_state)
+            if self.n_jobs > 1:
+                # Largest fractions first so the longest fits do not end up last in the queue
+                with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker, initargs=(*init_args, 1)) as executor:
+                    curve = list(executor.map(_run_point, points[::-1]))
+            else:
+                _init_worker(*init_args)
+                try:
+                    curve = [_run_point(point) for point in points[::-1]]
+                finally:
+                    _worker_state.clear()
+            curve.sort(key=lambda point: point["fraction"])
+            for point in curve:
+                self.logger.info(f"Learning curve: fraction {point['fraction']:.2f} ({point['n_rows']} rows) "
+                                 f"{self.scoring}={point[self.scoring]:.4f} in {point['seconds']:.1f}s")
+            recommended_fraction = self.recommend(curve)
+            self.logger.info(f"Learning curve of {len(curve)} points in {time.perf_counter() - start:.1f}s, "
+                             f"recommended training fraction: {recommended_fraction}")
+            return recommended_fraction, curve
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
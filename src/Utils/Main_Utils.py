@@ -4,11 +4,15 @@ import yaml
 import dill
 import json
 import numpy as np
-from pandas import DataFrame,read_csv
-from typing import Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas import DataFrame,read_csv,read_parquet
+from typing import Optional, List, Iterator
 from logging import Logger
 from src.Exception import MyException
 from src.Logger import configure_logger
+from src.Constants import PARQUET_COMPRESSION
+from src.Entity.Artifact_Entity import DataIngestionArtifact
 
 
 
@@ -164,7 +168,47 @@ def save_numpy_array(file_path: str, array: np.array, logger: Optional[Logger] =
         raise MyException(error_message=e, error_detail=sys, logger=logger) from e
 
 
-def load_numpy_array(file_path: str, logger: Optional[Logger] = None) -> np.array:
+def create_numpy_memmap(file_path: str, shape: tuple, dtype: np.dtype = np.float32, logger: Optional[Logger] = None) -> np.memmap:
+    """
+    Preallocates a `.npy` file and returns it as a writable memory-mapped array.
+
+    Rows written into the returned array go straight to the page cache / disk,
+    so large transformed datasets never need a second in-memory copy. Call
+    `.flush()` when done writing.
+
+    Parameters:
+    -----------
+    file_path : str
+        Destination path of the `.npy` file.
+    shape : tuple
+        Shape of the array.
+    dtype : np.dtype, default=np.float32
+        Data type of the array.
+    logger : Optional[Logger], default=None
+        Custom logger instance. If not provided, a base logger will be used.
+
+    Raises:
+    -------
+    MyException
+        If the file cannot be created.
+    """
+    logger = logger or configure_logger(
+                                    logger_name=__name__,
+                                    level="DEBUG",
+                                    to_console=True,
+                                    to_file=True,
+                                    log_file_name=__name__
+                                    )
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        array = np.lib.format.open_memmap(file_path, mode="w+", dtype=dtype, shape=shape)
+        logger.info(f"Memory-mapped NumPy array {shape} {np.dtype(dtype).name} created at: {file_path}")
+        return array
+    except Exception as e:
+        raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+
+def load_numpy_array(file_path: str, logger: Optional[Logger] = None, mmap_mode: Optional[str] = None) -> np.array:
     """
     Loads a NumPy array from a `.npy` file.
 
@@ -174,6 +218,9 @@ def load_numpy_array(file_path: str, logger: Optional[Logger] = None) -> np.arra
         Path to the `.npy` file.
     logger : Optional[Logger], default=None
         Custom logger instance. If not provided, a base logger will be used.
+    mmap_mode : Optional[str], default=None
+        If given (e.g. "r"), the file is memory-mapped instead of read into memory,
+        see `numpy.load`.
 
     Returns:
     --------
@@ -197,6 +244,11 @@ def load_numpy_array(file_path: str, logger: Optional[Logger] = None) -> np.arra
             logger.error("File Not Found: %s", file_path)
             raise FileNotFoundError(f"{file_path} does not exist.")
         
+        if mmap_mode is not None:
+            array = np.load(file_path, mmap_mode=mmap_mode)
+            logger.info(f"NumPy array memory-mapped ({mmap_mode}) from: {file_path}")
+            return array
+
         with open(file_path, 'rb') as file_obj:
             array = np.load(file_obj)
             logger.info(f"NumPy array loaded from: {file_path}")
@@ -240,22 +292,69 @@ def save_object(file_path: str, obj: object, logger: Optional[Logger] = None) ->
         raise MyException(error_message=e, error_detail=sys, logger=logger) from e
 
 
-def read_csv_data(file_path: str, logger: Optional[Logger] = None) -> DataFrame:
+def save_dataframe(file_path: str, dataframe: DataFrame, logger: Optional[Logger] = None) -> None:
+    """
+    Saves a DataFrame to disk, choosing the format from the file extension.
+
+    `.parquet` files are written column-wise with `PARQUET_COMPRESSION` and keep
+    the DataFrame dtypes (including `category`, `int8`, `float32`), anything
+    else is written as a plain CSV file.
+
+    Parameters:
+    -----------
+    file_path : str
+        Destination path. The extension decides the format.
+    dataframe : DataFrame
+        The data to persist.
+    logger : Optional[Logger], default=None
+        Custom logger instance. If not provided, a base logger will be used.
+
+    Raises:
+    -------
+    MyException
+        If writing the file fails.
+    """
+    logger = logger or configure_logger(
+                                    logger_name=__name__,
+                                    level="DEBUG",
+                                    to_console=True,
+                                    to_file=True,
+                                    log_file_name=__name__
+                                    )
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        if file_path.endswith(".parquet"):
+            dataframe.to_parquet(file_path, index=False, compression=PARQUET_COMPRESSION)
+        else:
+            dataframe.to_csv(file_path, index=False, header=True)
+        logger.info(f"DataFrame saved at: {file_path} ({os.path.getsize(file_path)/1024:.2f} KB)")
+    except Exception as e:
+        raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+
+def read_csv_data(file_path: str, logger: Optional[Logger] = None, columns: Optional[List[str]] = None) -> DataFrame:
     """
-    Reads a CSV file and returns it as a pandas DataFrame.
+    Reads a tabular data file and returns it as a pandas DataFrame.
+
+    Despite its name the function reads both CSV and parquet artifacts, the
+    format is picked from the file extension so callers don't need to care
+    which one the ingestion stage produced.
 
     Parameters:
     -----------
     file_path : str
-        The full path to the CSV file you want to read.
+        The full path to the `.csv` or `.parquet` file you want to read.
 
     logger : Optional[Logger], default = None
         A custom logger instance. If not provided, it will fall back to the module's base_logger.
 
+    columns : Optional[List[str]], default = None
+        Subset of columns to load. For parquet files only these columns are read from disk.
+
     Returns:
     --------
     DataFrame
-        The loaded data from the CSV file as a pandas DataFrame.
+        The loaded data as a pandas DataFrame.
 
     Raises:
     -------
@@ -274,13 +373,412 @@ def read_csv_data(file_path: str, logger: Optional[Logger] = None) -> DataFrame:
                                     log_file_name=__name__
                                     )
         if os.path.exists(file_path):
-            return read_csv(file_path)
+            if file_path.endswith(".parquet"):
+                return read_parquet(file_path, columns=columns)
+            return read_csv(file_path, usecols=columns)
         else:
             logger.error("File Not Found: %s", file_path)
             raise FileNotFoundError(f"{file_path} does not exist.")
     except Exception as e:
         raise MyException(error_message=e, error_detail=sys, logger=logger) from e
 
+def save_split_indices(file_path: str, train_indices: np.ndarray, test_indices: np.ndarray, logger: Optional[Logger] = None) -> None:
+    """
+    Saves train/test row positions into the feature store as a compressed `.npz` file.
+
+    Indices are stored as int32 whenever the feature store is small enough,
+    which keeps the file a small fraction of a materialized train/test copy.
+
+    Parameters:
+    -----------
+    file_path : str
+        Destination `.npz` path.
+    train_indices : np.ndarray
+        Row positions of the training set in the feature store.
+    test_indices : np.ndarray
+        Row positions of the test set in the feature store.
+    logger : Optional[Logger], default=None
+        Custom logger instance. If not provided, a base logger will be used.
+
+    Raises:
+    -------
+    MyException
+        If saving the indices fails.
+    """
+    logger = logger or configure_logger(
+                                    logger_name=__name__,
+                                    level="DEBUG",
+                                    to_console=True,
+                                    to_file=True,
+                                    log_file_name=__name__
+                                    )
+    try:
+        n_rows = len(train_indices) + len(test_indices)
+        index_dtype = np.int32 if n_rows < np.iinfo(np.int32).max else np.int64
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        np.savez_compressed(file_path, train=np.asarray(train_indices, dtype=index_dtype), test=np.asarray(test_indices, dtype=index_dtype))
+        logger.info(f"Split indices saved at: {file_path} ({os.path.getsize(file_path)/1024:.2f} KB)")
+    except Exception as e:
+        raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+
+def read_ingested_split(data_ingestion_artifact: DataIngestionArtifact, split: str, logger: Optional[Logger] = None,
+                        columns: Optional[List[str]] = None) -> DataFrame:
+    """
+    Materializes the train or test set produced by the ingestion stage.
+
+    Works for both ingestion layouts: separate train/test files, or a single
+    feature store snapshot plus persisted split indices. In the latter case the
+    view is only built when this function is called and only `columns` are read.
+
+    Parameters:
+    -----------
+    data_ingestion_artifact : DataIngestionArtifact
+        Output of the ingestion stage.
+    split : str
+        Either "train" or "test".
+    logger : Optional[Logger], default=None
+        Custom logger instance. If not provided, a base logger will be used.
+    columns : Optional[List[str]], default=None
+        Subset of columns to load.
+
+    Returns:
+    --------
+    DataFrame
+        The requested split with a fresh RangeIndex.
+
+    Raises:
+    -------
+    MyException
+        If the split name is unknown or reading fails.
+    """
+    logger = logger or configure_logger(
+                                    logger_name=__name__,
+                                    level="DEBUG",
+                                    to_console=True,
+                                    to_file=True,
+                                    log_file_name=__name__
+                                    )
+    try:
+        if split not in ("train", "test"):
+            raise ValueError(f"Unknown split '{split}', expected 'train' or 'test'.")
+        if data_ingestion_artifact.split_indices_file_path is None:
+            file_path = data_ingestion_artifact.training_data_file_path if split == "train" else data_ingestion_artifact.test_data_file_path
+            return read_csv_data(file_path, logger=logger, columns=columns)
+
+        logger.debug(f"Materializing '{split}' split from: {data_ingestion_artifact.feature_store_file_path}")
+        with np.load(data_ingestion_artifact.split_indices_file_path) as split_indices:
+            indices = split_indices[split]
+        dataframe = read_csv_data(data_ingestion_artifact.feature_store_file_path, logger=logger, columns=columns)
+        return dataframe.take(indices).reset_index(drop=True)
+    except Exception as e:
+        raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+
+def iter_ingested_split_chunks(data_ingestion_artifact: DataIngestionArtifact, split: str, chunk_size: int,
+                               logger: Optional[Logger] = None, columns: Optional[List[str]] = None) -> Iterator[DataFrame]:
+    """
+    Streams the train or test set produced by the ingestion stage in chunks.
+
+    Same layouts as `read_ingested_split`, but at most about `chunk_size` rows
+    are held in memory at a time. For parquet the batches are read straight
+    from the file, for index-based splits every feature store batch is
+    filtered down to the rows of the requested split.
+
+    Parameters:
+    -----------
+    data_ingestion_artifact : DataIngestionArtifact
+        Output of the ingestion stage.
+    split : str
+        Either "train" or "test".
+    chunk_size : int
+        Number of rows read per batch.
+    logger : Optional[Logger], default=None
+        Custom logger instance. If not provided, a base logger will be used.
+    columns : Optional[List[str]], default=None
+        Subset of columns to load.
+
+    Yields:
+    -------
+    DataFrame
+        Consecutive chunks of the split, each with a fresh RangeIndex.
+    """
+    logger = logger or configure_logger(
+                                    logger_name=__name__,
+                                    level="DEBUG",
+                                    to_console=True,
+                                    to_file=True,
+                                    log_file_name=__name__
+                                    )
+    try:
+        if split not in ("train", "test"):
+            raise ValueError(f"Unknown split '{split}', expected 'train' or 'test'.")
+        row_filter = None
+        if data_ingestion_artifact.split_indices_file_path is None:
+            file_path = data_ingestion_artifact.training_data_file_path if split == "train" else data_ingestion_artifact.test_data_file_path
+        else:
+            file_path = data_ingestion_artifact.feature_store_file_path
+            with np.load(data_ingestion_artifact.split_indices_file_path) as split_indices:
+                n_rows = len(split_indices["train"]) + len(split_indices["test"])
+                row_filter = np.zeros(n_rows, dtype=bool)
+                row_filter[split_indices[split]] = True
+
+        if not os.path.exists(file_path):
+            logger.error("File Not Found: %s", file_path)
+            raise FileNotFoundError(f"{file_path} does not exist.")
+        if file_path.endswith(".parquet"):
+            batches = (batch.to_pandas() for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_size, columns=columns))
+        else:
+            batches = read_csv(file_path, usecols=columns, chunksize=chunk_size)
+
+        offset = 0
+        for chunk in batches:
+            if row_filter is not None:
+                keep = row_filter[offset:offset + len(chunk)]
+                offset += len(chunk)
+                chunk = chunk[keep].reset_index(drop=True)
+            if len(chunk):
+                yield chunk
+    except Exception as e:
+        raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+
+def compact_dataframe(dataframe: DataFrame, dtype_map: dict, logger: Optional[Logger] = None) -> DataFrame:
+    """
+    Downcasts DataFrame columns to the memory-compact dtypes declared in the schema.
+
+    Integer targets are only applied when the column has no missing values and
+    all values fit into the target type, otherwise the column is left as it is
+    and a warning is logged. Columns that are not present are skipped.
+
+    Parameters:
+    -----------
+    dataframe : DataFrame
+        The freshly ingested data.
+    dtype_map : dict
+        Mapping of column name to target dtype, e.g. `{"Age": "int8", "Gender": "category"}`
+        (the `compact_dtypes` section of Schema.yaml).
+    logger : Optional[Logger], default=None
+        Custom logger instance. If not provided, a base logger will be used.
+
+    Returns:
+    --------
+    DataFrame
+        The compacted DataFrame. The memory saved is logged.
+
+    Raises:
+    -------
+    MyException
+        If a conversion fails.
+    """
+    logger = logger or configure_logger(
+                                    logger_name=__name__,
+                                    level="DEBUG",
+                                    to_console=True,
+                                    to_file=True,
+                                    log_file_name=__name__
+                                    )
+    try:
+        memory_before = dataframe.memory_usage(deep=True).sum()
+        converted = {}
+        for column, target_dtype in dtype_map.items():
+            if column not in dataframe.columns:
+                continue
+            series = dataframe[column]
+            if target_dtype != "category" and np.issubdtype(np.dtype(target_dtype), np.integer):
+                if series.isna().any():
+                    logger.warning(f"Column '{column}' has missing values, keeping dtype '{series.dtype}' instead of '{target_dtype}'.")
+                    continue
+                limits = np.iinfo(target_dtype)
+                if series.min() < limits.min or series.max() > limits.max:
+                    logger.warning(f"Values of column '{column}' don't fit into '{target_dtype}', keeping dtype '{series.dtype}'.")
+                    continue
+            converted[column] = series.astype(target_dtype)
+        dataframe = dataframe.assign(**converted)
+        memory_after = dataframe.memory_usage(deep=True).sum()
+        logger.info(f"Compacted {len(converted)} columns: {memory_before/1024**2:.2f} MB -> {memory_after/1024**2:.2f} MB "
+                    f"(saved {(memory_before - memory_after)/1024**2:.2f} MB, {100*(1 - memory_after/max(memory_before, 1)):.1f}%)")
+        return dataframe
+    except Exception as e:
+        raise MyException(error_message=e, error_detail=sys, logger=logger) from e
+
+
+class DataFrameChunkWriter:
+    """
+    Appends DataFrame chunks to a single parquet or CSV file.
+
+    Used as a context manager by the streaming ingestion so data can be written
+    as it arrives instead of being collected in memory first. For parquet later
+    chunks are cast to the schema of the file; a chunk that does not fit it (e.g. a
+    value outside the compact int8 of the first chunks, which `compact_dataframe`
+    left as int64) widens the schema and the rows written so far are rewritten
+    with it, so the value reaches the validation instead of failing the write.
+    """
+    def __init__(self, file_path: str, logger: Optional[Logger] = None):
+        self.logger = logger or configure_logger(
+                                        logger_name=__name__,
+                                        level="DEBUG",
+                                        to_console=True,
+                                        to_file=True,
+                                        log_file_name=__name__
+                                        )
+        self.file_path = file_path
+        self.n_rows = 0
+        self._parquet_writer: Optional[pq.ParquetWriter] = None
+        self._schema: Optional[pa.Schema] = None
+
+    def __enter__(self) -> "DataFrameChunkWriter":
+        try:
+            os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+            if os.path.exists(self.file_path):
+                os.remove(self.file_path)
+            return self
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def write(self, dataframe: DataFrame) -> None:
+        """Appends one chunk to the file."""
+        try:
+            if self.file_path.endswith(".parquet"):
+                table = pa.Table.from_pandas(dataframe, preserve_index=False)
+                if self._parquet_writer is None:
+                    self._schema = table.schema
+                    self._parquet_writer = pq.ParquetWriter(self.file_path, self._schema, compression=PARQUET_COMPRESSION)
+                else:
+                    try:
+                        table = table.cast(self._schema)
+                    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                        self._widen_schema(table.schema)
+                        table = table.cast(self._schema)
+                self._parquet_writer.write_table(table)
+            else:
+                dataframe.to_csv(self.file_path, mode="a", index=False, header=self.n_rows == 0)
+            self.n_rows += len(dataframe)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def _widen_schema(self, chunk_schema: pa.Schema) -> None:
+        # Promotes the file schema to hold the chunk too and rewrites the row groups written so far
+        schema = pa.unify_schemas([self._schema, chunk_schema], promote_options="permissive").with_metadata(chunk_schema.metadata)
+        self.logger.warning(f"Widening the schema of {self.file_path}: "
+                            f"{[f'{field.name}: {field.type}' for field in schema if field.type != self._schema.field(field.name).type]}")
+        self._parquet_writer.close()
+        narrow_file_path = self.file_path + ".narrow"
+        os.replace(self.file_path, narrow_file_path)
+        self._schema = schema
+        self._parquet_writer = pq.ParquetWriter(self.file_path, self._schema, compression=PARQUET_COMPRESSION)
+        for batch in pq.ParquetFile(narrow_file_path).iter_batches():
+            self._parquet_writer.write_table(pa.Table.from_batches([batch]).cast(self._schema))
+        os.remove(narrow_file_path)
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        if exc_type is None:
+            self.logger.info(f"Wrote {self.n_rows} rows to: {self.file_path}")
+
+
+def _splitmix64(values: np.ndarray) -> np.ndarray:
+    """
+    Vectorized SplitMix64 finalizer. Maps uint64 values to well-mixed uint64
+    hashes that are identical on every platform and Python process.
+    """
+    with np.errstate(over="ignore"):
+        z = values.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _hash_uniform(ids: np.ndarray, seed: int) -> np.ndarray:
+    # Top 53 bits of the keyed hash give a uniform float in [0, 1)
+    keys = _splitmix64(np.asarray(ids).astype(np.int64).view(np.uint64) ^ _splitmix64(np.array([seed], dtype=np.uint64)))
+    return (keys >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def hash_train_test_split_mask(ids: np.ndarray, test_size: float, seed: int) -> np.ndarray:
+    """
+    Deterministically assigns rows to the test set from a stable hash of their id.
+
+    Every row is placed independently of all other rows, so the function can be
+    applied chunk by chunk and an id keeps its split across incremental refreshes
+    of the collection. The split is not stratified: every class gets `test_size`
+    of its rows only in expectation (see `StratifiedHashSplitter`).
+
+    Parameters:
+    -----------
+    ids : np.ndarray
+        Integer row identifiers (e.g. the `id` column).
+    test_size : float
+        Fraction of rows to assign to the test set, in (0, 1).
+    seed : int
+        Seed mixed into the hash. Changing it gives a different split.
+
+    Returns:
+    --------
+    np.ndarray
+        Boolean mask, True where the row belongs to the test set.
+    """
+    return _hash_uniform(ids, seed) < test_size
+
+
+class StratifiedHashSplitter:
+    """
+    Stratified train/test split of a stream of chunks by per-stratum hash-rank quotas.
+
+    For every stratum the splitter keeps the rows seen and assigned to the test set
+    so far. In each chunk a stratum gets as many test rows as bring its test count to
+    `round(test_size * rows seen)`, taking the rows with the smallest id hash. Every
+    stratum ends up within one row of `test_size`, whatever the chunk size.
+
+    Unlike `hash_train_test_split_mask` a row's split depends on the rows it shares
+    a chunk with, so it is only stable across refreshes while the earlier chunks stay
+    the same (documents streamed in `_id` order and only appended).
+    """
+
+    def __init__(self, test_size: float, seed: int):
+        """
+        Parameters:
+        -----------
+        test_size : float
+            Fraction of every stratum to assign to the test set, in (0, 1).
+        seed : int
+            Seed mixed into the hash. Changing it gives a different split.
+        """
+        self.test_size = test_size
+        self.seed = seed
+        self.total_counts: dict = {}
+        self.test_counts: dict = {}
+
+    def split_mask(self, ids: np.ndarray, stratify: np.ndarray) -> np.ndarray:
+        """
+        Assigns the rows of the next chunk.
+
+        Parameters:
+        -----------
+        ids : np.ndarray
+            Integer row identifiers (e.g. the `id` column).
+        stratify : np.ndarray
+            Stratum labels (e.g. the target column) aligned with `ids`.
+
+        Returns:
+        --------
+        np.ndarray
+            Boolean mask, True where the row belongs to the test set.
+        """
+        uniform = _hash_uniform(ids, self.seed)
+        stratify = np.asarray(stratify)
+        is_test = np.zeros(len(uniform), dtype=bool)
+        for label in np.unique(stratify):
+            rows = np.flatnonzero(stratify == label)
+            total = self.total_counts.get(label, 0) + len(rows)
+            n_test = int(np.clip(np.floor(self.test_size * total + 0.5) - self.test_counts.get(label, 0), 0, len(rows)))
+            is_test[rows[np.argsort(uniform[rows], kind="stable")[:n_test]]] = True
+            self.total_counts[label] = total
+            self.test_counts[label] = self.test_counts.get(label, 0) + n_test
+        return is_test
+
+
 def update_expected_accuracy_in_constants(file_path: str, new_accuracy: float, logger: Optional[Logger])->None:
         """
         Updates the MODEL_TRAINER_EXPECTED_ACCURACY value in the given constants Python file.
@@ -0,0 +1,140 @@
+import os
+import numpy as np
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Sequence
+from threadpoolctl import threadpool_limits
+from src.Entity.Artifact_Entity import ClassificationMetricArtifact
+
+
+class ConfusionMatrixAccumulator:
+    """
+    Confusion matrix updated chunk by chunk, so predictions never have to be held for
+    the whole test set. Accuracy, precision, recall and F1 are all derived from the
+    counts, in one pass over the data, with sklearn's binary definitions (`positive_label`
+    is the positive class, an undefined ratio is 0).
+    """
+
+    def __init__(self, labels: Sequence = (0, 1), positive_label=1):
+        """
+        Args:
+            labels (Sequence): All class labels, the rows and columns of the matrix.
+            positive_label: Label the precision, recall and F1 are computed for, one of `labels`.
+
+        Raises:
+            ValueError: If `positive_label` is not one of `labels`.
+        """
+        self.labels = np.sort(np.asarray(labels))
+        if positive_label not in self.labels:
+            raise ValueError(f"Positive label {positive_label!r} is not one of the labels {self.labels.tolist()}")
+        self.positive_index = int(np.searchsorted(self.labels, positive_label))
+        self.matrix = np.zeros((len(self.labels), len(self.labels)), dtype=np.int64)
+
+    def _label_indices(self, y: np.ndarray) -> np.ndarray:
+        y = np.asarray(y).ravel()
+        indices = np.searchsorted(self.labels, y)
+        if np.any(indices >= len(self.labels)) or np.any(self.labels[np.minimum(indices, len(self.labels) - 1)] != y):
+            raise ValueError(f"Labels outside of {self.labels.tolist()} in {np.unique(y).tolist()}")
+        return indices
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> "ConfusionMatrixAccumulator":
+        """
+        Adds the (true, predicted) pairs of one chunk to the counts.
+        """
+        n_labels = len(self.labels)
+        cells = self._label_indices(y_true) * n_labels + self._label_indices(y_pred)
+        self.matrix += np.bincount(cells, minlength=n_labels * n_labels).reshape(n_labels, n_labels)
+        return self
+
+    def merge(self, other: "ConfusionMatrixAccumulator") -> "ConfusionMatrixAccumulator":
+        """
+        Adds the counts of an accumulator over the same labels, e.g. of another worker.
+        """
+        self.matrix += other.matrix
+        return self
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.matrix.sum())
+
+    def accuracy(self) -> float:
+        return float(np.trace(self.matrix) / self.n_rows) if self.n_rows else 0.0
+
+    def precision(self) -> float:
+        predicted = self.matrix[:, self.positive_index].sum()
+        return float(self.matrix[self.positive_index, self.positive_index] / predicted) if predicted else 0.0
+
+    def recall(self) -> float:
+        actual = self.matrix[self.positive_index].sum()
+        return float(self.matrix[self.positive_index, self.positive_index] / actual) if actual else 0.0
+
+    def f1(self) -> float:
+        # 2TP / (2TP + FP + FN), equal to the harmonic mean of precision and recall
+        true_positives = self.matrix[self.positive_index, self.positive_index]
+        denominator = self.matrix[:, self.positive_index].sum() + self.matrix[self.positive_index].sum()
+        return float(2 * true_positives / denominator) if denominator else 0.0
+
+    def metric_artifact(self) -> ClassificationMetricArtifact:
+        return ClassificationMetricArtifact(accuracy_score=self.accuracy(), f1_score=self.f1(),
+                                            precision_score=self.precision(), recall_score=self.recall())
+
+
+@contextmanager
+def _single_threaded_prediction(predict: Callable) -> Iterator[None]:
+    # Sets n_jobs=1 on the model behind a bound `predict` (and on the segment models of a
+    # SegmentedModel) and caps OpenMP/BLAS threads, restoring both afterwards
+    model = getattr(predict, "__self__", None)
+    estimators = [model, *getattr(model, "segment_models_", [])] if model is not None else []
+    previous = [(estimator, estimator.n_jobs) for estimator in estimators
+                if hasattr(estimator, "set_params") and "n_jobs" in estimator.get_params(deep=False)]
+    for estimator, _ in previous:
+        estimator.set_params(n_jobs=1)
+    try:
+        with threadpool_limits(limits=1):
+            yield
+    finally:
+        for estimator, n_jobs in previous:
+            estimator.set_params(n_jobs=n_jobs)
+
+
+def evaluate_in_chunks(predict: Callable[[np.ndarray], np.ndarray], x: np.ndarray, y: np.ndarray, chunk_size: int = 100_000,
+                       n_jobs: int = 1, labels: Sequence = (0, 1), positive_label=1) -> ConfusionMatrixAccumulator:
+    """
+    Predicts `x` in chunks of `chunk_size` rows and accumulates the confusion matrix.
+
+    Only one chunk of predictions per job is alive at a time, and memory-mapped test arrays
+    are only paged in chunk by chunk. With `n_jobs` > 1 the chunks are predicted by a thread
+    pool (sklearn and numpy release the GIL in their prediction loops), every thread
+    accumulating its own counts that are merged at the end. The chunks are then the
+    only parallelism: while they run, the model behind a bound `predict` (e.g. a forest
+    with `n_jobs=-1`) predicts with `n_jobs=1` and OpenMP/BLAS are capped at one thread,
+    so the threads do not each start a pool per core.
+
+    Args:
+        predict (Callable[[np.ndarray], np.ndarray]): Prediction function, e.g. `model.predict`.
+        x (np.ndarray): Features, rows are sliced lazily.
+        y (np.ndarray): True labels.
+        chunk_size (int): Rows predicted per call.
+        n_jobs (int): Chunks predicted concurrently, -1 for one per core.
+        labels (Sequence): All class labels.
+        positive_label: Label the precision, recall and F1 are computed for.
+
+    Returns:
+        ConfusionMatrixAccumulator: Counts over all rows.
+    """
+    starts = range(0, len(y), chunk_size)
+
+    def accumulate(chunk_starts: Sequence[int]) -> ConfusionMatrixAccumulator:
+        accumulator = ConfusionMatrixAccumulator(labels=labels, positive_label=positive_label)
+        for start in chunk_starts:
+            accumulator.update(y[start:start + chunk_size], predict(x[start:start + chunk_size]))
+        return accumulator
+
+    n_workers = min(len(starts), os.cpu_count() if n_jobs == -1 else n_jobs)
+    if n_workers <= 1:
+        return accumulate(starts)
+    with _single_threaded_prediction(predict), ThreadPoolExecutor(max_workers=n_workers) as executor:
+        accumulators = list(executor.map(accumulate, [starts[worker::n_workers] for worker in range(n_workers)]))
+    for accumulator in accumulators[1:]:
+        accumulators[0].merge(accumulator)
+    return accumulators[0]
@@ -0,0 +1,182 @@
+import sys
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple, Union
+from logging import Logger
+from sklearn.neighbors import NearestNeighbors
+from imblearn.over_sampling import SMOTE
+from imblearn.under_sampling import RandomUnderSampler
+from src.Exception import MyException
+from src.Logger import configure_logger
+
+
+ArrayLike = Union[pd.DataFrame, np.ndarray]
+
+# Supported values of `DataTransformationConfig.imbalance_strategy`
+IMBALANCE_STRATEGIES = ("smoteenn", "smote", "random_undersample", "class_weight", "none")
+
+
+class ParallelSMOTEENN:
+    """
+    Drop-in replacement for `imblearn.combine.SMOTEENN` (default settings) built
+    for large training sets.
+
+    - SMOTE oversampling runs its k-neighbour search with `n_jobs` workers.
+    - Edited Nearest Neighbours cleaning fits one neighbour index over the
+      oversampled data and queries it in chunks of `chunk_size` rows (also with
+      `n_jobs` workers), so the neighbour matrix of the majority class is never
+      materialized at once.
+    - `max_synthetic_samples` optionally caps how many synthetic rows SMOTE may
+      create per class.
+
+    Without a cap the result, including the row order, is the same as
+    `SMOTEENN(random_state=random_state).fit_resample(X, y)`.
+    """
+
+    def __init__(self, random_state: Optional[int] = None, n_jobs: Optional[int] = -1, chunk_size: int = 100_000,
+                 max_synthetic_samples: Optional[int] = None, k_neighbors: int = 5, n_neighbors: int = 3,
+                 logger: Optional[Logger] = None):
+        """
+        Args:
+            random_state (Optional[int]): Seed for the synthetic sample generation.
+            n_jobs (Optional[int]): Parallel workers for the neighbour searches, -1 uses all cores.
+            chunk_size (int): Rows per neighbour query during the ENN cleaning.
+            max_synthetic_samples (Optional[int]): Upper bound on synthetic rows per class, None for no cap.
+            k_neighbors (int): Neighbours used by SMOTE to interpolate synthetic rows.
+            n_neighbors (int): Neighbours used by ENN to decide whether a row is kept.
+            logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+        """
+        self.logger = logger or configure_logger(
+                                        logger_name=__name__,
+                                        level="DEBUG",
+                                        to_console=True,
+                                        to_file=True,
+                                        log_file_name=__name__
+                                        )
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.max_synthetic_samples = max_synthetic_samples
+        self.k_neighbors = k_neighbors
+        self.n_neighbors = n_neighbors
+
+    def _sampling_strategy(self, y: np.ndarray) -> Union[str, dict]:
+        if self.max_synthetic_samples is None:
+            return "auto"
+        classes, counts = np.unique(y, return_counts=True)
+        # imblearn expects the desired number of rows per class after resampling
+        return {label: int(count + min(counts.max() - count, self.max_synthetic_samples))
+                for label, count in zip(classes, counts) if count < counts.max()}
+
+    def _oversample(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        smote = SMOTE(sampling_strategy=self._sampling_strategy(y),
+                      random_state=self.random_state,
+                      k_neighbors=NearestNeighbors(n_neighbors=self.k_neighbors + 1, n_jobs=self.n_jobs))
+        return smote.fit_resample(X, y)
+
+    def _clean(self, X: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Returns the indices of rows kept by ENN ("all" neighbours must share the row's class).
+        """
+        nn = NearestNeighbors(n_neighbors=self.n_neighbors + 1, n_jobs=self.n_jobs).fit(X)
+        kept = []
+        for target_class in np.unique(y):
+            class_indices = np.flatnonzero(y == target_class)
+            keep = np.empty(len(class_indices), dtype=bool)
+            for start in range(0, len(class_indices), self.chunk_size):
+                chunk = class_indices[start:start + self.chunk_size]
+                # First neighbour of every row is the row itself
+                neighbours = nn.kneighbors(X[chunk], return_distance=False)[:, 1:]
+                keep[start:start + len(chunk)] = np.all(y[neighbours] == target_class, axis=1)
+            kept.append(class_indices[keep])
+            self.logger.debug(f"ENN kept {int(keep.sum())} of {len(class_indices)} rows of class {target_class}")
+        return np.concatenate(kept)
+
+    @staticmethod
+    def _as_input_types(X: ArrayLike, y: Union[pd.Series, np.ndarray], X_res: np.ndarray, y_res: np.ndarray):
+        if isinstance(X, pd.DataFrame):
+            X_res = pd.DataFrame(X_res, columns=X.columns).astype(X.dtypes.to_dict())
+        if isinstance(y, pd.Series):
+            y_res = pd.Series(y_res, name=y.name, dtype=y.dtype)
+        return X_res, y_res
+
+    def oversample(self, X: ArrayLike, y: Union[pd.Series, np.ndarray]) -> Tuple[ArrayLike, Union[pd.Series, np.ndarray]]:
+        """
+        Runs only the SMOTE step (no ENN cleaning), see `fit_resample`.
+        """
+        try:
+            X_array = X.to_numpy() if isinstance(X, pd.DataFrame) else np.asarray(X)
+            y_array = y.to_numpy() if isinstance(y, pd.Series) else np.asarray(y)
+            self.logger.debug(f"Oversampling {X_array.shape[0]} rows with SMOTE (n_jobs={self.n_jobs}, cap={self.max_synthetic_samples})...")
+            X_over, y_over = self._oversample(X_array, y_array)
+            return self._as_input_types(X, y, X_over, y_over)
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def fit_resample(self, X: ArrayLike, y: Union[pd.Series, np.ndarray]) -> Tuple[ArrayLike, Union[pd.Series, np.ndarray]]:
+        """
+        Oversamples the minority class with SMOTE, then removes noisy rows of every class with ENN.
+
+        Args:
+            X (ArrayLike): Feature matrix, DataFrame column names are preserved in the output.
+            y (Union[pd.Series, np.ndarray]): Class labels.
+
+        Returns:
+            Tuple[ArrayLike, Union[pd.Series, np.ndarray]]: Resampled features and labels.
+        """
+        try:
+            X_array = X.to_numpy() if isinstance(X, pd.DataFrame) else np.asarray(X)
+            y_array = y.to_numpy() if isinstance(y, pd.Series) else np.asarray(y)
+            self.logger.debug(f"Oversampling {X_array.shape[0]} rows with SMOTE (n_jobs={self.n_jobs}, cap={self.max_synthetic_samples})...")
+            X_over, y_over = self._oversample(X_array, y_array)
+            self.logger.debug(f"Cleaning {X_over.shape[0]} rows with ENN in chunks of {self.chunk_size}...")
+            kept = self._clean(X_over, y_over)
+            return self._as_input_types(X, y, X_over[kept], y_over[kept])
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+
+def resample_imbalanced(X: ArrayLike, y: Union[pd.Series, np.ndarray], strategy: str, random_state: Optional[int] = None,
+                        n_jobs: Optional[int] = -1, chunk_size: int = 100_000, max_synthetic_samples: Optional[int] = None,
+                        logger: Optional[Logger] = None) -> Tuple[ArrayLike, Union[pd.Series, np.ndarray]]:
+    """
+    Applies one of the class-imbalance strategies in `IMBALANCE_STRATEGIES` to a training set.
+
+    - "smoteenn": SMOTE oversampling followed by ENN cleaning (`ParallelSMOTEENN`).
+    - "smote": SMOTE oversampling only.
+    - "random_undersample": randomly drops majority rows down to the minority count.
+    - "class_weight" / "none": data is returned unchanged; with "class_weight" the
+      imbalance is handled by the model trainer through balanced class weights.
+
+    Args:
+        X (ArrayLike): Feature matrix.
+        y (Union[pd.Series, np.ndarray]): Class labels.
+        strategy (str): Name of the strategy.
+        random_state (Optional[int]): Seed for the samplers.
+        n_jobs (Optional[int]): Parallel workers for the SMOTE/ENN neighbour searches.
+        chunk_size (int): Rows per ENN neighbour query.
+        max_synthetic_samples (Optional[int]): Cap on synthetic rows per class for the SMOTE based strategies.
+        logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+
+    Returns:
+        Tuple[ArrayLike, Union[pd.Series, np.ndarray]]: Resampled features and labels.
+    """
+    logger = logger or configure_logger(
+                                    logger_name=__name__,
+                                    level="DEBUG",
+                                    to_console=True,
+                                    to_file=True,
+                                    log_file_name=__name__
+                                    )
+    try:
+        if strategy not in IMBALANCE_STRATEGIES:
+            raise ValueError(f"Unknown imbalance strategy '{strategy}', expected one of {IMBALANCE_STRATEGIES}")
+        if strategy in ("smoteenn", "smote"):
+            sampler = ParallelSMOTEENN(random_state=random_state, n_jobs=n_jobs, chunk_size=chunk_size,
+                                       max_synthetic_samples=max_synthetic_samples, logger=logger)
+            return sampler.fit_resample(X, y) if strategy == "smoteenn" else sampler.oversample(X, y)
+        if strategy == "random_undersample":
+            return RandomUnderSampler(random_state=random_state).fit_resample(X, y)
+        return X, y
+    except Exception as e:
+        raise MyException(error_message=e, error_detail=sys, logger=logger) from e
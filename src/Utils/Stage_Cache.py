@@ -0,0 +1,235 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import platform
+import dataclasses
+from types import ModuleType
+from typing import Optional, Iterable, Callable, List, Any
+from logging import Logger
+from src.Exception import MyException
+from src.Logger import configure_logger
+from src.Utils.Main_Utils import save_object, load_object
+
+# Libraries whose version changes the result of a stage
+_VERSIONED_PACKAGES = ("numpy", "pandas", "sklearn", "imblearn", "pyarrow")
+_HASH_BLOCK_SIZE = 1 << 20
+_MANIFEST_FILE_NAME = "manifest.json"
+_ARTIFACT_FILE_NAME = "artifact.pkl"
+
+
+def _file_digest(file_path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _config_state(config: Any, run_dir: str, exclude: Iterable[str]) -> dict:
+    """
+    Collects dataclass fields and plain class-level settings (e.g. `_n_estimators`)
+    of a config object, with the run-specific artifact directory masked out.
+    """
+    state = {key: value for key, value in vars(type(config)).items()
+             if not key.startswith("__") and not callable(value) and not isinstance(value, (classmethod, staticmethod, property))}
+    state.update(dataclasses.asdict(config) if dataclasses.is_dataclass(config) else vars(config))
+    return {key: value.replace(run_dir, "<run>") if isinstance(value, str) else value
+            for key, value in sorted(state.items()) if key not in exclude}
+
+
+def artifact_file_paths(artifact: Any) -> List[str]:
+    """
+    Returns every existing file referenced by a (possibly nested) artifact dataclass.
+    """
+    paths = []
+    for field in dataclasses.fields(artifact):
+        value = getattr(artifact, field.name)
+        if dataclasses.is_dataclass(value):
+            paths.extend(artifact_file_paths(value))
+        elif isinstance(value, str) and os.path.isfile(value):
+            paths.append(value)
+    return paths
+
+
+def _rebase_artifact(artifact: Any, old_run_dir: str, new_run_dir: str) -> Any:
+    changes = {}
+    for field in dataclasses.fields(artifact):
+        value = getattr(artifact, field.name)
+        if dataclasses.is_dataclass(value):
+            changes[field.name] = _rebase_artifact(value, old_run_dir, new_run_dir)
+        elif isinstance(value, str) and value.startswith(old_run_dir + os.sep):
+            changes[field.name] = new_run_dir + value[len(old_run_dir):]
+    return dataclasses.replace(artifact, **changes)
+
+
+def _link_or_copy(src: str, dst: str, link: bool = True) -> None:
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    if os.path.exists(dst):
+        os.remove(dst)
+    if link:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+class StageCache:
+    """
+    Content-addressed cache of pipeline stage outputs.
+
+    A stage is keyed on a blake2b fingerprint of its input files (contents, not
+    paths), its configuration, the source of the modules implementing it and the
+    versions of the numerical libraries. Outputs are kept in a shared local store
+    outside the timestamped run directories; on a hit the stage's files are
+    restored into the current run directory and its artifact is returned with
+    paths rebased onto that run.
+
+    Entries hold copies of the files, never links: files outside the run
+    directory (e.g. `artifact/categories.json`) are rewritten in place by later
+    runs and would otherwise change every entry sharing their inode. Only files
+    restored into the fresh run directory, which no other run writes, are
+    hard-linked to the entry.
+    """
+
+    def __init__(self, cache_dir: str, run_dir: str, enabled: bool = True, logger: Optional[Logger] = None):
+        """
+        Args:
+            cache_dir (str): Shared directory holding cached stage outputs.
+            run_dir (str): Artifact directory of the current run.
+            enabled (bool): If False every lookup is a miss and nothing is stored.
+            logger (Optional[Logger]): Custom logger, otherwise a default logger will be used.
+        """
+        self.logger = logger or configure_logger(
+                                        logger_name=__name__,
+                                        level="DEBUG",
+                                        to_console=True,
+                                        to_file=True,
+                                        log_file_name=__name__
+                                        )
+        self.cache_dir = cache_dir
+        self.run_dir = os.path.normpath(run_dir)
+        self.enabled = enabled
+        self.report: List[dict] = []
+
+    def fingerprint(self, stage: str, input_files: Iterable[str], config: Any = None,
+                    code_modules: Iterable[ModuleType] = (), extra: Optional[dict] = None, exclude: Iterable[str] = ()) -> str:
+        """
+        Computes the cache key of a stage.
+
+        Args:
+            stage (str): Stage name.
+            input_files (Iterable[str]): Data and configuration files the stage reads (missing files are recorded as such).
+            config (Any): Stage config object, run-specific paths are ignored.
+            code_modules (Iterable[ModuleType]): Modules whose source defines the stage's behaviour.
+            extra (Optional[dict]): Any other JSON-serializable input.
+            exclude (Iterable[str]): Config fields that must not influence the key.
+
+        Returns:
+            str: Hex digest identifying the stage inputs.
+        """
+        try:
+            start = time.perf_counter()
+            payload = {
+                "stage": stage,
+                "files": [_file_digest(path) if os.path.isfile(path) else "<missing>" for path in input_files],
+                "config": _config_state(config, self.run_dir, set(exclude)) if config is not None else None,
+                "code": [_file_digest(module.__file__) for module in code_modules],
+                "environment": [platform.python_version()] + [getattr(sys.modules.get(name), "__version__", None) for name in _VERSIONED_PACKAGES],
+                "extra": extra,
+            }
+            key = hashlib.blake2b(json.dumps(payload, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+            self.logger.debug(f"Fingerprint of stage '{stage}': {key} ({(time.perf_counter() - start)*1000:.1f} ms)")
+            return key
+        except Exception as e:
+            raise MyException(error_message=e, error_detail=sys, logger=self.logger) from e
+
+    def _entry_dir(self, stage: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage, key)
+
+    def restore(self, stage: str, key: str) -> Optional[Any]:
+        """
+        Restores a cached stage into the current run directory.
+
+        Returns:
+            Optional[Any]: The stage artifact with rebased paths, or None on a cache miss.
+        """
+        entry_dir = self._entry_dir(stage, key)
+        manifest_path = os.path.join(entry_dir, _MANIFEST_FILE_NAME)
+        if not self.enabled or not os.path.exists(manifest_path):
+            return None
+        try:
+            start = time.perf_counter()
+            with open(manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+            for cached_name, original_path in manifest["files"].items():
+                target_path, in_run_dir = original_path, original_path.startswith(manifest["run_dir"] + os.sep)
+                if in_run_dir:
+                    target_path = self.run_dir + original_path[len(manifest["run_dir"]):]
+                _link_or_copy(os.path.join(entry_dir, cached_name), target_path, link=in_run_dir)
+            artifact = _rebase_artifact(load_object(os.path.join(entry_dir, _ARTIFACT_FILE_NAME), logger=self.logger),
+                                        manifest["run_dir"], self.run_dir)
+            restore_seconds = time.perf_counter() - start
+            saved_seconds = max(manifest["duration_seconds"] - restore_seconds, 0.0)
+            self.report.append({"stage": stage, "hit": True, "seconds": restore_seconds, "saved_seconds": saved_seconds})
+            self.logger.info(f"Stage cache HIT for '{stage}' ({key}): restored in {restore_seconds:.2f}s, saved ~{saved_seconds:.2f}s")
+            return artifact
+        except Exception as e:
+            # A broken entry must never fail the pipeline, the stage is simply recomputed
+            self.logger.warning(f"Could not restore cache entry {entry_dir}, recomputing stage '{stage}': {e}")
+            return None
+
+    def store(self, stage: str, key: str, artifact: Any, duration_seconds: float) -> None:
+        """
+        Stores the files referenced by a stage artifact and the artifact itself.
+        """
+        self.report.append({"stage": stage, "hit": False, "seconds": duration_seconds, "saved_seconds": 0.0})
+        if not self.enabled:
+            return
+        entry_dir = self._entry_dir(stage, key)
+        tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        try:
+            files = {}
+            for index, path in enumerate(artifact_file_paths(artifact)):
+                cached_name = f"{index}_{os.path.basename(path)}"
+                _link_or_copy(path, os.path.join(tmp_dir, cached_name), link=False)
+                files[cached_name] = os.path.normpath(path)
+            save_object(os.path.join(tmp_dir, _ARTIFACT_FILE_NAME), artifact, logger=self.logger)
+            with open(os.path.join(tmp_dir, _MANIFEST_FILE_NAME), "w") as manifest_file:
+                json.dump({"stage": stage, "key": key, "run_dir": self.run_dir, "duration_seconds": duration_seconds,
+                           "created": time.strftime("%Y-%m-%d %H:%M:%S"), "files": files}, manifest_file, indent=2)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+            self.logger.info(f"Stage '{stage}' stored in cache as {key} ({len(files)} files)")
+        except Exception as e:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            self.logger.warning(f"Could not store stage '{stage}' in cache: {e}")
+
+    def run(self, stage: str, compute: Callable[[], Any], **fingerprint_kwargs) -> Any:
+        """
+        Returns the cached artifact of a stage, or computes and caches it.
+
+        Args:
+            stage (str): Stage name.
+            compute (Callable[[], Any]): Runs the stage and returns its artifact.
+            **fingerprint_kwargs: Inputs of the stage, see `fingerprint`.
+        """
+        key = self.fingerprint(stage, **fingerprint_kwargs)
+        artifact = self.restore(stage, key)
+        if artifact is not None:
+            return artifact
+        self.logger.info(f"Stage cache MISS for '{stage}' ({key}), running stage...")
+        start = time.perf_counter()
+        artifact = compute()
+        self.store(stage, key, artifact, duration_seconds=time.perf_counter() - start)
+        return artifact
+
+    def summary(self) -> str:
+        hits = [entry for entry in self.report if entry["hit"]]
+        stages = ", ".join(f"{entry['stage']}={'hit' if entry['hit'] else 'miss'}" for entry in self.report)
+        return (f"Stage cache: {len(hits)}/{len(self.report)} hits ({stages}), "
+                f"time saved ~{sum(entry['saved_seconds'] for entry in hits):.2f}s")